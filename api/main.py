@@ -1,9 +1,10 @@
 # api/main.py
 from fastapi import FastAPI
-from api.routes import economy, inventory, profile
+from api.routes import economy, inventory, leaderboard, profile
 
 app = FastAPI(title="Veyra API")
 
 app.include_router(economy.router)
 app.include_router(inventory.router)
+app.include_router(leaderboard.router)
 app.include_router(profile.router)
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""
+Leaderboard API Routes
+
+This file exposes HTTP endpoints for the ranked leaderboards.
+Routes are thin. They validate input, call services, and return schemas.
+
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from api.schemas import (
+    LeaderboardEntrySchema,
+    LeaderboardMetric,
+    LeaderboardResponse,
+)
+from services.leaderboard_services import count_players, get_leaderboard, get_rank
+
+
+router = APIRouter(
+    prefix="/leaderboard",
+    tags=["leaderboard"],
+)
+
+
+@router.get(
+    "/{metric}",
+    response_model=LeaderboardResponse,
+)
+def get_top(metric: LeaderboardMetric, limit: int = Query(10, ge=1, le=100)):
+    """
+    Get the top players for a metric.
+    """
+    return LeaderboardResponse(
+        metric=metric,
+        total_players=count_players(),
+        entries=[LeaderboardEntrySchema(**vars(entry)) for entry in get_leaderboard(metric, limit)],
+    )
+
+
+@router.get(
+    "/{metric}/rank/{user_id}",
+    response_model=LeaderboardEntrySchema,
+)
+def get_user_rank(metric: LeaderboardMetric, user_id: int):
+    """
+    Get one user's position for a metric.
+    """
+    entry = get_rank(metric, user_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="User is not ranked")
+
+    return LeaderboardEntrySchema(**vars(entry))
@@ -4,7 +4,7 @@ API Schemas (DTOs)
 This file defines ALL request and response shapes for the Veyra API.
 
 """
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -105,3 +105,23 @@ class TransferGoldResponse(BaseModel):
     from_user_id: int
     to_user_id: int
     amount: int
+
+
+# -------------------------
+# Leaderboard Schemas
+# -------------------------
+
+LeaderboardMetric = Literal["gold", "exp", "battles_won", "races_won", "quest_streak"]
+
+
+class LeaderboardEntrySchema(BaseModel):
+    rank: int
+    user_id: int
+    user_name: str
+    value: int
+
+
+class LeaderboardResponse(BaseModel):
+    metric: LeaderboardMetric
+    total_players: int
+    entries: List[LeaderboardEntrySchema]
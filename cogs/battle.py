@@ -18,8 +18,9 @@ from services.battle.battle_simulation import (
     start_battle_simulation,
     start_campaign_battle,
 )
-from services.economy_services import check_wallet, remove_gold, add_gold
+from services.economy_services import remove_gold_async, add_gold_async
 from services.users_services import is_user
+from services.request_context_services import get_request_context
 from services.battle.loadout_services import update_loadout
 from services.battle.campaign.campaign_services import (
     fetch_veyra_loadout,
@@ -78,7 +79,7 @@ class Battle(commands.Cog):
             return
 
         # Prevent starting a battle the user can't pay for.
-        if bet > check_wallet(ctx.author.id):
+        if bet > get_request_context(ctx).gold:
             await ctx.respond(
                 "You don't have enough gold to initiate the challege. Try betting lower.",
                 ephemeral=True,
@@ -86,7 +87,7 @@ class Battle(commands.Cog):
             return
 
         # Take gold as pot money (refunded if rejected/timeout).
-        remove_gold(ctx.author.id, bet)
+        await remove_gold_async(ctx.author.id, bet)
 
         # Send interactive challenge prompt.
         result = await send_battle_challenge(ctx, ctx.author.id, target.id, bet)
@@ -97,7 +98,7 @@ class Battle(commands.Cog):
 
         elif result is False:
             # Rejected: refund pot.
-            add_gold(ctx.author.id, bet)
+            await add_gold_async(ctx.author.id, bet)
             await ctx.send(
                 f"{ctx.author.mention}, your challenge was rejected. You pot money was refunded."
             )
@@ -105,7 +106,7 @@ class Battle(commands.Cog):
         else:
             # Timed out / no response: refund pot.
             await ctx.send("No response. Challenge expired. Refunding pot gimme a moment.")
-            add_gold(ctx.author.id, bet)
+            await add_gold_async(ctx.author.id, bet)
 
 
 
@@ -12,6 +12,7 @@ Contains a small UI flow for starter loan terms:
 - modal requires typing CONFIRM exactly
 """
 
+import asyncio
 import logging
 
 import discord
@@ -19,8 +20,9 @@ from discord import ui
 from discord.ext import commands
 
 from domain.guild.commands_policies import non_spam_command
-from services.economy_services import add_gold, remove_gold
+from services.economy_services import add_gold_async, remove_gold_async
 from services.friendship_services import add_friendship
+from services.leaderboard_services import METRICS, get_rank
 from services.loan_services import (
     check_starter_loan_given,
     issue_loan,
@@ -30,7 +32,7 @@ from services.response_services import create_response
 from services.users_services import is_user
 from utils.custom_errors import VeyraError
 from utils.emotes import GOLD_EMOJI
-from utils.embeds.leaderboard.leaderboardembed import gold_leaderboard_embed
+from utils.embeds.leaderboard.leaderboardembed import leaderboard_embed, format_rank_line
 from utils.embeds.loanembed import build_loan_terms_embed
 
 logger = logging.getLogger(__name__)
@@ -45,14 +47,38 @@ class Economy(commands.Cog):
     # -----------------------------
     # Leaderboard
     # -----------------------------
-    @commands.slash_command(description="Show the richest players leaderboard.")
+    @commands.slash_command(description="Show the top players leaderboard.")
     @commands.cooldown(1, 120, commands.BucketType.user)
     @non_spam_command()
-    async def leaderboard(self, ctx: discord.ApplicationContext):
-        """Display the gold leaderboard."""
-        embed = await gold_leaderboard_embed(self.bot)
+    async def leaderboard(
+        self,
+        ctx: discord.ApplicationContext,
+        metric: discord.Option(str, "What to rank by", choices=list(METRICS), default="gold"),
+    ):
+        """Display a leaderboard (gold by default) with the caller's own rank."""
+        embed = await leaderboard_embed(self.bot, metric, viewer_id=ctx.author.id)
         await ctx.respond(embed=embed)
 
+    @commands.slash_command(description="See where you (or someone else) rank.")
+    @commands.cooldown(1, 10, commands.BucketType.user)
+    async def rank(
+        self,
+        ctx: discord.ApplicationContext,
+        metric: discord.Option(str, "What to rank by", choices=list(METRICS), default="gold"),
+        user: discord.Option(discord.User, "Whose rank to check", required=False, default=None),
+    ):
+        """Show a user's position on a leaderboard."""
+        target = user or ctx.author
+        entry = await asyncio.to_thread(get_rank, metric, target.id)
+        if entry is None:
+            await ctx.respond(f"{target.name} isn't on the leaderboards yet.", ephemeral=True)
+            return
+
+        await ctx.respond(
+            f"**{target.name}** is **#{entry.rank}** on the {METRICS[metric].label} leaderboard "
+            f"with {format_rank_line(metric, entry)}"
+        )
+
     # -----------------------------
     # Starter Loan UI
     # -----------------------------
@@ -99,7 +125,7 @@ class Economy(commands.Cog):
             term_days = 7
 
             # Add gold first (existing behavior).
-            new_balance, _ = add_gold(interaction.user.id, principal)
+            new_balance, _ = await add_gold_async(interaction.user.id, principal)
 
             # Issue loan record (starter pack loan id "0").
             ok, _, _ = issue_loan(interaction.user.id, "0")
@@ -153,7 +179,7 @@ class Economy(commands.Cog):
             response = create_response("transfer_gold", 2, user=ctx.author.display_name)
             await ctx.respond(response)
 
-            remove_gold(ctx.author.id, amount)
+            await remove_gold_async(ctx.author.id, amount)
             logger.info(
                 "Gold was given to Veyra",
                 extra={
@@ -193,8 +219,8 @@ class Economy(commands.Cog):
             # Existing behavior: compute 95% and then remove/add that amount.
             new_amount = int(amount * 0.95)  # calculating 5% of total amount
 
-            user_balance, transferred_gold = remove_gold(ctx.author.id, new_amount)
-            target_balance, transferred_gold = add_gold(target_user.id, new_amount)
+            user_balance, transferred_gold = await remove_gold_async(ctx.author.id, new_amount)
+            target_balance, transferred_gold = await add_gold_async(target_user.id, new_amount)
 
             response = create_response(
                 "transfer_gold",
@@ -4,7 +4,7 @@ import discord
 
 from discord.ext import commands, pages
 
-from services.exp_services import current_exp
+from services.exp_services import current_exp, exp_accumulator
 from services.economy_services import check_wallet_full
 from services.inventory_services import get_inventory
 from services.jobs_services import JobsClass
@@ -14,7 +14,6 @@ from services.upgrade_services import building_lvl
 from domain.buildings.building_descriptions import get_building_description
 
 from utils.emotes import GOLD_EMOJI, CHIP_EMOJI
-from utils.chatexp import add_exp_with_announcement
 
 
 user_cooldowns = {}
@@ -40,7 +39,7 @@ class Exp(commands.Cog):
 
         user_cooldowns[user_id] = now
         add_friendship(user_id, 1)
-        await add_exp_with_announcement(ctx, user_id, random.randint(1,20))
+        exp_accumulator.add(user_id, random.randint(1,20))
 
 
     @check.command(name="wallet", description="Check your wallet")
@@ -5,7 +5,7 @@ import asyncio
 from rapidfuzz import process, fuzz
 
 from services.race_services import start_race, add_bets
-from services.economy_services import remove_gold, add_gold
+from services.economy_services import remove_gold_async, add_gold_async
 from services.casino_services import play_casino_game, GAMES
 
 from utils.embeds.animalraceembed import race_start_embed
@@ -159,7 +159,7 @@ class Gambling(commands.Cog):
         if self.betting_phase:
             try:
                 # Attempt to deduct gold from user's balance
-                remove_gold(ctx.author.id, bet)
+                await remove_gold_async(ctx.author.id, bet)
             except NotEnoughGoldError:
                 # Inform user if they lack sufficient funds
                 await ctx.send("You don't have enough money to bet maybe try betting less?")
@@ -172,7 +172,7 @@ class Gambling(commands.Cog):
                 await ctx.send(f"You placed your bet on **{animal.capitalize()}** for **{bet}** gold! Let's pray they run fast 🏁")
             else:
                 # Refund gold if user already has a bet and cannot change it
-                add_gold(ctx.author.id, bet) #refund the gold deducted earlier
+                await add_gold_async(ctx.author.id, bet) #refund the gold deducted earlier
                 await ctx.send("You already have a bet. Can't change")
         else:
             # Inform user that betting is currently closed
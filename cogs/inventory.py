@@ -18,7 +18,7 @@ from discord.ext import commands, pages
 
 from services.inventory_services import (
     transfer_item as transfer_item_service,
-    take_item,
+    take_item_async,
     get_inventory,
     get_item_details,
     use_item
@@ -89,7 +89,7 @@ class Inventory(commands.Cog):
                 return
 
             try:
-                take_item(ctx.author.id, item_id, amount)
+                await take_item_async(ctx.author.id, item_id, amount)
 
                 add_friendship(ctx.author.id, 9*amount)
 
@@ -1,12 +1,26 @@
+import asyncio
 import logging
+import discord
 from discord.ext import commands, pages
-from services.inventory_services import give_item, take_item
-from services.lootbox_services import lootbox_reward, user_lootbox_count, open_box
+from services.inventory_services import give_item, take_item_async
+from services.lootbox_services import lootbox_reward, user_lootbox_count, open_box, open_boxes_bulk, MAX_BULK_OPEN
 from services.economy_services import add_gold
 from utils.itemname_to_id import item_name_to_id
+from utils.custom_errors import NotEnoughItemError
 
 logger = logging.getLogger(__name__)
 
+LOOTBOX_NAMES = ("wooden box", "stone box", "iron box", "platinum box")
+
+WRONG_BOX_MESSAGE = (
+    "❌ Incorrect box name. Available boxes are:\n"
+    "• Wooden Box\n"
+    "• Stone Box\n"
+    "• Iron Box\n"
+    "• Platinum Box\n"
+    "Choose wisely :)"
+)
+
 class Lootbox(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -14,45 +28,64 @@ class Lootbox(commands.Cog):
     @commands.command()
     @commands.cooldown(1,5,commands.BucketType.user)
     async def open(self, ctx, *, lootbox_name: str):
-        """Open a lootbox and receive a random reward."""
-        if lootbox_name.lower() not in ("wooden box", "stone box", "iron box", "platinum box"):
-            await ctx.send(
-                "❌ Incorrect box name. Available boxes are:\n"
-                "• Wooden Box\n"
-                "• Stone Box\n"
-                "• Iron Box\n"
-                "• Platinum Box\n"
-                "Choose wisely :)"
-            )
+        """Open a lootbox and receive a random reward. Add a number to open many: !open wooden box 10"""
+        amount = 1
+        name, _, last = lootbox_name.rpartition(" ")
+        if name and last.isdigit():
+            lootbox_name, amount = name, int(last)
+
+        await self.open_lootboxes(ctx, lootbox_name, amount, ctx.send)
+
+    @commands.slash_command(name="open", description="Open one or more lootboxes")
+    @commands.cooldown(1,5,commands.BucketType.user)
+    async def open_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        box: discord.Option(str, "Lootbox to open", choices=["Wooden Box", "Stone Box", "Iron Box", "Platinum Box"]),
+        amount: discord.Option(int, "How many to open", min_value=1, max_value=MAX_BULK_OPEN, default=1)
+    ):
+        await self.open_lootboxes(ctx, box, amount, ctx.respond)
+
+    async def open_lootboxes(self, ctx, lootbox_name: str, amount: int, reply):
+        lootbox_name = lootbox_name.strip()
+        if lootbox_name.lower() not in LOOTBOX_NAMES:
+            await reply(WRONG_BOX_MESSAGE)
+            return
+
+        if not 1 <= amount <= MAX_BULK_OPEN:
+            await reply(f"You can open between 1 and {MAX_BULK_OPEN} boxes at once.")
             return
 
         lootbox_amount = user_lootbox_count(ctx.author.id, lootbox_name)
 
         # Invalid lootbox
         if lootbox_amount == -1:
-            await ctx.send(
-                "❌ Incorrect box name. Available boxes are:\n"
-                "• Wooden Box\n"
-                "• Stone Box\n"
-                "• Iron Box\n"
-                "• Platinum Box\n"
-                "Choose wisely :)"
-            )
+            await reply(WRONG_BOX_MESSAGE)
             return
 
         # No lootboxes of this type
         if lootbox_amount == 0:
-            await ctx.send(f"You don’t have any **{lootbox_name.title()}**. What are you tryna open, huh?")
+            await reply(f"You don’t have any **{lootbox_name.title()}**. What are you tryna open, huh?")
+            return
+
+        if amount > 1:
+            try:
+                # Up to MAX_BULK_OPEN rolls plus inventory writes; keep them off the loop
+                embed = await asyncio.to_thread(open_boxes_bulk, ctx.author.id, lootbox_name, amount)
+            except NotEnoughItemError:
+                await reply(f"You don’t have **{amount} {lootbox_name.title()}es** to open.")
+                return
+            await reply(embed=embed)
             return
 
         # Consume one lootbox
         item_id = lootbox_amount #the func returns item_id when box exists
 
-        take_item(ctx.author.id, item_id, 1)
+        await take_item_async(ctx.author.id, item_id, 1)
 
         # Get reward
         embed,view = open_box(ctx.author.id, lootbox_name)
-        await ctx.send(embed=embed, view=view)
+        await reply(embed=embed, view=view)
 
 def setup(bot):
-    bot.add_cog(Lootbox(bot))
\ No newline at end of file
+    bot.add_cog(Lootbox(bot))
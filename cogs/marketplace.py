@@ -5,7 +5,8 @@ Marketplace commands.
 Players can:
 - Create item listings (items moved into escrow)
 - Delete their listings
-- Browse the marketplace (paginated embed pages)
+- Browse the marketplace (cheapest first, filterable, paginated on demand)
+- Check the best asking price of an item
 - Buy from an active listing
 
 This cog should remain a thin command layer: it validates input and delegates
@@ -15,19 +16,28 @@ business logic to the services layer.
 import logging
 
 from discord.commands import Option
-from discord.ext import commands, pages
+from discord.ext import commands
 
 from services.marketplace_services import (
+    best_asks,
     buy_listed_item,
     create_listing,
-    load_marketplace,
+    load_marketplace_page,
     remove_listing,
 )
+from utils.embeds.marketplaceembed import MarketplaceView
+from utils.emotes import GOLD_EMOJI
 from utils.itemname_to_id import get_item_id_safe
 
 logger = logging.getLogger(__name__)
 
 
+def unknown_item_message(item_name: str, suggestions: list[str]) -> str:
+    if suggestions:
+        return f"Hmm, I couldn't find that item. Did you mean: {', '.join(suggestions)}?"
+    return f"There is no item called **{item_name}**."
+
+
 class Marketplace(commands.Cog):
     """Marketplace-related slash commands."""
 
@@ -108,13 +118,59 @@ class Marketplace(commands.Cog):
     # -----------------------------
     # Browse Marketplace
     # -----------------------------
-    @commands.slash_command(description="Browse all active marketplace listings.")
+    @commands.slash_command(description="Browse active marketplace listings, cheapest first.")
     @commands.cooldown(1, 15, commands.BucketType.user)
-    async def loadmarketplace(self, ctx):
-        """Display all active listings in the marketplace."""
-        embed_pages = load_marketplace()
-        paginator = pages.Paginator(pages=embed_pages)
-        await paginator.respond(ctx.interaction)
+    async def loadmarketplace(
+        self,
+        ctx,
+        item_name=Option(str, "Only listings of this item", required=False, default=None),
+        item_type=Option(str, "Only this kind of item", choices=["item", "shard", "lootbox", "mineral", "potion"], required=False, default=None),
+        rarity=Option(str, "Only this rarity", choices=["Common", "Rare", "Epic", "Legendary"], required=False, default=None),
+        min_price=Option(int, "Lowest price per unit", min_value=0, required=False, default=None),
+        max_price=Option(int, "Highest price per unit", min_value=0, required=False, default=None),
+    ):
+        """Display active listings in the marketplace, one page at a time."""
+        filters = {
+            "item_type": item_type,
+            "rarity": rarity,
+            "min_price": min_price,
+            "max_price": max_price,
+        }
+
+        if item_name:
+            item_id, suggestions = get_item_id_safe(item_name)
+            if item_id is None:
+                await ctx.respond(unknown_item_message(item_name, suggestions))
+                return
+            filters["item_id"] = item_id
+
+        def load_page(cursor, page_num):
+            return load_marketplace_page(filters, cursor, page_num)
+
+        embed, next_cursor = load_page(None, 1)
+        await ctx.respond(embed=embed, view=MarketplaceView(load_page, next_cursor, ctx.author.id))
+
+    # -----------------------------
+    # Best Ask
+    # -----------------------------
+    @commands.slash_command(description="Check the cheapest marketplace listing of an item.")
+    @commands.cooldown(1, 5, commands.BucketType.user)
+    async def market_price(self, ctx, item_name=Option(str, "Name of the item")):
+        """Show the best asking price of an item."""
+        item_id, suggestions = get_item_id_safe(item_name)
+        if item_id is None:
+            await ctx.respond(unknown_item_message(item_name, suggestions))
+            return
+
+        ask = best_asks([item_id]).get(item_id)
+        if ask is None:
+            await ctx.respond(f"Nobody is selling **{item_name.title()}** right now.")
+            return
+
+        await ctx.respond(
+            f"Cheapest **{item_name.title()}**: `{ask['price']}`{GOLD_EMOJI} per unit "
+            f"({ask['quantity']} in stock) → listing `{ask['listing_id']}`"
+        )
 
     # -----------------------------
     # Buy from Marketplace
@@ -19,13 +19,14 @@ import discord
 from discord.ext import commands
 
 from services.friendship_services import check_friendship
-from services.inventory_services import give_item
+from services.inventory_services import give_item_async
 from services.jobs_services import JobsClass
 from services.response_services import create_response
-from services.users_services import add_user, get_user_profile_new, is_user
+from services.users_services import add_user, get_user_profile_new
 from services.refferal_services import get_referral_card_data
 from services.battle.tutorial_battle_services import start_tutorial_battle
-from services.tutorial_services import TutorialState, get_tutorial_state
+from services.tutorial_services import TutorialState
+from services.request_context_services import get_request_context
 
 from domain.guild.commands_policies import non_spam_command
 
@@ -64,8 +65,9 @@ class Profile(commands.Cog):
         user_id = ctx.author.id
         user_name = ctx.author.name
 
-        if is_user(user_id):
-            state = await get_tutorial_state(user_id)
+        context = get_request_context(ctx)
+        if context.is_registered:
+            state = context.tutorial_state
             if state != TutorialState.COMPLETED:
                 await start_tutorial_battle(ctx, ctx.author)
                 return
@@ -101,7 +103,7 @@ class Profile(commands.Cog):
             await ctx.send("Something broke while making your profile. Try `!helloVeyra` again.")
             return
 
-        give_item(user_id, 183, 2, True)
+        await give_item_async(user_id, 183, 2, True)
         user = JobsClass(user_id)
         user.gain_energy(150)
 
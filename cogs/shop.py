@@ -19,7 +19,7 @@ from discord.ext import commands
 
 from domain.casino.rules import CHIP_OFFERS, CONVERSION_RATES  # noqa: F401 (imported for future use)
 from domain.guild.commands_policies import non_spam_command
-from services.economy_services import add_gold
+from services.economy_services import add_gold_async
 from services.shop_services import (
     buy_chips,
     buy_item,
@@ -29,7 +29,7 @@ from services.shop_services import (
     get_today_chip_offers,
     sell_item,
 )
-from services.inventory_services import take_item
+from services.inventory_services import take_item_async
 from utils.custom_errors import NotEnoughItemError
 from utils.embeds.casinoembed import get_casino_view_and_embed
 from utils.itemname_to_id import get_item_id_safe
@@ -111,7 +111,7 @@ class Shop(commands.Cog):
         if item_name.lower() in minerals:
             if item_name.lower() == "iron bar":
                 try:
-                    take_item(ctx.author.id, 190, quantity)
+                    await take_item_async(ctx.author.id, 190, quantity)
                 except NotEnoughItemError:
                     await ctx.send(f"You don't have enough {item_name} to sell")
                     return
@@ -119,7 +119,7 @@ class Shop(commands.Cog):
 
             elif item_name.lower() == "copper bar":
                 try:
-                    take_item(ctx.author.id, 189, quantity)
+                    await take_item_async(ctx.author.id, 189, quantity)
                 except NotEnoughItemError:
                     await ctx.send(f"You don't have enough {item_name} to sell")
                     return
@@ -127,14 +127,14 @@ class Shop(commands.Cog):
 
             else:
                 try:
-                    take_item(ctx.author.id, 191, quantity)
+                    await take_item_async(ctx.author.id, 191, quantity)
                 except NotEnoughItemError:
                     await ctx.send(f"You don't have enough {item_name} to sell")
                     return
                 price = 450
 
             revenue = price * quantity
-            add_gold(ctx.author.id, revenue)
+            await add_gold_async(ctx.author.id, revenue)
             await ctx.send(f"You sold {quantity} X {item_name.title()}!! Gold gained -> {revenue} ")
             return
 
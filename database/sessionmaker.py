@@ -1,3 +1,4 @@
+import asyncio
 import os
 
 from dotenv import load_dotenv
@@ -15,6 +16,28 @@ engine = create_engine(DB_URL)
 
 Session = sessionmaker(bind=engine)
 
+
+def _run_in_session(work):
+    with Session() as session:
+        result = work(session)
+        session.commit()
+        return result
+
+
+async def run_in_async_session(work):
+    """Run ``work(session)`` in a worker thread without blocking the loop.
+
+    This is how event-loop code awaits database work: ``work`` gets a regular
+    sync session, opened, committed (or rolled back) and closed in the thread,
+    so every service that already accepts ``session=`` is reused as-is. Services
+    that open their own ``Session()`` internally are safe too, because they run
+    on the same thread rather than on the loop. Anything that needs its own
+    transaction can call ``asyncio.to_thread`` directly, as the settlement
+    service does.
+    """
+    return await asyncio.to_thread(_run_in_session, work)
+
+
 _schema_initialized = False
 
 
@@ -36,6 +59,113 @@ def ensure_item_type_column() -> None:
         conn.execute(text("ALTER TABLE items ALTER COLUMN item_type SET NOT NULL"))
 
 
+def ensure_energy_columns() -> None:
+    """Add the lazy energy regen columns to pre-existing users tables."""
+    inspector = inspect(engine)
+    if not inspector.has_table("users"):
+        return
+
+    column_names = {column["name"] for column in inspector.get_columns("users")}
+    with engine.begin() as conn:
+        if "energy_updated_at" not in column_names:
+            conn.execute(text("ALTER TABLE users ADD COLUMN energy_updated_at TIMESTAMP DEFAULT (now() AT TIME ZONE 'utc')"))
+        if "energy_full_at" not in column_names:
+            conn.execute(text("ALTER TABLE users ADD COLUMN energy_full_at TIMESTAMP"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_users_energy_full_at ON users (energy_full_at)"))
+            conn.execute(text(
+                "UPDATE users SET energy_full_at = energy_updated_at + (35 + 15 * level - energy) * INTERVAL '6 minutes' "
+                "WHERE energy < 35 + 15 * level"
+            ))
+
+
+def ensure_inventory_slots_column() -> None:
+    """Add the materialized slot counter; existing users are computed lazily on first use."""
+    inspector = inspect(engine)
+    if not inspector.has_table("users"):
+        return
+
+    column_names = {column["name"] for column in inspector.get_columns("users")}
+    if "inventory_slots_used" not in column_names:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE users ADD COLUMN inventory_slots_used INTEGER"))
+
+
+def ensure_marketplace_indexes() -> None:
+    """Add the order book indexes to pre-existing marketplace tables."""
+    inspector = inspect(engine)
+    if not inspector.has_table("marketplace"):
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_marketplace_item_price ON marketplace (item_id, price, listing_id)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_marketplace_price ON marketplace (price, listing_id)"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_marketplace_user_id ON marketplace (user_id)"))
+
+
+def ensure_leaderboard_indexes() -> None:
+    """Add the ranking indexes to pre-existing tables."""
+    inspector = inspect(engine)
+    indexes = {
+        "wallet": ["CREATE INDEX IF NOT EXISTS ix_wallet_gold ON wallet (gold)"],
+        "users": ["CREATE INDEX IF NOT EXISTS ix_users_exp ON users (exp)"],
+        "user_stats": [
+            "CREATE INDEX IF NOT EXISTS ix_user_stats_battles_won ON user_stats (battles_won)",
+            "CREATE INDEX IF NOT EXISTS ix_user_stats_races_won ON user_stats (races_won)",
+            "CREATE INDEX IF NOT EXISTS ix_user_stats_longest_quest_streak ON user_stats (longest_quest_streak)",
+        ],
+    }
+
+    with engine.begin() as conn:
+        for table, statements in indexes.items():
+            if not inspector.has_table(table):
+                continue
+            for statement in statements:
+                conn.execute(text(statement))
+
+
+def backfill_scheduled_events() -> None:
+    """Seed a freshly created scheduled_events table from existing deadlines."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO scheduled_events (event_type, user_id, due_at) "
+            "SELECT 'ENERGY_FULL', user_id, energy_full_at FROM users "
+            "WHERE energy_full_at IS NOT NULL "
+            "ON CONFLICT DO NOTHING"
+        ))
+        conn.execute(text(
+            "INSERT INTO scheduled_events (event_type, user_id, due_at) "
+            "SELECT 'LOAN_DUE', user_id, (due_date AT TIME ZONE 'utc') - INTERVAL '2 days' FROM loans "
+            "WHERE status = 'active' AND NOT due_reminder_sent "
+            "ON CONFLICT DO NOTHING"
+        ))
+        conn.execute(text(
+            "INSERT INTO scheduled_events (event_type, user_id, due_at) "
+            "SELECT 'EFFECT_EXPIRED', user_id, expire_at FROM user_effects "
+            "WHERE expire_at > (now() AT TIME ZONE 'utc') "
+            "ON CONFLICT DO NOTHING"
+        ))
+
+
+def backfill_lottery_tickets() -> None:
+    """Move tickets from the old JSONB lottery_entries rows into a freshly created lottery_tickets table."""
+    if not inspect(engine).has_table("lottery_entries"):
+        return
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO lottery_tickets (ticket_id, user_id, ticket_price) "
+            "SELECT ticket::bigint, user_id, ticket_price FROM lottery_entries, "
+            "jsonb_array_elements_text(COALESCE(tickets, '[]'::jsonb)) AS ticket "
+            "ON CONFLICT DO NOTHING"
+        ))
+        conn.execute(text(
+            "INSERT INTO lottery_round (id, tickets_sold, prize_pool, next_ticket_id) "
+            "SELECT 1, count(*), COALESCE(sum(ticket_price), 0), GREATEST(COALESCE(max(ticket_id), 0) + 1, 1000000) "
+            "FROM lottery_tickets "
+            "ON CONFLICT (id) DO NOTHING"
+        ))
+
+
 def ensure_schema() -> None:
     """Create any ORM-managed tables that do not already exist."""
     global _schema_initialized
@@ -45,8 +175,18 @@ def ensure_schema() -> None:
     import models  # noqa: F401 - ensures all ORM model modules are registered
     from models.users_model import Base
 
+    had_scheduled_events = inspect(engine).has_table("scheduled_events")
+    had_lottery_tickets = inspect(engine).has_table("lottery_tickets")
     Base.metadata.create_all(bind=engine)
     ensure_item_type_column()
+    ensure_energy_columns()
+    ensure_inventory_slots_column()
+    ensure_marketplace_indexes()
+    ensure_leaderboard_indexes()
+    if not had_scheduled_events:
+        backfill_scheduled_events()
+    if not had_lottery_tickets:
+        backfill_lottery_tickets()
 
     from database.seed import seed_core_data
 
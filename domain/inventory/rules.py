@@ -3,6 +3,7 @@
 This module defines:
 - Inventory slot progression by inventory level.
 - Allowed stack sizes by pockets level and item type.
+- How many slots a stack of a given quantity occupies.
 
 All functions are defensive: unknown levels/types fall back to 0.
 """
@@ -63,3 +64,20 @@ def allowed_stack_size(pockets_lvl: int, item_type: str) -> int:
 
     # Defensive lookup: unknown item types should not crash the bot.
     return mapped_rules.get(item_type, 0)
+
+def slots_for_quantity(quantity: int, stack_limit: int) -> int:
+    """Return how many inventory slots `quantity` of one item occupies.
+
+    Args:
+        quantity: Units of the item held.
+        stack_limit: Allowed stack size for the item (see allowed_stack_size).
+
+    Returns:
+        ceil(quantity / stack_limit). Items with no stack rule (limit 0)
+        take one slot per unit.
+    """
+    if quantity <= 0:
+        return 0
+    if stack_limit <= 0:
+        return quantity
+    return -(-quantity // stack_limit)
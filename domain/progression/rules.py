@@ -1,3 +1,6 @@
+import math
+from datetime import timedelta
+
 EXP_THRESHOLDS = [
     0, 100, 250, 400, 600, 900, 1250, 1600, 2200, 3000,
     4200, 5500, 7000, 9000, 12000, 15000, 18000, 22000,
@@ -11,4 +14,79 @@ def calculate_level(exp: int) -> int:
             current_level += 1
         else:
             break
-    return current_level
\ No newline at end of file
+    return current_level
+
+# ---------------------------------------------------------------------------
+# Energy regeneration
+# ---------------------------------------------------------------------------
+# Energy is stored as (energy, energy_updated_at) and regenerated lazily on
+# read: one tick every ENERGY_REGEN_INTERVAL, up to the level cap.
+
+ENERGY_REGEN_INTERVAL = timedelta(minutes=6)
+BASE_ENERGY_REGEN = 1
+
+# Energy gained per tick while an effect is active
+EFFECT_ENERGY_REGEN = {
+    "ENERGY REGEN ELITE": 2,
+    "ENERGY REGEN DEMON": 5,
+}
+
+
+def max_energy(level: int) -> int:
+    return 35 + (15 * level)
+
+
+def energy_regen_rate(effect_name: str | None) -> int:
+    return EFFECT_ENERGY_REGEN.get(effect_name, BASE_ENERGY_REGEN)
+
+
+def _boosted_ticks_available(updated_at, effect_name, effect_expire_at):
+    """Ticks after updated_at that still fall inside the effect, None if unlimited."""
+    if energy_regen_rate(effect_name) == BASE_ENERGY_REGEN:
+        return 0
+    if effect_expire_at is None:
+        return None
+    return max(0, math.floor((effect_expire_at - updated_at) / ENERGY_REGEN_INTERVAL))
+
+
+def regenerate_energy(energy: int, level: int, updated_at, now, effect_name=None, effect_expire_at=None):
+    """
+    Apply every regen tick elapsed since updated_at.
+
+    Returns:
+        (energy, updated_at): updated_at only advances by whole ticks so partial
+        progress towards the next tick is kept. At or above the cap, regen is
+        paused and the clock restarts at now.
+    """
+    cap = max_energy(level)
+    if updated_at is None or energy >= cap:
+        return energy, now
+
+    ticks = math.floor((now - updated_at) / ENERGY_REGEN_INTERVAL)
+    if ticks <= 0:
+        return energy, updated_at
+
+    boosted = _boosted_ticks_available(updated_at, effect_name, effect_expire_at)
+    boosted = ticks if boosted is None else min(boosted, ticks)
+    gained = boosted * energy_regen_rate(effect_name) + (ticks - boosted) * BASE_ENERGY_REGEN
+
+    if energy + gained >= cap:
+        return cap, now
+    return energy + gained, updated_at + ticks * ENERGY_REGEN_INTERVAL
+
+
+def energy_full_at(energy: int, level: int, updated_at, effect_name=None, effect_expire_at=None):
+    """Time at which energy reaches the level cap, or None if it already has."""
+    missing = max_energy(level) - energy
+    if missing <= 0 or updated_at is None:
+        return None
+
+    rate = energy_regen_rate(effect_name)
+    boosted = _boosted_ticks_available(updated_at, effect_name, effect_expire_at)
+
+    if boosted is None or boosted * rate >= missing:
+        ticks = math.ceil(missing / rate)
+    else:
+        ticks = boosted + math.ceil((missing - boosted * rate) / BASE_ENERGY_REGEN)
+
+    return updated_at + ticks * ENERGY_REGEN_INTERVAL
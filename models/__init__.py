@@ -1,3 +1,3 @@
-from .users_model import GameEvent, User, UserQuest, Wallet
+from .users_model import GameEvent, ScheduledEvent, User, UserQuest, Wallet
 from .inventory_model import Inventory, Items
 from .marketplace_model import Marketplace
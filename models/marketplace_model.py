@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Integer, PrimaryKeyConstraint, ForeignKey, String, Boolean, CheckConstraint, UniqueConstraint, Date
+from sqlalchemy import Column, BigInteger, Integer, PrimaryKeyConstraint, ForeignKey, String, Boolean, CheckConstraint, UniqueConstraint, Date, Index
 from sqlalchemy.orm import relationship
 
 from datetime import date
@@ -8,6 +8,12 @@ from models.users_model import Base
 
 class Marketplace(Base):
     __tablename__ = 'marketplace'
+    __table_args__ = (
+        # Order book: cheapest listings of an item, keyset on (price, listing_id)
+        Index('ix_marketplace_item_price', 'item_id', 'price', 'listing_id'),
+        Index('ix_marketplace_price', 'price', 'listing_id'),
+        Index('ix_marketplace_user_id', 'user_id'),
+    )
 
     listing_id = Column(Integer, primary_key=True)
     user_id = Column(BigInteger, ForeignKey('users.user_id', ondelete = 'CASCADE'))
@@ -1,12 +1,17 @@
-from sqlalchemy import Column, ForeignKey, BigInteger, String, Integer, SmallInteger, TIMESTAMP, Boolean, PrimaryKeyConstraint, Text, func, CheckConstraint, Index, ForeignKeyConstraint
+from sqlalchemy import Column, ForeignKey, BigInteger, String, Integer, SmallInteger, TIMESTAMP, Boolean, LargeBinary, PrimaryKeyConstraint, Text, func, CheckConstraint, Index, ForeignKeyConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
 
+from datetime import datetime
+
 
 Base = declarative_base()
 
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        Index('ix_users_exp', 'exp'),
+    )
 
     user_id = Column(BigInteger, primary_key=True)
     user_name = Column(String(40), nullable=False)
@@ -15,10 +20,15 @@ class User(Base):
     joined = Column(TIMESTAMP, nullable=False)
     starter_given = Column(Boolean, nullable=False, default=False)
     energy = Column(Integer, default=0)
+    # Energy regenerates lazily from this timestamp (see energy_services)
+    energy_updated_at = Column(TIMESTAMP, default=datetime.utcnow)
+    energy_full_at = Column(TIMESTAMP, nullable=True, index=True)
     tutorial_state = Column(Integer, default=0)
     campaign_stage = Column(Integer, default=1)
     starter_loan_given = Column(Boolean, nullable=False, default=False)
     notif = Column(Boolean, nullable=False, default=True)
+    # Materialized inventory slot usage; NULL until first computed (see inventory_services)
+    inventory_slots_used = Column(Integer, nullable=True)
 
     wallet = relationship('Wallet', back_populates='user', uselist=False, cascade='all, delete')
     inventory = relationship('Inventory', back_populates='user', cascade='all, delete')
@@ -63,6 +73,11 @@ class User(Base):
 
 class UserStats(Base):
     __tablename__ = 'user_stats'
+    __table_args__ = (
+        Index('ix_user_stats_battles_won', 'battles_won'),
+        Index('ix_user_stats_races_won', 'races_won'),
+        Index('ix_user_stats_longest_quest_streak', 'longest_quest_streak'),
+    )
 
     user_id = Column(BigInteger, ForeignKey('users.user_id', ondelete='CASCADE'), primary_key=True)
     battles_won = Column(Integer, default=0)
@@ -98,6 +113,9 @@ class GameEvent(Base):
 
 class Wallet(Base):
     __tablename__ = 'wallet'
+    __table_args__ = (
+        Index('ix_wallet_gold', 'gold'),
+    )
 
     user_id = Column(BigInteger, ForeignKey('users.user_id', ondelete='CASCADE'), primary_key=True)
     gold = Column(Integer, default=0)
@@ -146,12 +164,26 @@ class Daily(Base):
     user_id = Column(BigInteger, primary_key=True)
     last_number_game = Column(TIMESTAMP, nullable=True)
 
-class LotteryEntries(Base):
-    __tablename__ = 'lottery_entries'
+class LotteryTicket(Base):
+    __tablename__ = 'lottery_tickets'
+    __table_args__ = (
+        Index('ix_lottery_tickets_user_id', 'user_id'),
+    )
 
-    user_id = Column(BigInteger, primary_key=True)
-    tickets = Column(JSONB, default=list)
-    ticket_price = Column(Integer, default=10)
+    ticket_id = Column(BigInteger, primary_key=True)
+    user_id = Column(BigInteger, nullable=False)
+    ticket_price = Column(Integer, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+# Single row (id=1) with the running totals of the current round and the ticket id counter
+class LotteryRound(Base):
+    __tablename__ = 'lottery_round'
+
+    id = Column(SmallInteger, primary_key=True)
+    tickets_sold = Column(Integer, nullable=False, default=0)
+    prize_pool = Column(BigInteger, nullable=False, default=0)
+    next_ticket_id = Column(BigInteger, nullable=False)
 
 class Friendship(Base):
     __tablename__ = 'friendship'
@@ -316,3 +348,39 @@ class BattleQueue(Base):
     )
 
     user = relationship("User", back_populates="battle_queue")
+
+
+# One pending deadline per (event_type, user); see scheduled_events_services
+class ScheduledEvent(Base):
+    __tablename__ = 'scheduled_events'
+    __table_args__ = (
+        PrimaryKeyConstraint('event_type', 'user_id'),
+        Index('ix_scheduled_events_due_at', 'due_at'),
+    )
+
+    event_type = Column(String, nullable=False)
+
+    user_id = Column(
+        BigInteger,
+        ForeignKey('users.user_id', ondelete='CASCADE'),
+        nullable=False
+    )
+
+    due_at = Column(TIMESTAMP, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
+
+
+# Seed + move log of a finished battle; see services.battle.replay for the format
+class BattleReplayLog(Base):
+    __tablename__ = 'battle_replays'
+    __table_args__ = (
+        Index('ix_battle_replays_p1_user_id', 'p1_user_id'),
+        Index('ix_battle_replays_p2_user_id', 'p2_user_id'),
+    )
+
+    replay_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)
+    p1_user_id = Column(BigInteger, nullable=False)
+    p2_user_id = Column(BigInteger, nullable=True)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(TIMESTAMP, server_default=func.now())
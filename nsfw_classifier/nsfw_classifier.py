@@ -1,14 +1,160 @@
-import joblib
+"""
+NSFW text classifier.
+
+The model and vectorizer are unpickled on first use, not at import, so
+importing this module is free. ``classify_batch`` scores many texts with one
+sparse ``transform`` and one ``predict_proba``. ``NsfwClassifier`` is the
+async front end for the bot: messages that arrive close together are scored
+as a single batch in a worker thread, and recent results are kept in an LRU
+cache keyed on normalized text, so moderation never blocks the event loop.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import joblib
+
+logger = logging.getLogger(__name__)
+
 BASE_DIR = Path(__file__).resolve().parent
-model = joblib.load(BASE_DIR / "nsfw_classifier_v1.pkl")
-vectorizer = joblib.load(BASE_DIR / "vectorizer.pkl")
+MODEL_PATH = BASE_DIR / "nsfw_classifier_v1.pkl"
+VECTORIZER_PATH = BASE_DIR / "vectorizer.pkl"
+
+NSFW_LABEL = 1
+# How long the first message of a batch waits for others to join (seconds)
+BATCH_WINDOW = 0.02
+MAX_BATCH_SIZE = 64
+CACHE_SIZE = 4096
+
+_model = None
+_vectorizer = None
+_load_lock = threading.Lock()
+
+
+def _load():
+    global _model, _vectorizer
+
+    if _model is None:
+        with _load_lock:
+            if _model is None:
+                _vectorizer = joblib.load(VECTORIZER_PATH)
+                _model = joblib.load(MODEL_PATH)
+    return _model, _vectorizer
+
+
+def normalize(text: str) -> str:
+    """
+    Cache key, and the text that gets scored. The vectorizer lowercases with
+    str.lower() and splits on word characters, so this yields the same tokens
+    as the raw text. casefold() would not ("ﬁ" becomes "fi").
+    """
+    return " ".join(text.lower().split())
+
+
+def classify_batch(texts: list[str]) -> list[tuple[int, tuple[float, ...]]]:
+    """Return (prediction, class probabilities) for each text, in order."""
+    if not texts:
+        return []
+
+    model, vectorizer = _load()
+    probabilities = model.predict_proba(vectorizer.transform(texts))
+    # predict() is the argmax of predict_proba(), so it is not run a second time
+    predictions = model.classes_[probabilities.argmax(axis=1)]
+    return [
+        (int(prediction), tuple(float(p) for p in row))
+        for prediction, row in zip(predictions, probabilities)
+    ]
+
 
 def classify(text):
     """Function to classify whether the input text is Nsfw or Sfw along with confidence"""
-    vec = vectorizer.transform([text])
-    prediction = model.predict(vec)[0]
-    confidence = model.predict_proba(vec)[0]
+    return classify_batch([text])[0]
+
+
+class NsfwClassifier:
+    """Micro-batching, cached, off-loop front end for ``classify_batch``."""
+
+    def __init__(
+        self,
+        batch_fn=classify_batch,
+        batch_window: float = BATCH_WINDOW,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        cache_size: int = CACHE_SIZE,
+    ):
+        self.batch_fn = batch_fn
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, tuple] = OrderedDict()
+        # normalized text -> future shared by every caller waiting on it
+        self._pending: dict[str, asyncio.Future] = {}
+        self._batch: list[str] = []
+        self._flush_handle = None
+        # One thread: batches run in order and the model is only ever loaded once
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nsfw-classifier")
+        self.batches = 0
+
+    async def classify(self, text: str) -> tuple[int, tuple[float, ...]]:
+        key = normalize(text)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            self._batch.append(key)
+            if len(self._batch) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+
+        # Callers share the future, so one being cancelled must not cancel the rest
+        return await asyncio.shield(future)
+
+    async def is_nsfw(self, text: str, threshold: float = 0.5) -> bool:
+        prediction, confidence = await self.classify(text)
+        return prediction == NSFW_LABEL and max(confidence) >= threshold
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch, self._batch = self._batch, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: list[str]):
+        self.batches += 1
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self._executor, self.batch_fn, batch)
+        except Exception as exc:
+            logger.exception("NSFW classification failed for a batch of %s", len(batch))
+            for key in batch:
+                future = self._pending.pop(key)
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for key, result in zip(batch, results):
+            self._remember(key, result)
+            future = self._pending.pop(key)
+            if not future.done():
+                future.set_result(result)
+
+    def _remember(self, key: str, result: tuple) -> None:
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
 
-    return prediction, confidence
\ No newline at end of file
+nsfw_classifier = NsfwClassifier()
@@ -3,13 +3,15 @@ from datetime import datetime, timedelta
 from database.sessionmaker import Session
 
 from models.inventory_model import Inventory
-from models.users_model import UserEffects
+from models.users_model import User, UserEffects
 
 from domain.alchemy.potion_recipes import POTION_RECIPES
 from domain.alchemy.rules import can_craft_potion_tier, resolve_potion, roll_strain_risk
 
+from services.energy_services import settle_energy
 from services.inventory_services import take_items_bulk, give_item
 from services.quest_services import update_quest_progress
+from services.scheduled_events_services import EFFECT_EXPIRED_EVENT, cancel_event, schedule_event
 
 from utils.itemname_to_id import get_item_id_safe
 
@@ -107,6 +109,14 @@ def check_ingredients(session, user_id: int, ingredients: dict):
     return True
 
 
+def _settle_user_energy(session, user_id: int):
+    """Bank energy regen at the rate of the effect currently on the row."""
+    user = session.get(User, user_id)
+    if user is not None:
+        session.flush()
+        settle_energy(session, user)
+
+
 def apply_user_effect(session, user_id: int, effect_name: str, strain: int, expire_hours=None):
     """
     Applies or updates a user effect.
@@ -121,6 +131,9 @@ def apply_user_effect(session, user_id: int, effect_name: str, strain: int, expi
     if expire_hours is not None:
         expire_at = datetime.utcnow() + timedelta(hours=expire_hours)
 
+    # Regen up to now happened at the old rate; the new effect only counts from here
+    _settle_user_energy(session, user_id)
+
     existing = (
         session.query(UserEffects)
         .filter(UserEffects.user_id == user_id)
@@ -140,6 +153,13 @@ def apply_user_effect(session, user_id: int, effect_name: str, strain: int, expi
         )
         session.add(new_effect)
 
+    if expire_at is None:
+        cancel_event(session, EFFECT_EXPIRED_EVENT, user_id)
+    else:
+        schedule_event(session, EFFECT_EXPIRED_EVENT, user_id, expire_at)
+
+    # Move the ENERGY_FULL deadline to the new rate
+    _settle_user_energy(session, user_id)
     return True
 
 
@@ -229,6 +249,11 @@ def use_potion(user_id: int, potion_name: str):
         if not roll_strain_risk(current_strain):
             return "You attempt to drink the potion, but your body violently rejects it. You collapse to the ground as darkness takes you. The potion is wasted."
 
+        # Bank regen at the old rate before an energy effect changes it
+        user = session.get(User, user_id)
+        if user:
+            settle_energy(session, user)
+
         # Apply effect
         apply_user_effect(
             session=session,
@@ -237,6 +262,9 @@ def use_potion(user_id: int, potion_name: str):
             strain=strain_amount,
             expire_hours=recipe.get("expire_at")
         )
+        if user:
+            # Recompute energy_full_at under the new regen rate
+            settle_energy(session, user)
 
         session.commit()
         return f"You drink the potion and feel its effects: {effect_name}"
@@ -281,6 +309,21 @@ def expire_user_effect(session, user_id: int, effect_name: str | None = None):
     if effect_name is not None and effect.effect_name != effect_name:
         return False
 
+    _settle_user_energy(session, user_id)
     effect.expire_at = datetime.utcnow() - timedelta(seconds=1)
+    # Re-time ENERGY_FULL now that the boost is gone
+    _settle_user_energy(session, user_id)
+    # Consumed effects end silently, without the "worn off" notification
+    cancel_event(session, EFFECT_EXPIRED_EVENT, user_id)
     session.commit()
-    return True
\ No newline at end of file
+    return True
+
+
+async def notify_effect_expired(bot, user_ids):
+    """
+    Tell users their potion effect wore off.
+    Dispatched by the event scheduler at the expiry registered in apply_user_effect.
+    """
+    from services.notif_services import send_notifications
+
+    await send_notifications(bot, user_ids, "EFFECT_EXPIRED")
\ No newline at end of file
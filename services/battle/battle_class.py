@@ -35,6 +35,8 @@ class Battle:
         self.log = []
         self.regen_state = 'hp'
         self.origin = "player"
+        # Shared with the opponent by BattleManager so each battle has its own seeded stream
+        self.rng = random
         # Track recent moves for AI pattern analysis
         self.move_history = deque(maxlen=5)
 
@@ -86,7 +88,7 @@ class Battle:
         if target.current_stance == 'attack':
             if self.weapon.on_block(self) == "fullblock": #if the weapon returns  full block
 
-                random_defense_buff = random.randint(12, 19)
+                random_defense_buff = self.rng.randint(12, 19)
                 self.defense += random_defense_buff
                 self.hp -= 0 #no hp loss
                 return {
@@ -97,7 +99,7 @@ class Battle:
 
             # Calculate chance to fail block based on speed difference
             fail_chance = self.calculate_fail_chance(target.speed, self.speed)
-            roll = random.randint(1, 100)
+            roll = self.rng.randint(1, 100)
 
             if roll <= fail_chance:
                 # Block failed due to low speed
@@ -106,7 +108,7 @@ class Battle:
                 }
 
             # Successful block: increase defense and reduce HP damage to 30%
-            random_defense_buff = random.randint(12, 20)
+            random_defense_buff = self.rng.randint(12, 20)
             self.defense += random_defense_buff
             self.hp -= int(dmg * 0.3)
             return {
@@ -116,7 +118,7 @@ class Battle:
 
         else:
             # Incorrect prediction: suffer defense penalties
-            random_defense_debuff = random.randint(8, 15)
+            random_defense_debuff = self.rng.randint(8, 15)
             self.defense -= random_defense_debuff
             self.defense = max(0, self.defense)
             return{
@@ -145,8 +147,8 @@ class Battle:
             return dmg_reflected
 
         # Failed counter: apply random speed and defense debuffs or HP damage
-        random_speed_debuff = random.randint(2, 4)
-        random_defense_debuff = random.randint(10, 15)
+        random_speed_debuff = self.rng.randint(2, 4)
+        random_defense_debuff = self.rng.randint(10, 15)
         hp_drained = 0
         if self.speed < random_speed_debuff:
             # Not enough speed to penalize attacker, take HP damage instead
@@ -195,7 +197,7 @@ class Battle:
                         'status': "blocked"
                     }
 
-                hp_to_regen = random.randint(7, 10)
+                hp_to_regen = self.rng.randint(7, 10)
                 self.hp += hp_to_regen
                 self.regen_state = 'mana'
 
@@ -205,7 +207,7 @@ class Battle:
                 }
 
             if regen_stat == 'mana':
-                mana_to_regen = random.randint(3, 5)
+                mana_to_regen = self.rng.randint(3, 5)
                 self.mana += mana_to_regen
                 self.regen_state = 'hp'
                 return {
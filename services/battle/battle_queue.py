@@ -1,5 +1,17 @@
-import random
-from sqlalchemy import select, and_, func
+"""PvP matchmaking queue.
+
+Matching runs against an in-memory index (see services.battle.matchmaking).
+The ``battle_queue`` table is the durable copy, reloaded into the index at
+startup. Every entry expires after QUEUE_TTL through the scheduled event
+runner, which also sends the "removed from queue" DM.
+"""
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select
 
 from database.sessionmaker import Session
 
@@ -8,7 +20,9 @@ from models.users_model import BattleQueue
 from domain.battle.rules import queue_bet_validation
 
 from services.economy_services import check_wallet_full, remove_gold
+from services.scheduled_events_services import BATTLE_QUEUE_EXPIRED_EVENT, cancel_event, schedule_event
 from .battle_simulation import start_battle_simulation
+from .matchmaking import MatchmakingIndex, QueueEntry
 
 from utils.embeds.battleembed import build_match_found_embed, build_removed_from_queue_embed
 from utils.custom_errors import NotEnoughGoldError
@@ -16,9 +30,40 @@ from utils.embeds.battleembed import send_battle_challenge
 from utils.emotes import GOLD_EMOJI
 from utils.send_dm import send_dm
 
+logger = logging.getLogger(__name__)
+
+QUEUE_TTL = timedelta(minutes=30)
+
+queue_index = MatchmakingIndex()
+_queue_lock = threading.Lock()
+
+# Keeps fire-and-forget DM tasks alive until they finish
+_background_tasks = set()
+
+
+def load_battle_queue() -> int:
+    """Rebuild the index from the table and make sure every entry has an expiry. Called at startup."""
+    with Session() as session:
+        rows = session.execute(
+            select(BattleQueue).order_by(BattleQueue.created_at)
+        ).scalars().all()
+
+        with _queue_lock:
+            queue_index.clear()
+            for row in rows:
+                queue_index.add(QueueEntry(row.user_id, row.min_bet, row.max_bet, row.score or 0))
+
+        for row in rows:
+            schedule_event(session, BATTLE_QUEUE_EXPIRED_EVENT, row.user_id, (row.created_at or datetime.utcnow()) + QUEUE_TTL)
+        session.commit()
+
+    return len(rows)
 
 
 def add_to_queue(session, user_id: int, min_bet: int, max_bet: int):
+    """Upsert the durable queue row and (re)arm its expiry. The caller owns the commit."""
+
+    schedule_event(session, BATTLE_QUEUE_EXPIRED_EVENT, user_id, datetime.utcnow() + QUEUE_TTL)
 
     entry = session.get(BattleQueue, user_id)
 
@@ -38,89 +83,49 @@ def add_to_queue(session, user_id: int, min_bet: int, max_bet: int):
     return "add"
 
 
-
-def find_match(session, user_id: int, min_bet: int, max_bet: int):
-    """
-    Find a compatible opponent from the battle queue.
-
-    Matching rules:
-    - Exclude the caller
-    - Bet ranges must overlap
-    - Prefer highest score
-    - If score tie -> random choice
-
-    Returns:
-        matched_user_id (int) or None
-    """
-
-    stmt = (
-        select(BattleQueue)
-        .where(
-            BattleQueue.user_id != user_id,
-            BattleQueue.min_bet <= max_bet,
-            BattleQueue.max_bet >= min_bet
-        )
-    )
-
-    candidates = session.execute(stmt).scalars().all()
-
-    if not candidates:
-        return None
-
-    # Sort by score descending
-    candidates.sort(key=lambda e: e.score, reverse=True)
-
-    top_score = candidates[0].score
-    top_candidates = [e for e in candidates if e.score == top_score]
-
-    chosen = random.choice(top_candidates)
-    return chosen.user_id
-
-
-
 def open_to_battle(user_id: int, min_bet: int, max_bet: int):
     """
     Flow:
-    1. Create session
-    2. Try to find match
-    3. If match -> compute bet based on overlap and return both users
-    4. If no match -> add user to queue
+    1. Drop the caller's stale entry and look for a match in memory
+    2. If match -> take the opponent off the queue, bet is the top of the overlap
+    3. If no match -> queue the caller
+    4. Mirror the change to the table in one commit
 
     Returns:
         (user_id, opponent_id, bet) OR (None, None, None)
     """
 
-    with Session() as session:
-        # Remove stale queue entry if user re-queues
-        delete_from_queue(session, [user_id])
-        session.commit()
-
-        opponent_id = find_match(session, user_id, min_bet, max_bet)
-
-        if opponent_id is not None:
-            opponent_entry = session.get(BattleQueue, opponent_id)
-
-            if not opponent_entry:
-                return None, None, None
-
-            overlap_min = max(min_bet, opponent_entry.min_bet)
-            overlap_max = min(max_bet, opponent_entry.max_bet)
-
-            if overlap_max < overlap_min:
-                return None, None, None
-
-            bet = overlap_max  # max possible within overlap
-
-            delete_from_queue(session, [opponent_id])
+    with _queue_lock:
+        stale = queue_index.remove(user_id)
+        opponent = queue_index.find_match(min_bet, max_bet)
+        if opponent is not None:
+            queue_index.remove(opponent.user_id)
+        else:
+            queue_index.add(QueueEntry(user_id, min_bet, max_bet, stale.score if stale else 0))
+
+    try:
+        with Session() as session:
+            if opponent is not None:
+                delete_from_queue(session, [user_id, opponent.user_id])
+            else:
+                add_to_queue(session, user_id, min_bet, max_bet)
             session.commit()
-
-            return user_id, opponent_id, bet
-
-        add_to_queue(session, user_id, min_bet, max_bet)
-        session.commit()
-
+    except Exception:
+        # Put the index back the way the table still is
+        with _queue_lock:
+            queue_index.remove(user_id)
+            if stale is not None:
+                queue_index.add(stale)
+            if opponent is not None:
+                queue_index.add(opponent)
+        raise
+
+    if opponent is None:
         return None, None, None
 
+    bet = min(max_bet, opponent.max_bet)  # max possible within overlap
+    return user_id, opponent.user_id, bet
+
 
 def delete_from_queue(session, user_ids: list[int]):
     """
@@ -137,18 +142,68 @@ def delete_from_queue(session, user_ids: list[int]):
     if not user_ids:
         return 0
 
-    stmt = (
-        select(BattleQueue)
+    with _queue_lock:
+        for user_id in user_ids:
+            queue_index.remove(user_id)
+
+    for user_id in user_ids:
+        cancel_event(session, BATTLE_QUEUE_EXPIRED_EVENT, user_id)
+
+    result = session.execute(
+        delete(BattleQueue)
         .where(BattleQueue.user_id.in_(user_ids))
     )
+    return result.rowcount
+
+
+def _delete_expired_entries(user_ids) -> list[int]:
+    """Delete the queue rows of `user_ids` and return the ones that still existed."""
+    with Session() as session:
+        expired = session.execute(
+            delete(BattleQueue)
+            .where(BattleQueue.user_id.in_(user_ids))
+            .returning(BattleQueue.user_id)
+        ).scalars().all()
+        session.commit()
+    return expired
+
+
+async def expire_queue_entries(bot, user_ids) -> int:
+    """
+    Drop queue entries that waited QUEUE_TTL without a match and DM their owners.
+
+    Dispatched by the event scheduler at the BATTLE_QUEUE_EXPIRED deadline
+    armed in add_to_queue; re-queuing moves the deadline, matching cancels it.
+
+    Returns:
+        int: number of DMs successfully sent
+    """
+    with _queue_lock:
+        for user_id in user_ids:
+            queue_index.remove(user_id)
+
+    expired = await asyncio.to_thread(_delete_expired_entries, user_ids)
 
-    entries = session.execute(stmt).scalars().all()
+    minutes = int(QUEUE_TTL.total_seconds() // 60)
+    embed = build_removed_from_queue_embed(f"No opponent found within {minutes} minutes. Queue again anytime.")
+    sent = await asyncio.gather(*(send_dm(bot, user_id, embed) for user_id in expired))
+    return sum(sent)
 
-    for entry in entries:
-        session.delete(entry)
 
-    return len(entries)
+def _dm_in_background(ctx, user_id: int, embed, fallback: str | None = None):
+    """Send a DM without holding up the challenge; post `fallback` in the channel if it bounces."""
 
+    async def deliver():
+        try:
+            if not await send_dm(ctx.bot, user_id, embed) and fallback:
+                await ctx.channel.send(fallback)
+        except Exception as e:
+            logger.error("Battle queue DM to %s failed: %s", user_id, e)
+
+    task = asyncio.get_running_loop().create_task(deliver())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
 
 
 async def try_to_start_battle_queue(ctx, user_id: int, min_bet: int, max_bet: int):
@@ -165,24 +220,26 @@ async def try_to_start_battle_queue(ctx, user_id: int, min_bet: int, max_bet: in
         p1_gold, _ = check_wallet_full(p1_id, session)
         p2_gold, _ = check_wallet_full(p2_id, session)
 
-        if p1_gold < bet:
-            return f"You need {bet}{GOLD_EMOJI} to start this battle."
-
-        if p2_gold < bet:
-            #remove from q nd dm
-            delete_from_queue(session, [p2_id])
-            session.commit()
-            embed = build_removed_from_queue_embed("Currently not enough gold in wallet. Queue again with smaller bet")
-            await send_dm(ctx.bot, p2_id, embed)
-            return f"<@{p2_id}> doesn’t have enough gold for this battle."
-
-        embed = build_match_found_embed(p1_id, bet, ctx.channel.id)
-        dm_sent = await send_dm(ctx.bot, p2_id, embed)
-        if not dm_sent:
-            await ctx.respond(f"<@{p2_id}> battle’s ready ⚔️ \nTried to DM you but it didn’t go through. Check your privacy settings or blame Discord.")
-        result = await send_battle_challenge(ctx, p1_id, p2_id, bet)
+    if p1_gold < bet:
+        return f"You need {bet}{GOLD_EMOJI} to start this battle."
+
+    if p2_gold < bet:
+        # Already off the queue since the match; just let them know
+        embed = build_removed_from_queue_embed("Currently not enough gold in wallet. Queue again with smaller bet")
+        _dm_in_background(ctx, p2_id, embed)
+        return f"<@{p2_id}> doesn’t have enough gold for this battle."
+
+    embed = build_match_found_embed(p1_id, bet, ctx.channel.id)
+    _dm_in_background(
+        ctx,
+        p2_id,
+        embed,
+        fallback=f"<@{p2_id}> battle’s ready ⚔️ \nTried to DM you but it didn’t go through. Check your privacy settings or blame Discord.",
+    )
+    result = await send_battle_challenge(ctx, p1_id, p2_id, bet)
 
-        if result is True:
+    if result is True:
+        with Session() as session:
             try:
                 remove_gold(p1_id, bet, session)
                 remove_gold(p2_id, bet, session)
@@ -192,14 +249,14 @@ async def try_to_start_battle_queue(ctx, user_id: int, min_bet: int, max_bet: in
                 session.rollback()
                 return "Gold check failed. Battle cancelled."
 
-            p1_user = await ctx.bot.fetch_user(p1_id)
-            p2_user = await ctx.bot.fetch_user(p2_id)
-            await start_battle_simulation(ctx, p1_user, p2_user, bet)
+        p1_user = ctx.bot.get_user(p1_id) or await ctx.bot.fetch_user(p1_id)
+        p2_user = ctx.bot.get_user(p2_id) or await ctx.bot.fetch_user(p2_id)
+        await start_battle_simulation(ctx, p1_user, p2_user, bet)
 
-            return None
+        return None
 
-        if result is False:
-            return "The challenge was rejected."
+    if result is False:
+        return "The challenge was rejected."
 
-        # Timed out / no response: refund pot.
-        return "No response received. Match cancelled."
+    # Timed out / no response: refund pot.
+    return "No response received. Match cancelled."
@@ -183,7 +183,7 @@ async def start_battle_simulation(ctx, challenger: discord.User, target: discord
             return p1_move, p2_move, p1_move is None, p2_move is None
 
         async def finalizer(_result_state):
-            settlement = SettlementService.resolve_pvp(
+            settlement = await SettlementService.resolve_pvp_async(
                 challenger_id=challenger.id,
                 challenger_name=challenger.name,
                 target_id=target.id,
@@ -191,6 +191,7 @@ async def start_battle_simulation(ctx, challenger: discord.User, target: discord
                 bet=bet,
                 p1=session.p1,
                 p2=session.p2,
+                replay=session.replay,
             )
             await ctx.channel.send(
                 embed=build_final_embed(
@@ -239,6 +240,7 @@ async def start_campaign_battle(ctx, player: discord.User, result_display_time:
             opponent=player_fighter,
             stage=stage,
             difficulty="normal",
+            rng=manager.ai_rng(),
         )
         session = BattleSession(manager, timeout_penalty=TIMEOUT_PENALTY)
 
@@ -257,13 +259,14 @@ async def start_campaign_battle(ctx, player: discord.User, result_display_time:
             return p1_move, p2_move, p1_move is None, False
 
         async def finalizer(_result_state):
-            settlement = SettlementService.resolve_campaign(
+            settlement = await SettlementService.resolve_campaign_async(
                 player_id=player.id,
                 player_name=player.name,
                 enemy_name=enemy_name,
                 stage=stage,
                 p1=session.p1,
                 p2=session.p2,
+                replay=session.replay,
             )
             await ctx.channel.send(
                 embed=build_final_embed(
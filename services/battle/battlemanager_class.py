@@ -1,3 +1,5 @@
+import random
+
 from services.battle.engine_types import RoundContext
 from services.battle.round_resolution import resolve_round
 
@@ -11,13 +13,24 @@ class BattleManager:
     - Set player stances and process effects each turn.
     - Resolve the round by determining damage, defense, counters, recoveries, and spell casts.
     - Determine the winner or if the battle results in a tie.
+
+    Every roll in the battle comes from one `random.Random(seed)` shared by both
+    fighters, so the same seed and moves always play out the same way.
     """
 
-    def __init__(self, player1, player2):
+    def __init__(self, player1, player2, seed: int | None = None):
         self.p1 = player1
         self.p2 = player2
         self.round = 1
         self.arena = None
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        player1.rng = self.rng
+        player2.rng = self.rng
+
+    def ai_rng(self) -> random.Random:
+        """Separate stream for NPC move choice, reproducible from the battle seed."""
+        return random.Random(self.seed + 1)
 
     def execute_turn(self, p1_move, p2_move):
         self.p1.set_stance(p1_move)
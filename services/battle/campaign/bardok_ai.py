@@ -18,8 +18,8 @@ class BardokAI(BaseAI):
     Designed to punish repetition and favor direct combat.
     """
 
-    def __init__(self, bardok=None, player=None, stage=11):
-        super().__init__(fighter=bardok, opponent=player)
+    def __init__(self, bardok=None, player=None, stage=11, rng=None):
+        super().__init__(fighter=bardok, opponent=player, rng=rng)
         self.bardok = bardok
         self.player = player
         self.stage = stage
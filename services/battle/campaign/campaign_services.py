@@ -36,28 +36,40 @@ from utils.emotes import GOLD_EMOJI
 # hardcoding reward logic per stage.
 
 
-def get_campaign_stage(user_id: int) -> int:
+def get_campaign_stage(user_id: int, session=None) -> int:
     """
     Fetch the user's current campaign stage.
 
     Args:
         user_id (int): Discord user ID.
+        session: Optional SQLAlchemy session to read through.
 
     Returns:
         int: Campaign stage (1–10).
     """
+    if session is not None:
+        result = session.get(User, user_id)
+        return result.campaign_stage if result else 1
+
     with Session() as session:
         result = session.get(User, user_id)
         return result.campaign_stage if result else 1
 
-def advance_campaign_stage(user_id: int) -> None:
+def advance_campaign_stage(user_id: int, session=None) -> None:
     """
     Advance the user's campaign stage by one.
 
     Notes:
         - Campaign stages are capped at stage 15.
         - This function must only be called after a confirmed campaign victory.
+        - If a session is provided, the caller owns the commit.
     """
+    if session is not None:
+        user = session.get(User, user_id)
+        if user and user.campaign_stage < 16:
+            user.campaign_stage += 1
+        return
+
     with Session() as session:
         user = session.get(User, user_id)
         if user:
@@ -78,12 +90,13 @@ def allow_campaign_weapons(user_id: int) -> bool:
     return get_campaign_stage(user_id) >= 10  # Campaign completion unlocks exclusive weapons
 
 
-def give_stage_rewards(user_id: int) -> None:
+def give_stage_rewards(user_id: int, session=None) -> None:
     """
     Resolve and grant rewards for the user's current campaign stage.
     Rewards are defined declaratively in REWARD_CHART.
+    If a session is provided, the caller owns the commit.
     """
-    stage = get_campaign_stage(user_id)
+    stage = get_campaign_stage(user_id, session=session)
     reward = REWARD_CHART.get(stage)
 
     if reward:
@@ -91,16 +104,16 @@ def give_stage_rewards(user_id: int) -> None:
         key, value = next(iter(reward.items()))
 
         if key == "Gold":
-            add_gold(user_id, value)
+            add_gold(user_id, value, session=session)
         elif key != "Unlock":
-            give_item(user_id, key, value, True)
+            give_item(user_id, key, value, True, session=session)
 
     gear_reward = campaign_gear_reward_for_stage(stage)
     if gear_reward:
-        give_item(user_id, gear_reward.item_id, 1, True)
+        give_item(user_id, gear_reward.item_id, 1, True, session=session)
 
-def stage_reward_details(user_id: int):
-    stage = get_campaign_stage(user_id)
+def stage_reward_details(user_id: int, session=None):
+    stage = get_campaign_stage(user_id, session=session)
     reward = REWARD_CHART.get(stage)
 
     message = None
@@ -124,6 +137,9 @@ def stage_reward_details(user_id: int):
                 "Beside it rests a swirling vial — a Potion of Hatred I.\n\n"
                 "You claim the relics of a defeated legend."
             )
+        elif session is not None:
+            item = session.get(Items, key)
+            message = f"You received {value}× {item.item_name}!"
         else:
             with Session() as session:
                 item = session.get(Items, key)
@@ -10,9 +10,11 @@ class BaseAI:
     Handles shared utilities like weighted choice and opponent move history.
     """
 
-    def __init__(self, fighter, opponent):
+    def __init__(self, fighter, opponent, rng=None):
         self.fighter = fighter
         self.opponent = opponent
+        # Kept apart from the battle's stream: replays record the chosen moves, not the AI's draws
+        self.rng = rng or random
 
         # Track opponent move history for pattern detection
         if not hasattr(self.opponent, "move_history"):
@@ -23,7 +25,7 @@ class BaseAI:
         Choose a stance based on weighted probabilities.
         Order: attack, block, counter, recover, cast
         """
-        return random.choices(
+        return self.rng.choices(
             list(VALID_STANCES),
             weights=weights,
             k=1
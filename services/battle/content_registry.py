@@ -119,6 +119,9 @@ class ContentRegistry:
     def list_spells(self) -> list[str]:
         return list(self._spells.keys())
 
+    def list_arenas(self) -> list[str]:
+        return list(self._arenas.keys())
+
     def create_weapon(self, key: str):
         definition = self._weapons[key]
         weapon = definition.factory()
@@ -132,7 +135,9 @@ class ContentRegistry:
         return spell
 
     def create_arena(self, key: str):
-        return self._arenas[key].factory()
+        arena = self._arenas[key].factory()
+        arena.content_key = key
+        return arena
 
     def create_npc_ai(self, key: str, **kwargs):
         return self._npcs[key].ai_factory(**kwargs)
@@ -168,6 +173,7 @@ CONTENT_REGISTRY.register_npc(
         difficulty=kwargs.get("difficulty", "normal"),
         veyra=kwargs["fighter"],
         player=kwargs["opponent"],
+        rng=kwargs.get("rng"),
     ),
 )
 CONTENT_REGISTRY.register_npc(
@@ -177,6 +183,7 @@ CONTENT_REGISTRY.register_npc(
         bardok=kwargs["fighter"],
         player=kwargs["opponent"],
         stage=kwargs.get("stage", 11),
+        rng=kwargs.get("rng"),
     ),
 )
 
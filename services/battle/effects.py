@@ -1,6 +1,3 @@
-import random
-
-
 def _process_largeheal(fighter, _effect: str, _data: dict) -> None:
     if not fighter.can_heal:
         fighter.log.append("Healing failed because of Dark blade effect")
@@ -23,7 +20,7 @@ def _process_nightfall(fighter, _effect: str, _data: dict) -> None:
     if not valid:
         return
 
-    chosen = random.choice(valid)
+    chosen = fighter.rng.choice(valid)
     drop = drops[chosen]
     setattr(fighter, chosen, max(0, getattr(fighter, chosen) - drop))
     fighter.log.append(f"{fighter.name}'s {chosen} drops by {drop}")
@@ -17,6 +17,7 @@ from domain.battle.rules import (
     get_spell_label,
 )
 from services.battle.gear_shard_services import owns_spell, owns_weapon
+from services.talk_to_veyra.chat_user_cache import invalidate_chat_user
 
 def _normalize_input(value: str) -> str:
     """
@@ -68,6 +69,7 @@ def update_loadout(user_id: int, weapon: str = None, spell: str = None):
 
     with Session() as session:
         warrior = session.get(BattleLoadout, user_id)
+        invalidate_chat_user(user_id, session)
 
         if warrior:
             if weapon_key:
@@ -0,0 +1,164 @@
+"""In-memory matchmaking index for the PvP battle queue.
+
+Queued players are bucketed by score; a max-heap of scores means the best
+bucket is tried first. Each bucket is a treap ordered by ``min_bet`` whose
+nodes also carry the largest ``max_bet`` in their subtree. A range [lo, hi]
+overlaps an entry when ``min_bet <= hi`` and ``max_bet >= lo``, so the search
+walks down to the leftmost entry with ``max_bet >= lo`` and accepts it if its
+``min_bet <= hi``. Nothing further right can match if it fails that check. That
+is one root-to-leaf walk per bucket, O(log n).
+
+Within a score, the match is the entry with the lowest ``min_bet``. If two
+entries share a ``min_bet``, the one queued first wins.
+"""
+
+import heapq
+import random
+from dataclasses import dataclass, field
+from itertools import count
+
+
+@dataclass(frozen=True)
+class QueueEntry:
+    user_id: int
+    min_bet: int
+    max_bet: int
+    score: int = 0
+
+
+@dataclass(eq=False)
+class _Node:
+    key: tuple[int, int]  # (min_bet, queue order)
+    entry: QueueEntry
+    priority: float = field(default_factory=random.random)
+    left: "_Node | None" = None
+    right: "_Node | None" = None
+    span_max: int = 0
+
+    def update(self):
+        self.span_max = max(
+            self.entry.max_bet,
+            self.left.span_max if self.left else self.entry.max_bet,
+            self.right.span_max if self.right else self.entry.max_bet,
+        )
+
+
+def _split(node, key):
+    """Split into (< key, >= key)."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        node.update()
+        return node, right
+    left, node.left = _split(node.left, key)
+    node.update()
+    return left, node
+
+
+def _merge(left, right):
+    if left is None or right is None:
+        return left or right
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        left.update()
+        return left
+    right.left = _merge(left, right.left)
+    right.update()
+    return right
+
+
+def _insert(root, node):
+    node.update()
+    left, right = _split(root, node.key)
+    return _merge(_merge(left, node), right)
+
+
+def _delete(root, key):
+    if root is None:
+        return None
+    if key == root.key:
+        return _merge(root.left, root.right)
+    if key < root.key:
+        root.left = _delete(root.left, key)
+    else:
+        root.right = _delete(root.right, key)
+    root.update()
+    return root
+
+
+def _leftmost_overlap(node, lo: int, hi: int) -> QueueEntry | None:
+    while node is not None and node.span_max >= lo:
+        if node.left is not None and node.left.span_max >= lo:
+            node = node.left
+        elif node.entry.max_bet >= lo:
+            return node.entry if node.entry.min_bet <= hi else None
+        else:
+            node = node.right
+    return None
+
+
+class MatchmakingIndex:
+    """Queue of players open to battle, one entry per user."""
+
+    def __init__(self):
+        self._roots: dict[int, _Node] = {}
+        self._score_heap: list[int] = []  # negated scores; may hold emptied buckets
+        self._heap_scores: set[int] = set()
+        self._keys: dict[int, tuple[int, int]] = {}
+        self._entries: dict[int, QueueEntry] = {}
+        self._order = count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, user_id: int):
+        return user_id in self._entries
+
+    def get(self, user_id: int) -> QueueEntry | None:
+        return self._entries.get(user_id)
+
+    def add(self, entry: QueueEntry) -> None:
+        """Queue a player, replacing (and re-queuing at the back) any entry they had."""
+        self.remove(entry.user_id)
+
+        key = (entry.min_bet, next(self._order))
+        if entry.score not in self._heap_scores:
+            heapq.heappush(self._score_heap, -entry.score)
+            self._heap_scores.add(entry.score)
+        self._roots[entry.score] = _insert(self._roots.get(entry.score), _Node(key, entry))
+        self._keys[entry.user_id] = key
+        self._entries[entry.user_id] = entry
+
+    def remove(self, user_id: int) -> QueueEntry | None:
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return None
+
+        root = _delete(self._roots[entry.score], self._keys.pop(user_id))
+        if root is None:
+            del self._roots[entry.score]
+        else:
+            self._roots[entry.score] = root
+        return entry
+
+    def find_match(self, min_bet: int, max_bet: int) -> QueueEntry | None:
+        """Highest-score entry whose bet range overlaps [min_bet, max_bet]."""
+        checked = []
+        match = None
+        while self._score_heap:
+            neg_score = heapq.heappop(self._score_heap)
+            if -neg_score not in self._roots:
+                self._heap_scores.discard(-neg_score)  # bucket emptied since it was pushed
+                continue
+            checked.append(neg_score)
+            match = _leftmost_overlap(self._roots[-neg_score], min_bet, max_bet)
+            if match is not None:
+                break
+
+        for neg_score in checked:
+            heapq.heappush(self._score_heap, neg_score)
+        return match
+
+    def clear(self) -> None:
+        self.__init__()
@@ -0,0 +1,218 @@
+"""Compact binary battle replays.
+
+A replay keeps only what cannot be re-derived: the battle seed, the content
+each fighter brought, their starting stat adjustments and one byte per round
+for the two moves and timeouts. Everything else is recomputed by playing the
+moves back through the engine with the same seed: about 100 bytes of header,
+then one byte per round.
+
+Layout (little endian):
+    header   magic "VR", version u8, seed u64, timeout penalty u8
+    content  arena key, then per fighter weapon key, spell key, origin,
+             each a u8 length + ASCII
+    stats    per fighter attack/defense/speed/hp/mana deltas as i16
+    rounds   u16 count, then one byte per round:
+             bits 0-2 p1 move, bits 3-5 p2 move, bit 6/7 p1/p2 timed out
+"""
+
+import struct
+from dataclasses import dataclass, field
+
+from services.battle.battle_class import Battle
+from services.battle.battlemanager_class import BattleManager
+from services.battle.constants import VALID_STANCES
+from services.battle.content_registry import CONTENT_REGISTRY
+from services.battle.spell_class import NoSpell
+
+REPLAY_MAGIC = b"VR"
+REPLAY_VERSION = 1
+
+_HEADER = struct.Struct("<2sBQB")
+_STATS = ("attack", "defense", "speed", "hp", "mana")
+_STAT_DELTAS = struct.Struct("<5h")
+_ROUND_COUNT = struct.Struct("<H")
+
+_P1_TIMED_OUT = 0x40
+_P2_TIMED_OUT = 0x80
+
+
+class ReplayFormatError(ValueError):
+    """Raised when bytes are not a replay this version can read."""
+
+
+@dataclass(frozen=True)
+class FighterSetup:
+    weapon: str
+    spell: str
+    origin: str = "player"
+    stat_deltas: tuple[int, ...] = (0, 0, 0, 0, 0)
+
+    @classmethod
+    def capture(cls, fighter) -> "FighterSetup":
+        """Describe a fighter before round 1, relative to a fresh one with the same gear."""
+        baseline = Battle(fighter.name, fighter.spell, fighter.weapon)
+        return cls(
+            weapon=fighter.weapon.content_key,
+            spell=fighter.spell.content_key,
+            origin=fighter.origin,
+            stat_deltas=tuple(getattr(fighter, stat) - getattr(baseline, stat) for stat in _STATS),
+        )
+
+    def build(self, name: str) -> Battle:
+        if self.spell == NoSpell().content_key:
+            spell = NoSpell()
+        else:
+            spell = CONTENT_REGISTRY.create_spell(self.spell)
+
+        fighter = Battle(name, spell, CONTENT_REGISTRY.create_weapon(self.weapon))
+        fighter.origin = self.origin
+        for stat, delta in zip(_STATS, self.stat_deltas):
+            setattr(fighter, stat, getattr(fighter, stat) + delta)
+        return fighter
+
+
+@dataclass(frozen=True)
+class ReplayRound:
+    p1_move: str
+    p2_move: str
+    p1_timed_out: bool = False
+    p2_timed_out: bool = False
+
+
+@dataclass
+class BattleReplay:
+    seed: int
+    arena: str
+    p1: FighterSetup
+    p2: FighterSetup
+    timeout_penalty: int = 25
+    rounds: list[ReplayRound] = field(default_factory=list)
+
+    @classmethod
+    def start(cls, manager, timeout_penalty: int) -> "BattleReplay":
+        return cls(
+            seed=manager.seed,
+            arena=getattr(manager.arena, "content_key", "null"),
+            p1=FighterSetup.capture(manager.p1),
+            p2=FighterSetup.capture(manager.p2),
+            timeout_penalty=timeout_penalty,
+        )
+
+    def record(self, p1_move: str, p2_move: str, p1_timed_out: bool, p2_timed_out: bool) -> None:
+        self.rounds.append(ReplayRound(p1_move, p2_move, p1_timed_out, p2_timed_out))
+
+    def encode(self) -> bytes:
+        parts = [_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.timeout_penalty)]
+
+        for text in (self.arena, self.p1.weapon, self.p1.spell, self.p1.origin, self.p2.weapon, self.p2.spell, self.p2.origin):
+            raw = text.encode("ascii")
+            parts.append(bytes([len(raw)]) + raw)
+
+        parts.append(_STAT_DELTAS.pack(*self.p1.stat_deltas))
+        parts.append(_STAT_DELTAS.pack(*self.p2.stat_deltas))
+
+        parts.append(_ROUND_COUNT.pack(len(self.rounds)))
+        parts.append(bytes(
+            VALID_STANCES.index(r.p1_move)
+            | VALID_STANCES.index(r.p2_move) << 3
+            | (_P1_TIMED_OUT if r.p1_timed_out else 0)
+            | (_P2_TIMED_OUT if r.p2_timed_out else 0)
+            for r in self.rounds
+        ))
+        return b"".join(parts)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "BattleReplay":
+        """
+        Raises:
+            ReplayFormatError: If the bytes are truncated or not a version 1 replay.
+        """
+        try:
+            magic, version, seed, timeout_penalty = _HEADER.unpack_from(data, 0)
+            if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+                raise ReplayFormatError(f"Unsupported replay header {magic!r} v{version}")
+            offset = _HEADER.size
+
+            texts = []
+            for _ in range(7):
+                length = data[offset]
+                texts.append(data[offset + 1:offset + 1 + length].decode("ascii"))
+                offset += 1 + length
+            arena, p1_weapon, p1_spell, p1_origin, p2_weapon, p2_spell, p2_origin = texts
+
+            p1_deltas = _STAT_DELTAS.unpack_from(data, offset)
+            p2_deltas = _STAT_DELTAS.unpack_from(data, offset + _STAT_DELTAS.size)
+            offset += 2 * _STAT_DELTAS.size
+
+            (count,) = _ROUND_COUNT.unpack_from(data, offset)
+            offset += _ROUND_COUNT.size
+            packed = data[offset:offset + count]
+            if len(packed) != count:
+                raise ReplayFormatError("Replay is truncated")
+        except (struct.error, IndexError, UnicodeDecodeError) as exc:
+            raise ReplayFormatError("Replay is truncated or corrupt") from exc
+
+        return cls(
+            seed=seed,
+            arena=arena,
+            p1=FighterSetup(p1_weapon, p1_spell, p1_origin, p1_deltas),
+            p2=FighterSetup(p2_weapon, p2_spell, p2_origin, p2_deltas),
+            timeout_penalty=timeout_penalty,
+            rounds=[
+                ReplayRound(
+                    VALID_STANCES[byte & 0x07],
+                    VALID_STANCES[(byte >> 3) & 0x07],
+                    bool(byte & _P1_TIMED_OUT),
+                    bool(byte & _P2_TIMED_OUT),
+                )
+                for byte in packed
+            ],
+        )
+
+
+def replay_battle(replay: BattleReplay, p1_name: str = "P1", p2_name: str = "P2"):
+    """
+    Re-simulate a recorded battle offline.
+
+    Returns:
+        BattleSession: the session after the last recorded round, with the
+        final fighter state and the outcome of every round.
+    """
+    from services.battle.session_runner import BattleSession
+
+    manager = BattleManager(replay.p1.build(p1_name), replay.p2.build(p2_name), seed=replay.seed)
+    manager.arena = CONTENT_REGISTRY.create_arena(replay.arena)
+    session = BattleSession(manager, timeout_penalty=replay.timeout_penalty)
+
+    for round_number, recorded in enumerate(replay.rounds, start=1):
+        session.process_round(
+            round_number=round_number,
+            p1_move=recorded.p1_move,
+            p2_move=recorded.p2_move,
+            p1_timed_out=recorded.p1_timed_out,
+            p2_timed_out=recorded.p2_timed_out,
+            p1_name=p1_name,
+            p2_name=p2_name,
+        )
+    return session
+
+
+def save_replay(kind: str, p1_user_id: int, p2_user_id: int | None, replay: BattleReplay, session) -> None:
+    """Store a finished battle's replay in the caller's transaction."""
+    from models.users_model import BattleReplayLog
+
+    session.add(BattleReplayLog(
+        kind=kind,
+        p1_user_id=p1_user_id,
+        p2_user_id=p2_user_id,
+        data=replay.encode(),
+    ))
+
+
+def load_replay(replay_id: int) -> BattleReplay | None:
+    from database.sessionmaker import Session
+    from models.users_model import BattleReplayLog
+
+    with Session() as session:
+        row = session.get(BattleReplayLog, replay_id)
+        return BattleReplay.decode(row.data) if row else None
@@ -1,10 +1,13 @@
 from services.battle.engine_types import BattleResultState, SessionRoundOutcome
+from services.battle.replay import BattleReplay
 
 
 class BattleSession:
     def __init__(self, manager, timeout_penalty: int = 25):
         self.manager = manager
         self.timeout_penalty = timeout_penalty
+        # Fighters, arena and seed are captured here, so set them up before creating the session
+        self.replay = BattleReplay.start(manager, timeout_penalty)
 
     @property
     def p1(self):
@@ -48,6 +51,7 @@ class BattleSession:
         p1_name: str,
         p2_name: str,
     ) -> SessionRoundOutcome:
+        self.replay.record(p1_move, p2_move, p1_timed_out, p2_timed_out)
         resolution = self.run_round(p1_move, p2_move)
         self.apply_timeout_penalties(p1_timed_out, p2_timed_out, p1_name, p2_name)
         penalty_notes = self.apply_round_effects()
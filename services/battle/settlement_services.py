@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import contextmanager
 from dataclasses import dataclass
 
 
@@ -10,6 +12,15 @@ class SettlementResult:
     followup_message: str | None = None
 
 
+@contextmanager
+def _unit_of_work():
+    """One transaction for every write a settlement makes, committed once."""
+    from database.sessionmaker import Session
+
+    with Session.begin() as session:
+        yield session
+
+
 def _add_gold(*args, **kwargs):
     from services.economy_services import add_gold
 
@@ -58,54 +69,77 @@ def _create_game_event(*args, **kwargs):
     return create_game_event(*args, **kwargs)
 
 
+def _save_replay(*args, **kwargs):
+    from services.battle.replay import save_replay
+
+    return save_replay(*args, **kwargs)
+
+
+def _complete_tutorial(user_id: int, session=None):
+    from services.tutorial_services import TutorialState, set_tutorial_state
+
+    return set_tutorial_state(user_id, TutorialState.COMPLETED, session=session)
+
+
 class SettlementService:
     @staticmethod
-    def resolve_pvp(*, challenger_id: int, challenger_name: str, target_id: int, target_name: str, bet: int, p1, p2) -> SettlementResult:
+    def resolve_pvp(*, challenger_id: int, challenger_name: str, target_id: int, target_name: str, bet: int, p1, p2, replay=None) -> SettlementResult:
         if p1.hp <= 0 and p2.hp <= 0:
+            if replay is not None:
+                with _unit_of_work() as session:
+                    _save_replay("pvp", challenger_id, target_id, replay, session=session)
             return SettlementResult(winner_name=None, loser_name=None, both_dead=True)
 
         if p1.hp <= 0:
-            _add_gold(target_id, int((bet * 2) * 0.9))
-            _inc_battles_won(target_id)
-            _update_quest_progress(target_id, "BATTLE_WIN", 1)
-            _update_quest_progress(target_id, "BATTLE_WIN_STREAK", 1)
-            _decrease_quest_progress(challenger_id, "BATTLE_WIN_STREAK")
-            return SettlementResult(winner_name=target_name, loser_name=challenger_name)
-
-        _add_gold(challenger_id, int((bet * 2) * 0.9))
-        _inc_battles_won(challenger_id)
-        _update_quest_progress(challenger_id, "BATTLE_WIN", 1)
-        _update_quest_progress(challenger_id, "BATTLE_WIN_STREAK", 1)
-        _decrease_quest_progress(target_id, "BATTLE_WIN_STREAK")
-        return SettlementResult(winner_name=challenger_name, loser_name=target_name)
+            winner_id, winner_name, loser_id, loser_name = target_id, target_name, challenger_id, challenger_name
+        else:
+            winner_id, winner_name, loser_id, loser_name = challenger_id, challenger_name, target_id, target_name
+
+        with _unit_of_work() as session:
+            _add_gold(winner_id, int((bet * 2) * 0.9), session=session)
+            _inc_battles_won(winner_id, session=session)
+            _update_quest_progress(winner_id, "BATTLE_WIN", 1, session=session)
+            _update_quest_progress(winner_id, "BATTLE_WIN_STREAK", 1, session=session)
+            _decrease_quest_progress(loser_id, "BATTLE_WIN_STREAK", session=session)
+            if replay is not None:
+                _save_replay("pvp", challenger_id, target_id, replay, session=session)
+
+        return SettlementResult(winner_name=winner_name, loser_name=loser_name)
 
     @staticmethod
-    def resolve_campaign(*, player_id: int, player_name: str, enemy_name: str, stage: int, p1, p2) -> SettlementResult:
+    def resolve_campaign(*, player_id: int, player_name: str, enemy_name: str, stage: int, p1, p2, replay=None) -> SettlementResult:
         if p1.hp <= 0:
+            if replay is not None:
+                with _unit_of_work() as session:
+                    _save_replay("campaign", player_id, None, replay, session=session)
             return SettlementResult(winner_name=enemy_name, loser_name=player_name)
 
-        reward_string = _stage_reward_details(player_id)
-        _give_stage_rewards(player_id)
-        _advance_campaign_stage(player_id)
-        _update_quest_progress(player_id, "CAMPAIGN_WIN", 1)
-
         next_stage = min(stage + 1, 16)
         if next_stage >= 16:
             summary = f"Defeated {enemy_name} and finished the campaign."
         else:
             summary = f"Defeated {enemy_name} in campaign stage {stage} and advanced to stage {next_stage}."
 
-        _create_game_event(
-            player_id,
-            "campaign_progress",
-            summary,
-            {
-                "enemy_name": enemy_name,
-                "cleared_stage": stage,
-                "next_stage": next_stage,
-                "reward_summary": reward_string,
-            },
-        )
+        with _unit_of_work() as session:
+            reward_string = _stage_reward_details(player_id, session=session)
+            _give_stage_rewards(player_id, session=session)
+            _advance_campaign_stage(player_id, session=session)
+            _update_quest_progress(player_id, "CAMPAIGN_WIN", 1, session=session)
+            if replay is not None:
+                _save_replay("campaign", player_id, None, replay, session=session)
+
+            _create_game_event(
+                player_id,
+                "campaign_progress",
+                summary,
+                {
+                    "enemy_name": enemy_name,
+                    "cleared_stage": stage,
+                    "next_stage": next_stage,
+                    "reward_summary": reward_string,
+                },
+                session=session,
+            )
 
         return SettlementResult(
             winner_name=player_name,
@@ -113,3 +147,23 @@ class SettlementService:
             reward_summary=reward_string,
             followup_message=f"🏆 {player_name} advanced to the next campaign stage!\n{reward_string}",
         )
+
+    @staticmethod
+    def resolve_tutorial(*, player_id: int, player_name: str) -> SettlementResult:
+        with _unit_of_work() as session:
+            _complete_tutorial(player_id, session=session)
+
+        return SettlementResult(winner_name=player_name, loser_name="Veyra")
+
+    @staticmethod
+    async def resolve_pvp_async(**kwargs) -> SettlementResult:
+        # Settlement is a blocking transaction, so run it off the event loop.
+        return await asyncio.to_thread(SettlementService.resolve_pvp, **kwargs)
+
+    @staticmethod
+    async def resolve_campaign_async(**kwargs) -> SettlementResult:
+        return await asyncio.to_thread(SettlementService.resolve_campaign, **kwargs)
+
+    @staticmethod
+    async def resolve_tutorial_async(**kwargs) -> SettlementResult:
+        return await asyncio.to_thread(SettlementService.resolve_tutorial, **kwargs)
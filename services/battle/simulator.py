@@ -0,0 +1,256 @@
+"""Headless battle simulator for balance testing.
+
+Runs AI-vs-AI (or policy-vs-AI) fights straight through ``BattleSession``
+without Discord, timeouts or the database, fanned out over a
+``ProcessPoolExecutor``. Every task derives its fight seeds from the base seed
+and its task index, so a run is reproducible regardless of how tasks land on
+workers.
+
+    python -m services.battle.simulator --fights 200 --workers 8 --seed 42 --out winrates.csv
+
+The result is a win-rate matrix per arena over every weapon x spell loadout in
+``CONTENT_REGISTRY``: cell (a, b) is how often loadout a (player 1, the side
+the arena acts on) beats loadout b.
+"""
+
+import argparse
+import csv
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+
+from services.battle.battle_class import Battle
+from services.battle.battlemanager_class import BattleManager
+from services.battle.constants import VALID_STANCES
+from services.battle.content_registry import CONTENT_REGISTRY
+from services.battle.session_runner import BattleSession
+from services.battle.veyra_ai import VeyraAI
+
+MAX_ROUNDS = 100
+
+
+class RandomPolicy:
+    """Picks any stance uniformly; a baseline the AIs should beat."""
+
+    def __init__(self, fighter, opponent, rng):
+        self.fighter = fighter
+        self.rng = rng
+
+    def choose_move(self):
+        return self.rng.choice(VALID_STANCES)
+
+
+POLICIES = {
+    "veyra": lambda fighter, opponent, rng: VeyraAI(veyra=fighter, player=opponent, rng=rng),
+    "random": RandomPolicy,
+}
+
+
+@dataclass(frozen=True)
+class Loadout:
+    weapon: str
+    spell: str
+
+    @property
+    def key(self) -> str:
+        return f"{self.weapon}+{self.spell}"
+
+
+@dataclass
+class MatchupStats:
+    wins: int = 0
+    losses: int = 0
+    ties: int = 0
+
+    @property
+    def fights(self) -> int:
+        return self.wins + self.losses + self.ties
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.fights if self.fights else 0.0
+
+
+@dataclass
+class SimulationResult:
+    # arena -> (loadout a key, loadout b key) -> stats of a against b
+    matrices: dict[str, dict[tuple[str, str], MatchupStats]] = field(default_factory=dict)
+
+    def loadout_win_rates(self, arena: str) -> dict[str, float]:
+        """Overall win rate of each loadout as player 1 in one arena."""
+        totals: dict[str, MatchupStats] = {}
+        for (a_key, _), stats in self.matrices.get(arena, {}).items():
+            total = totals.setdefault(a_key, MatchupStats())
+            total.wins += stats.wins
+            total.losses += stats.losses
+            total.ties += stats.ties
+        return {key: stats.win_rate for key, stats in totals.items()}
+
+
+def all_loadouts() -> list[Loadout]:
+    return [
+        Loadout(weapon, spell)
+        for weapon, spell in product(CONTENT_REGISTRY.list_weapons(), CONTENT_REGISTRY.list_spells())
+    ]
+
+
+def all_arenas() -> list[str]:
+    return CONTENT_REGISTRY.list_arenas()
+
+
+def _build_fighter(name: str, loadout: Loadout) -> Battle:
+    return Battle(
+        name,
+        CONTENT_REGISTRY.create_spell(loadout.spell),
+        CONTENT_REGISTRY.create_weapon(loadout.weapon),
+    )
+
+
+def simulate_fight(
+    a: Loadout,
+    b: Loadout,
+    arena: str,
+    p1_policy: str = "veyra",
+    p2_policy: str = "veyra",
+    seed: int | None = None,
+) -> int:
+    """
+    Fight one battle to the end. The same seed replays the same fight.
+
+    Returns:
+        int: 1 if player 1 wins, -1 if player 2 wins, 0 for a tie (both dead or MAX_ROUNDS).
+    """
+    p1 = _build_fighter("A", a)
+    p2 = _build_fighter("B", b)
+    manager = BattleManager(p1, p2, seed=seed)
+    manager.arena = CONTENT_REGISTRY.create_arena(arena)
+    session = BattleSession(manager)
+
+    # Both policies draw from the AI stream, the engine from the battle stream
+    ai_rng = manager.ai_rng()
+    p1_ai = POLICIES[p1_policy](p1, p2, ai_rng)
+    p2_ai = POLICIES[p2_policy](p2, p1, ai_rng)
+
+    for round_number in range(1, MAX_ROUNDS + 1):
+        session.process_round(
+            round_number=round_number,
+            p1_move=p1_ai.choose_move(),
+            p2_move=p2_ai.choose_move(),
+            p1_timed_out=False,
+            p2_timed_out=False,
+            p1_name=p1.name,
+            p2_name=p2.name,
+        )
+        state = session.get_result_state()
+        if state.finished:
+            if state.both_dead:
+                return 0
+            return 1 if state.winner is p1 else -1
+    return 0
+
+
+def _simulate_row(task):
+    """Worker: one arena and one player-1 loadout against every opponent."""
+    seed, arena, a, opponents, fights, p1_policy, p2_policy = task
+    seeds = random.Random(seed)
+
+    row = {}
+    for b in opponents:
+        stats = MatchupStats()
+        for _ in range(fights):
+            outcome = simulate_fight(a, b, arena, p1_policy, p2_policy, seed=seeds.getrandbits(63))
+            if outcome > 0:
+                stats.wins += 1
+            elif outcome < 0:
+                stats.losses += 1
+            else:
+                stats.ties += 1
+        row[(a.key, b.key)] = stats
+    return arena, row
+
+
+def run_simulation(
+    fights: int = 100,
+    seed: int = 0,
+    workers: int | None = None,
+    arenas: list[str] | None = None,
+    loadouts: list[Loadout] | None = None,
+    p1_policy: str = "veyra",
+    p2_policy: str = "veyra",
+) -> SimulationResult:
+    """
+    Fight every loadout against every loadout `fights` times in each arena.
+
+    Args:
+        fights (int): Fights per (arena, loadout a, loadout b) cell.
+        seed (int): Base seed; the same seed reproduces the same matrices.
+        workers (int | None): Worker processes; 1 runs in this process.
+        arenas (list[str] | None): Arena keys, all registered arenas by default.
+        loadouts (list[Loadout] | None): Loadouts, every weapon x spell by default.
+        p1_policy (str): Policy for player 1 (one of POLICIES).
+        p2_policy (str): Policy for player 2.
+    """
+    arenas = arenas or all_arenas()
+    loadouts = loadouts or all_loadouts()
+    tasks = [
+        (seed * 1_000_003 + index, arena, a, loadouts, fights, p1_policy, p2_policy)
+        for index, (arena, a) in enumerate(product(arenas, loadouts))
+    ]
+
+    result = SimulationResult({arena: {} for arena in arenas})
+    if workers == 1:
+        for arena, row in map(_simulate_row, tasks):
+            result.matrices[arena].update(row)
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for arena, row in pool.map(_simulate_row, tasks, chunksize=4):
+            result.matrices[arena].update(row)
+    return result
+
+
+def write_csv(result: SimulationResult, out) -> None:
+    writer = csv.writer(out)
+    writer.writerow(["arena", "loadout_a", "loadout_b", "fights", "wins", "losses", "ties", "win_rate"])
+    for arena, matrix in result.matrices.items():
+        for (a_key, b_key), stats in sorted(matrix.items()):
+            writer.writerow([arena, a_key, b_key, stats.fights, stats.wins, stats.losses, stats.ties, f"{stats.win_rate:.4f}"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Monte Carlo battle simulator")
+    parser.add_argument("--fights", type=int, default=100, help="fights per matchup cell")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--arena", action="append", choices=all_arenas(), help="limit to arena (repeatable)")
+    parser.add_argument("--p1-policy", choices=list(POLICIES), default="veyra")
+    parser.add_argument("--p2-policy", choices=list(POLICIES), default="veyra")
+    parser.add_argument("--out", help="write the full matrix as CSV to this path")
+    args = parser.parse_args(argv)
+
+    result = run_simulation(
+        fights=args.fights,
+        seed=args.seed,
+        workers=args.workers,
+        arenas=args.arena,
+        p1_policy=args.p1_policy,
+        p2_policy=args.p2_policy,
+    )
+
+    if args.out:
+        with open(args.out, "w", newline="") as out:
+            write_csv(result, out)
+
+    for arena in result.matrices:
+        rates = sorted(result.loadout_win_rates(arena).items(), key=lambda item: item[1], reverse=True)
+        print(f"== {arena} ==")
+        for key, rate in rates[:5]:
+            print(f"  best   {key:<40} {rate:.1%}")
+        for key, rate in rates[-5:]:
+            print(f"  worst  {key:<40} {rate:.1%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -173,6 +173,7 @@ def _resolve_tutorial_step(session: BattleSession, step: TutorialStep):
 
 
 async def start_tutorial_battle(ctx, player, round_pause: float = 1.0):
+    from services.battle.settlement_services import SettlementService
     from services.tutorial_services import TutorialState, advance
     from utils.embeds.battleembed import build_result_embed, build_round_embed
 
@@ -267,7 +268,7 @@ async def start_tutorial_battle(ctx, player, round_pause: float = 1.0):
 
         if _is_current_tutorial(player.id, token):
             session.p2.hp = 0
-            await advance(player.id, TutorialState.COMPLETED)
+            await SettlementService.resolve_tutorial_async(player_id=player.id, player_name=player.name)
             await ctx.channel.send(TUTORIAL_FINAL_MESSAGE, embed=build_tutorial_final_embed())
     finally:
         if _is_current_tutorial(player.id, token):
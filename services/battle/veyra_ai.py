@@ -12,8 +12,8 @@ spell_effects_on_veyra = ["veilofdarkness"]
 
 
 class VeyraAI(BaseAI):
-    def __init__(self, difficulty="normal", veyra=None, player=None):
-        super().__init__(fighter=veyra, opponent=player)
+    def __init__(self, difficulty="normal", veyra=None, player=None, rng=None):
+        super().__init__(fighter=veyra, opponent=player, rng=rng)
         self.difficulty = difficulty
         self.veyra = veyra
         self.player = player
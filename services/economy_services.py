@@ -3,6 +3,7 @@ from sqlalchemy import update
 
 from database.sessionmaker import Session
 from models.users_model import Wallet
+from services.talk_to_veyra.chat_user_cache import invalidate_chat_user
 
 from domain.shared.types import Gold
 from domain.shared.errors import InvalidAmountError, InsufficientFundsError
@@ -34,6 +35,27 @@ def _track_gold_quest(user_id: int, gold_amount: int, quest_type: str, session=N
 # Wallet mutation services
 # ---------------------------------------------------------------------------
 
+def lock_wallets(session, user_ids) -> dict[int, Wallet]:
+    """
+    Lock the wallets of several users with SELECT ... FOR UPDATE.
+
+    Rows are always locked in ascending user_id order, so two transactions
+    touching the same pair of wallets (A pays B while B pays A) can never
+    deadlock.
+
+    Returns:
+        dict[int, Wallet]: user_id -> locked wallet (missing users are absent)
+    """
+    wallets = (
+        session.query(Wallet)
+        .filter(Wallet.user_id.in_(sorted(set(user_ids))))
+        .order_by(Wallet.user_id)
+        .with_for_update()
+        .all()
+    )
+    return {wallet.user_id: wallet for wallet in wallets}
+
+
 def add_gold(user_id: int, gold_amount: int, session=None):
     """Add gold to a user's wallet.
 
@@ -72,6 +94,7 @@ def add_gold(user_id: int, gold_amount: int, session=None):
             )
             raise UserNotFoundError(user_id)
         new_balance = result[0]
+        invalidate_chat_user(user_id, session)
         _track_gold_quest(user_id, gold_amount, "GOLD_EARN", session=session)
         if owns_session:
             session.commit()
@@ -124,6 +147,7 @@ def remove_gold(user_id: int, gold_amount: int, session=None):
                 raise UserNotFoundError(user_id)
             raise NotEnoughGoldError(gold_amount, "gold")
         new_balance = result[0]
+        invalidate_chat_user(user_id, session)
         _track_gold_quest(user_id, gold_amount, "GOLD_SPEND", session=session)
         if owns_session:
             session.commit()
@@ -139,6 +163,44 @@ def remove_gold(user_id: int, gold_amount: int, session=None):
             session.close()
 
 
+# ---------------------------------------------------------------------------
+# Async wallet services
+# ---------------------------------------------------------------------------
+
+async def add_gold_async(user_id: int, gold_amount: int):
+    """Async variant of add_gold; the write runs in a worker thread.
+
+    Args:
+        user_id (int): Target user ID
+        gold_amount (int): Amount of gold to add
+
+    Returns:
+        tuple[Gold, Gold]: (new_balance, added_amount)
+    """
+    from database.sessionmaker import run_in_async_session
+
+    return await run_in_async_session(
+        lambda session: add_gold(user_id, gold_amount, session)
+    )
+
+
+async def remove_gold_async(user_id: int, gold_amount: int):
+    """Async variant of remove_gold; the write runs in a worker thread.
+
+    Args:
+        user_id (int): Target user ID
+        gold_amount (int): Amount of gold to remove
+
+    Returns:
+        tuple[Gold, Gold]: (new_balance, removed_amount)
+    """
+    from database.sessionmaker import run_in_async_session
+
+    return await run_in_async_session(
+        lambda session: remove_gold(user_id, gold_amount, session)
+    )
+
+
 # ---------------------------------------------------------------------------
 # Gold transfer service
 # ---------------------------------------------------------------------------
@@ -163,18 +225,9 @@ def transfer_gold(sender_id: int, receiver_id: int, amount: int):
         raise NegativeGoldError from exc
 
     with Session() as session:
-        sender = (
-            session.query(Wallet)
-            .filter(Wallet.user_id == sender_id)
-            .with_for_update()
-            .one_or_none()
-        )
-        receiver = (
-            session.query(Wallet)
-            .filter(Wallet.user_id == receiver_id)
-            .with_for_update()
-            .one_or_none()
-        )
+        wallets = lock_wallets(session, (sender_id, receiver_id))
+        sender = wallets.get(sender_id)
+        receiver = wallets.get(receiver_id)
 
         if not sender:
             raise UserNotFoundError(sender_id)
@@ -199,6 +252,8 @@ def transfer_gold(sender_id: int, receiver_id: int, amount: int):
             .values(gold=Wallet.gold + net_amount)
         )
         session.execute(receiver_stmt)
+        invalidate_chat_user(sender_id, session)
+        invalidate_chat_user(receiver_id, session)
 
         try:
             session.commit()
@@ -246,6 +301,27 @@ def check_wallet(user_id: int) -> Gold:
         return user.gold
 
 
+async def check_wallet_async(user_id: int) -> Gold:
+    """
+    Async variant of check_wallet; the read runs in a worker thread.
+
+    Args:
+        user_id (int): User ID
+
+    Returns:
+        Gold: Current balance
+    """
+    from database.sessionmaker import run_in_async_session
+
+    def read_gold(session):
+        wallet = session.get(Wallet, user_id)
+        if not wallet:
+            raise UserNotFoundError(user_id)
+        return wallet.gold
+
+    return await run_in_async_session(read_gold)
+
+
 def check_wallet_full(user_id: int, session = None):
     if session is not None:
         user = session.get(Wallet, user_id)
@@ -270,6 +346,7 @@ def add_chip(user_id: int, amount: int, session = None):
         result = session.execute(stmt)
         if result.rowcount == 0:
             raise UserNotFoundError(user_id)
+        invalidate_chat_user(user_id, session)
         if owns_session:
             session.commit()
     except Exception:
@@ -316,6 +393,7 @@ def remove_chips(user_id: int, amount: int, session=None):
             raise NotEnoughGoldError(amount, "chip")
 
         new_balance = result[0]
+        invalidate_chat_user(user_id, session)
 
         if owns_session:
             session.commit()
@@ -0,0 +1,67 @@
+"""Lazy energy regeneration.
+
+Energy is stored as ``energy`` plus ``energy_updated_at`` on the user row and
+regenerated on read, so there is no periodic job touching every user.
+``energy_full_at`` is kept in sync on every write and registered as an
+ENERGY_FULL scheduled event whenever it moves.
+"""
+
+from datetime import datetime
+
+from models.users_model import UserEffects
+
+from services.scheduled_events_services import ENERGY_FULL_EVENT, cancel_event, schedule_event
+
+from domain.progression.rules import energy_full_at, regenerate_energy
+
+
+def _energy_effect(session, user_id: int):
+    """Return (effect_name, expire_at) of the user's effect row, if any."""
+    effect = (
+        session.query(UserEffects)
+        .filter(UserEffects.user_id == user_id)
+        .first()
+    )
+    if not effect:
+        return None, None
+    return effect.effect_name, effect.expire_at
+
+
+def current_energy(session, user, now=None) -> int:
+    """Compute the user's current energy without writing anything."""
+    now = now or datetime.utcnow()
+    effect_name, expire_at = _energy_effect(session, user.user_id)
+    energy, _ = regenerate_energy(
+        user.energy or 0, user.level, user.energy_updated_at, now, effect_name, expire_at
+    )
+    return energy
+
+
+def settle_energy(session, user, energy_delta: int = 0, now=None) -> int:
+    """
+    Materialize regenerated energy onto the user row and apply a delta.
+
+    The caller owns the commit. Positive deltas may exceed the level cap.
+
+    Returns:
+        The user's energy after regen and the delta.
+    """
+    now = now or datetime.utcnow()
+    effect_name, expire_at = _energy_effect(session, user.user_id)
+
+    energy, updated_at = regenerate_energy(
+        user.energy or 0, user.level, user.energy_updated_at, now, effect_name, expire_at
+    )
+    energy += energy_delta
+    full_at = energy_full_at(energy, user.level, updated_at, effect_name, expire_at)
+
+    if full_at != user.energy_full_at:
+        if full_at is None:
+            cancel_event(session, ENERGY_FULL_EVENT, user.user_id)
+        else:
+            schedule_event(session, ENERGY_FULL_EVENT, user.user_id, full_at)
+
+    user.energy = energy
+    user.energy_updated_at = updated_at
+    user.energy_full_at = full_at
+    return energy
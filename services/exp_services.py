@@ -1,21 +1,28 @@
+import asyncio
 import logging
 
+from sqlalchemy import BigInteger, Integer, column, update, values
+
 from database.sessionmaker import Session
 
 from models.users_model import User
 
 from services.jobs_services import JobsClass
+from services.energy_services import settle_energy
 from services.refferal_services import get_inviter, mark_inv_successful
 
 from domain.progression.rules import calculate_level
 
 logger = logging.getLogger(__name__)
 
-def handle_level_up(user, new_level: int):
+def handle_level_up(user, new_level: int, session=None):
     "Handles all non-Discord side effects of leveling up"
+    if session is not None:
+        # Bank regen against the old cap before the cap grows
+        settle_energy(session, user)
     user.level = new_level
     user = JobsClass(user.user_id)
-    user.gain_energy(15)
+    user.gain_energy(15, session)
     if new_level == 5:
         inviter_id = get_inviter(user.user_id)
         mark_inv_successful(inviter_id, user.user_id)
@@ -37,37 +44,144 @@ def give_exp(session, user_id: int, exp_amount: int):
     new_level = calculate_level(user.exp)
 
     if new_level > current_level:
-        handle_level_up(user, new_level)
+        handle_level_up(user, new_level, session)
 
     return new_level if new_level > current_level else None
 
 async def add_exp(user_id: int, exp_amount: int):
-    "Adds exp and handles level up logic"
+    "Adds exp and handles level up logic in a worker thread"
+    from database.sessionmaker import run_in_async_session
+
+    try:
+        return await run_in_async_session(
+            lambda session: give_exp(session, user_id, exp_amount)
+        )
+    except Exception as e:
+        logger.error("Error updating exp for user %s: %s", user_id, str(e))
+
+
+def current_exp(user_id: int):
+    "Returns current user level and experience point"
     with Session() as session:
         user = session.get(User, user_id)
-        if not user:
-            logger.warning("User ID %s not found", user_id)
+        return user.exp, user.level
+
+
+# Failed flushes a user's EXP survives before it is dropped
+MAX_FLUSH_ATTEMPTS = 3
+
+
+class ExpAccumulator:
+    """
+    Write-behind buffer for high-volume EXP grants (chat and command EXP).
+
+    Grants are summed per user in memory and flushed periodically as a single
+    bulk UPDATE, so a busy channel costs one transaction per flush instead of
+    one per message. Level ups are detected on the flushed totals and applied
+    afterwards, one user at a time in a worker thread, so one failing level up
+    cannot hold back everyone else's EXP. A level up that fails leaves the
+    stored level behind the EXP and is picked up again on that user's next flush.
+    """
+
+    def __init__(self):
+        self._pending: dict[int, int] = {}
+        self._attempts: dict[int, int] = {}
+
+    def add(self, user_id: int, exp_amount: int):
+        "Queue an EXP grant for the next flush"
+        if exp_amount <= 0:
             return
+        self._pending[user_id] = self._pending.get(user_id, 0) + exp_amount
 
-        user.exp += exp_amount
-        logger.info("%s got %s exp points.", user.user_name, exp_amount)
-        current_level = user.level
-        new_level = calculate_level(user.exp)
+    def pending(self) -> int:
+        "Number of users with unflushed EXP"
+        return len(self._pending)
 
-        try:
-            if new_level > current_level:
-                handle_level_up(user, new_level)
+    async def flush(self) -> dict[int, int]:
+        """
+        Apply all buffered EXP in one transaction, then run level ups.
 
-            session.commit()
-            return new_level if new_level > current_level else None
+        Returns:
+            dict of {user_id: new_level} for users who leveled up.
+        """
+        if not self._pending:
+            return {}
+
+        from database.sessionmaker import run_in_async_session
 
+        batch, self._pending = self._pending, {}
+        try:
+            due_level_ups = await run_in_async_session(
+                lambda session: self._apply(session, batch)
+            )
         except Exception as e:
-            session.rollback()
-            logger.error("Error updating exp for user %s: %s", user_id, str(e))
+            self._requeue(batch)
+            logger.error("Error flushing exp for %s users: %s", len(batch), str(e))
+            return {}
+
+        for user_id in batch:
+            self._attempts.pop(user_id, None)
+
+        leveled_up = {}
+        for user_id, new_level in due_level_ups.items():
+            try:
+                if await asyncio.to_thread(self._level_up, user_id, new_level):
+                    leveled_up[user_id] = new_level
+            except Exception:
+                logger.exception("Level up to %s failed for user %s", new_level, user_id)
+
+        logger.info("Flushed exp for %s users (%s level ups)", len(batch), len(leveled_up))
+        return leveled_up
+
+    def _requeue(self, batch: dict[int, int]) -> None:
+        "Put a failed batch back, dropping users whose EXP already failed MAX_FLUSH_ATTEMPTS times"
+        dropped = 0
+        for user_id, amount in batch.items():
+            attempts = self._attempts.get(user_id, 0) + 1
+            if attempts >= MAX_FLUSH_ATTEMPTS:
+                self._attempts.pop(user_id, None)
+                dropped += 1
+                continue
+            self._attempts[user_id] = attempts
+            self.add(user_id, amount)
+
+        if dropped:
+            logger.error("Dropped buffered exp for %s users after %s failed flushes", dropped, MAX_FLUSH_ATTEMPTS)
+
+    @staticmethod
+    def _apply(session, batch: dict[int, int]) -> dict[int, int]:
+        "Bulk-add the deltas; returns {user_id: new_level} for users now past their level"
+        deltas = values(
+            column("user_id", BigInteger),
+            column("delta", Integer),
+            name="exp_deltas",
+        ).data(list(batch.items()))
+
+        rows = session.execute(
+            update(User)
+            .where(User.user_id == deltas.c.user_id)
+            .values(exp=User.exp + deltas.c.delta)
+            .returning(User.user_id, User.exp, User.level)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        due = {}
+        for user_id, exp, level in rows:
+            new_level = calculate_level(exp)
+            if new_level > level:
+                due[user_id] = new_level
+        return due
+
+    @staticmethod
+    def _level_up(user_id: int, new_level: int) -> bool:
+        with Session() as session:
+            user = session.get(User, user_id)
+            # Already applied, e.g. by a direct add_exp in the meantime
+            if user is None or user.level >= new_level:
+                return False
+            handle_level_up(user, new_level, session)
+            session.commit()
+        return True
 
 
-def current_exp(user_id: int):
-    "Returns current user level and experience point"
-    with Session() as session:
-        user = session.get(User, user_id)
-        return user.exp, user.level
+exp_accumulator = ExpAccumulator()
@@ -5,6 +5,7 @@ from typing import Any
 
 from database.sessionmaker import Session
 from models.users_model import GameEvent
+from services.talk_to_veyra.chat_user_cache import invalidate_chat_user
 
 logger = logging.getLogger(__name__)
 
@@ -16,50 +17,72 @@ def create_game_event(
     event_data: dict[str, Any] | None = None,
     *,
     keep_recent: int | None = None,
+    session=None,
 ) -> int:
-    """Persist a user-facing gameplay memory event."""
+    """Persist a user-facing gameplay memory event.
+
+    With a caller-owned session the event is written in a savepoint, so a
+    failure here never rolls back the caller's transaction.
+    """
     payload = event_data or {}
     keep_recent = max(keep_recent, 1) if keep_recent is not None else None
 
-    with Session() as session:
+    if session is not None:
         try:
-            event = GameEvent(
-                user_id=user_id,
-                event_type=event_type,
-                summary=summary,
-                event_data=payload,
-            )
-            session.add(event)
-            session.flush()
-
-            if keep_recent is not None:
-                _trim_event_type(session, user_id, event_type, keep_recent)
+            with session.begin_nested():
+                return _add_game_event(session, user_id, event_type, summary, payload, keep_recent)
+        except Exception:
+            logger.exception("Failed to persist game event for user %s", user_id)
+            return 0
 
+    with Session() as session:
+        try:
+            event_id = _add_game_event(session, user_id, event_type, summary, payload, keep_recent)
             session.commit()
-            return event.id
+            return event_id
         except Exception:
             session.rollback()
             logger.exception("Failed to persist game event for user %s", user_id)
             return 0
 
 
-def get_recent_game_events(user_id: int, limit: int = 10) -> list[dict[str, Any]]:
+def _add_game_event(session, user_id, event_type, summary, payload, keep_recent) -> int:
+    event = GameEvent(
+        user_id=user_id,
+        event_type=event_type,
+        summary=summary,
+        event_data=payload,
+    )
+    session.add(event)
+    session.flush()
+    invalidate_chat_user(user_id, session)
+
+    if keep_recent is not None:
+        _trim_event_type(session, user_id, event_type, keep_recent)
+
+    return event.id
+
+
+def get_recent_game_events(user_id: int, limit: int = 10, session=None) -> list[dict[str, Any]]:
     """Return the user's most recent gameplay events in chronological order."""
     if limit <= 0:
         return []
 
-    with Session() as session:
-        try:
-            events = (
-                session.query(GameEvent)
-                .filter(GameEvent.user_id == user_id)
-                .order_by(GameEvent.created_at.desc(), GameEvent.id.desc())
-                .limit(limit)
-                .all()
-            )
-        except Exception:
-            logger.exception("Failed to fetch recent game events for user %s", user_id)
-            return []
+    if session is None:
+        with Session() as session:
+            return get_recent_game_events(user_id, limit, session=session)
+
+    try:
+        events = (
+            session.query(GameEvent)
+            .filter(GameEvent.user_id == user_id)
+            .order_by(GameEvent.created_at.desc(), GameEvent.id.desc())
+            .limit(limit)
+            .all()
+        )
+    except Exception:
+        logger.exception("Failed to fetch recent game events for user %s", user_id)
+        return []
 
     serialized = [
         {
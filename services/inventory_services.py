@@ -1,20 +1,23 @@
 """This module handles inventory-related services like adding items and assigning them to users."""
 import logging
-import math
 
 import discord
 
-from sqlalchemy import func
+from collections import defaultdict
+
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.dialects.postgresql import insert
 from typing import Tuple, Optional, List
 from database.sessionmaker import Session
 
 from models.inventory_model import Inventory, Items
 from models.users_model import User, Upgrades
 
-from domain.inventory.rules import available_inventory_slots_for_user, allowed_stack_size
+from domain.inventory.rules import available_inventory_slots_for_user, allowed_stack_size, slots_for_quantity
 from domain.battle.gear_shards import is_account_bound_shard_item
 
 from services.users_services import is_user
+from services.item_catalog_services import get_item_catalog
 
 from utils.custom_errors import UserNotFoundError, NotEnoughItemError, InvalidItemAmountError, FullInventoryError, PartialInventoryError
 from utils.embeds.inventoryembed import build_inventory, build_item_info_embed
@@ -49,6 +52,7 @@ def give_item(target_id: int, item_id: int, amount: int, overflow: bool = False,
                 raise PartialInventoryError(requested=amount, allowed=allowed)
 
         entry = session.get(Inventory, (target_id, item_id))
+        old_qty = entry.item_quantity if entry else 0
 
         if entry:  # If user already have the item
             entry.item_quantity += amount
@@ -60,6 +64,8 @@ def give_item(target_id: int, item_id: int, amount: int, overflow: bool = False,
             )
             session.add(new_entry)
 
+        _track_slots(session, target_id, item_id, old_qty, old_qty + amount)
+
         if overflow:
             logger.warning(
                 "SYSTEM GRANT (overflow=True): user=%s item=%s amount=%s",
@@ -100,6 +106,7 @@ def take_item(target_id: int, item_id: int, amount: int, session=None):
             raise NotEnoughItemError
 
         entry.item_quantity -= amount
+        _track_slots(session, target_id, item_id, entry.item_quantity + amount, entry.item_quantity)
 
         # delete row if it reaches 0
         if entry.item_quantity == 0:
@@ -117,6 +124,24 @@ def take_item(target_id: int, item_id: int, amount: int, session=None):
             session.close()
 
 
+async def give_item_async(target_id: int, item_id: int, amount: int, overflow: bool = False):
+    """Async variant of give_item; the write runs in a worker thread"""
+    from database.sessionmaker import run_in_async_session
+
+    return await run_in_async_session(
+        lambda session: give_item(target_id, item_id, amount, overflow, session)
+    )
+
+
+async def take_item_async(target_id: int, item_id: int, amount: int):
+    """Async variant of take_item; the write runs in a worker thread"""
+    from database.sessionmaker import run_in_async_session
+
+    return await run_in_async_session(
+        lambda session: take_item(target_id, item_id, amount, session)
+    )
+
+
 # Bulk removal of multiple items atomically
 def take_items_bulk(target_id: int, items: dict, session):
     """
@@ -163,12 +188,61 @@ def take_items_bulk(target_id: int, items: dict, session):
     for item_id, amount in items.items():
         entry = inventory_map[item_id]
         entry.item_quantity -= amount
+        _track_slots(session, target_id, item_id, entry.item_quantity + amount, entry.item_quantity)
 
         if entry.item_quantity == 0:
             session.delete(entry)
 
 
 
+# Bulk grant of multiple items in one statement
+def give_items_bulk(target_id: int, items: dict, session):
+    """
+    Grants multiple items to target with a single multi-row upsert.
+    This is a system grant (like give_item with overflow=True): inventory
+    capacity is not checked.
+
+    items format:
+    {
+        item_id: amount,
+        item_id2: amount2,
+        ...
+    }
+
+    Requires an external session (will NOT create or commit its own).
+    """
+
+    if session is None:
+        raise ValueError("give_items_bulk requires an external session")
+
+    if not items:
+        return
+
+    for amount in items.values():
+        if amount < 1:
+            raise InvalidItemAmountError
+
+    stmt = insert(Inventory).values([
+        {"user_id": target_id, "item_id": item_id, "item_quantity": amount}
+        for item_id, amount in items.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Inventory.user_id, Inventory.item_id],
+        set_={"item_quantity": Inventory.item_quantity + stmt.excluded.item_quantity},
+    ).returning(Inventory.item_id, Inventory.item_quantity)
+
+    changes = {
+        item_id: (new_qty - items[item_id], new_qty)
+        for item_id, new_qty in session.execute(stmt).all()
+    }
+    _track_slots_bulk(session, target_id, changes)
+
+    logger.warning(
+        "SYSTEM GRANT (bulk): user=%s items=%s",
+        target_id, items
+    )
+
+
 def transfer_item(sender_id: int, receiver_id: int, item_id: int, amount: int):
     """
     Atomically transfers item from sender → receiver
@@ -214,10 +288,12 @@ def transfer_item(sender_id: int, receiver_id: int, item_id: int, amount: int):
 
             # 🔧 Mutations
             entry1.item_quantity -= amount
+            _track_slots(session, sender_id, item_id, entry1.item_quantity + amount, entry1.item_quantity)
 
             if entry1.item_quantity == 0:
                 session.delete(entry1)
 
+            receiver_qty = entry2.item_quantity if entry2 else 0
             if entry2:
                 entry2.item_quantity += amount
             else:
@@ -226,6 +302,7 @@ def transfer_item(sender_id: int, receiver_id: int, item_id: int, amount: int):
                     item_id=item_id,
                     item_quantity=amount
                 ))
+            _track_slots(session, receiver_id, item_id, receiver_qty, receiver_qty + amount)
 
             #atomic
             session.commit()
@@ -374,16 +451,120 @@ def calculate_slots_used(user_id: int, session) -> int:
     total_slots_used = 0
 
     for _, qty, item_type in rows:
-        if qty <= 0:
+        stack_limit = allowed_stack_size(user_pockets.level, item_type)
+        total_slots_used += slots_for_quantity(qty, stack_limit)
+
+    return total_slots_used
+
+
+def slots_used(user_id: int, session) -> int:
+    """
+    Returns the user's materialized slot usage, computing and storing it
+    the first time (the counter is NULL for new users and after a pockets upgrade).
+    """
+    user = session.get(User, user_id)
+    if user.inventory_slots_used is None:
+        user.inventory_slots_used = calculate_slots_used(user_id, session)
+    return user.inventory_slots_used
+
+
+def _track_slots(session, user_id: int, item_id: int, old_qty: int, new_qty: int) -> None:
+    """Apply the slot delta of one item's quantity change to the materialized counter."""
+    _track_slots_bulk(session, user_id, {item_id: (old_qty, new_qty)})
+
+
+def _track_slots_bulk(session, user_id: int, changes: dict) -> None:
+    """Apply the combined slot delta of {item_id: (old_qty, new_qty)} in one UPDATE."""
+    user_pockets = session.get(Upgrades, (user_id, "pockets"))
+    if not user_pockets:
+        return
+
+    catalog = get_item_catalog()
+    delta = 0
+    for item_id, (old_qty, new_qty) in changes.items():
+        item = catalog.get(item_id)
+        if not item:
             continue
+        stack_limit = allowed_stack_size(user_pockets.level, item.item_type)
+        delta += slots_for_quantity(new_qty, stack_limit) - slots_for_quantity(old_qty, stack_limit)
+
+    if delta:
+        # NULL + delta stays NULL, so an uncomputed counter stays uncomputed
+        session.execute(
+            update(User)
+            .where(User.user_id == user_id)
+            .values(inventory_slots_used=User.inventory_slots_used + delta)
+        )
 
-        stack_limit = allowed_stack_size(user_pockets.level, item_type)
 
-        stacks_needed = math.ceil(qty / stack_limit)
+def reset_slots_used(user_id: int, session) -> None:
+    """Forget the counter so it is recomputed on next use (stack sizes changed)."""
+    session.execute(
+        update(User)
+        .where(User.user_id == user_id)
+        .values(inventory_slots_used=None)
+    )
 
-        total_slots_used += stacks_needed
 
-    return total_slots_used
+def reconcile_slots_used() -> int:
+    """
+    Recompute every materialized slot counter from the inventory and fix drift.
+    Runs as a daily job.
+
+    The inventory scan and the counter read share one REPEATABLE READ snapshot,
+    so a grant can never be counted in one and not the other. Fixes are then
+    applied in a fresh transaction, each compare-and-set against the value read,
+    so a counter that moved after the snapshot is left alone until the next run.
+
+    Returns:
+        int: number of users corrected
+    """
+    catalog = get_item_catalog()
+
+    with Session() as session:
+        session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+
+        pockets = dict(
+            session.query(Upgrades.user_id, Upgrades.level)
+            .filter(Upgrades.upgrade_name == "pockets")
+            .all()
+        )
+
+        actual = defaultdict(int)
+        rows = session.query(Inventory.user_id, Inventory.item_id, Inventory.item_quantity).yield_per(5000)
+        for user_id, item_id, qty in rows:
+            item = catalog.get(item_id)
+            stack_limit = allowed_stack_size(pockets.get(user_id, 0), item.item_type) if item else 0
+            actual[user_id] += slots_for_quantity(qty, stack_limit)
+
+        stored = (
+            session.query(User.user_id, User.inventory_slots_used)
+            .filter(User.inventory_slots_used.isnot(None))
+            .all()
+        )
+        session.rollback()
+
+    fixes = [
+        {"uid": user_id, "old": used, "slots": actual.get(user_id, 0)}
+        for user_id, used in stored
+        if used != actual.get(user_id, 0)
+    ]
+    if not fixes:
+        return 0
+
+    with Session() as session:
+        users = User.__table__
+        session.execute(
+            update(users)
+            .where(users.c.user_id == bindparam("uid"))
+            .where(users.c.inventory_slots_used == bindparam("old"))
+            .values(inventory_slots_used=bindparam("slots")),
+            fixes,
+        )
+        session.commit()
+
+    logger.warning("Reconciled inventory slot counters for %s users", len(fixes))
+    return len(fixes)
 
 
 def max_addable_amount(user_id: int, item_id: int, session) -> int:
@@ -394,14 +575,14 @@ def max_addable_amount(user_id: int, item_id: int, session) -> int:
     user_inv = session.get(Upgrades, (user_id, "inventory"))
     user_pockets = session.get(Upgrades, (user_id, "pockets"))
 
-    item = session.get(Items, item_id)
+    item = get_item_catalog().get(item_id)
     if not item:
         return 0
 
     stack_limit = allowed_stack_size(user_pockets.level, item.item_type)
     slots_allowed = available_inventory_slots_for_user(user_inv.level)
 
-    slots_used_now = calculate_slots_used(user_id, session)
+    slots_used_now = slots_used(user_id, session)
     free_slots = max(0, slots_allowed - slots_used_now)
 
     entry = session.get(Inventory, (user_id, item_id))
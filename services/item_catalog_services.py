@@ -0,0 +1,114 @@
+"""In-memory item catalog.
+
+The ``items`` table only changes when seed data changes, so it is loaded once
+into an immutable catalog with item ids pre-bucketed by (rarity, type,
+droppable). Random draws for lootboxes, exploring and the daily shop become a
+``random.choice`` over a tuple instead of an ``ORDER BY random()`` scan.
+"""
+
+import random
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from database.sessionmaker import Session
+from models.inventory_model import Items
+
+from domain.battle.gear_shards import non_droppable_shard_item_ids
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    item_id: int
+    item_name: str
+    item_description: str
+    item_type: str
+    item_rarity: str
+    item_icon: str | None
+    item_durability: int | None
+    item_price: int | None
+    item_usable: bool
+
+
+class ItemCatalog:
+    def __init__(self, items, non_droppable_ids=frozenset()):
+        self._by_id = MappingProxyType({item.item_id: item for item in items})
+
+        pools = {}
+        for item in self._by_id.values():
+            key = (item.item_rarity, item.item_type, item.item_id not in non_droppable_ids)
+            pools.setdefault(key, []).append(item.item_id)
+        self._pools = MappingProxyType({key: tuple(sorted(ids)) for key, ids in pools.items()})
+        # Unions of pools, built on first use; safe to cache since the catalog never changes
+        self._combined = {}
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def get(self, item_id: int) -> CatalogItem | None:
+        return self._by_id.get(item_id)
+
+    def pool(self, rarities, item_types, droppable_only: bool = True) -> tuple[int, ...]:
+        """Item ids matching any of the rarities and types."""
+        key = (tuple(rarities), tuple(item_types), droppable_only)
+        ids = self._combined.get(key)
+        if ids is None:
+            droppable = (True,) if droppable_only else (True, False)
+            ids = tuple(
+                item_id
+                for rarity in key[0]
+                for item_type in key[1]
+                for flag in droppable
+                for item_id in self._pools.get((rarity, item_type, flag), ())
+            )
+            self._combined[key] = ids
+        return ids
+
+    def random_item(self, rarity: str, item_types, droppable_only: bool = True, rng=random) -> CatalogItem | None:
+        ids = self.pool((rarity,), item_types, droppable_only)
+        if not ids:
+            return None
+        return self._by_id[rng.choice(ids)]
+
+    def sample(self, rarities, item_types, k: int, exclude_ids=(), exclude_names=(), droppable_only: bool = True, rng=random) -> list[CatalogItem]:
+        """Up to k distinct random items from the matching pools, minus exclusions."""
+        exclude_ids = set(exclude_ids)
+        exclude_names = set(exclude_names)
+        candidates = [
+            item_id
+            for item_id in self.pool(rarities, item_types, droppable_only)
+            if item_id not in exclude_ids and self._by_id[item_id].item_name not in exclude_names
+        ]
+        return [self._by_id[item_id] for item_id in rng.sample(candidates, min(k, len(candidates)))]
+
+
+_catalog: ItemCatalog | None = None
+
+
+def load_item_catalog() -> ItemCatalog:
+    """Build a fresh catalog from the items table and swap it in."""
+    global _catalog
+
+    with Session() as session:
+        items = [
+            CatalogItem(
+                item_id=row.item_id,
+                item_name=row.item_name,
+                item_description=row.item_description,
+                item_type=row.item_type,
+                item_rarity=row.item_rarity,
+                item_icon=row.item_icon,
+                item_durability=row.item_durability,
+                item_price=row.item_price,
+                item_usable=row.item_usable,
+            )
+            for row in session.query(Items).all()
+        ]
+
+    _catalog = ItemCatalog(items, frozenset(non_droppable_shard_item_ids()))
+    return _catalog
+
+
+def get_item_catalog() -> ItemCatalog:
+    if _catalog is None:
+        return load_item_catalog()
+    return _catalog
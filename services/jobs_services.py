@@ -1,24 +1,24 @@
+import asyncio
 import random
 import discord
 import time
 
 
-from sqlalchemy import select, func
-
 from database.sessionmaker import Session
 
 from models.users_model import User
-from models.inventory_model import Items
 
 from services.economy_services import add_gold, check_wallet, remove_gold
 from services.inventory_services import give_item
 from services.users_services import is_user
 from services.response_services import create_response
-from services.notif_services import send_notification
+from services.notif_services import send_notifications
 from services.alchemy_services import get_active_user_effect, expire_user_effect
+from services.energy_services import current_energy, settle_energy
 from services.quest_services import update_quest_progress
+from services.item_catalog_services import get_item_catalog
 
-from domain.battle.gear_shards import shard_item_ids
+from domain.progression.rules import max_energy
 
 from utils.custom_errors import VeyraError
 
@@ -36,16 +36,23 @@ class JobsClass:
         """
         self.user_id = user_id
 
-    def gain_energy(self, energy_gain = 1):
+    def gain_energy(self, energy_gain = 1, session=None):
         """
         Increase the user's energy by a specified amount, ignoring the maximum allowed energy.
 
         :param energy_gain: Amount of energy to gain. Default is 1.
+        :param session: Optional active session; the caller owns the commit.
         """
+        if session is not None:
+            user = session.get(User, self.user_id)
+            if user:
+                settle_energy(session, user, energy_gain)
+            return
+
         with Session() as session:
             user = session.get(User, self.user_id)
             if user:
-                    user.energy = user.energy + energy_gain
+                    settle_energy(session, user, energy_gain)
                     session.commit()
 
     def consume_energy(self, energy_cost: int):
@@ -56,10 +63,10 @@ class JobsClass:
         :return: True if energy was successfully consumed, False otherwise.
         """
         with Session() as session:
-            user = session.get(User, self.user_id)
+            user = session.get(User, self.user_id, with_for_update=True)
             if user:
-                if user.energy >= energy_cost:
-                    user.energy -= energy_cost
+                if current_energy(session, user) >= energy_cost:
+                    settle_energy(session, user, -energy_cost)
                     session.commit()
                     return True
 
@@ -75,10 +82,8 @@ class JobsClass:
         with Session() as session:
             user = session.get(User, self.user_id)
             if user:
-                lvl = user.level
-                energy = user.energy
-                max_energy = 35 + (15*lvl)
-                return f"{energy}/{max_energy}"
+                energy = current_energy(session, user)
+                return f"{energy}/{max_energy(user.level)}"
             return 0
 
 
@@ -362,19 +367,7 @@ class JobsClass:
 
         rarity = random.choices(["Rare", "Common"], weights=[85, 15], k=1)[0]
 
-        with Session() as session:
-            item = (
-                session.execute(
-                    select(Items)
-                    .where(Items.item_type == "item")
-                    .where(Items.item_rarity == rarity)
-                    .where(Items.item_id.notin_(shard_item_ids()))
-                    .order_by(func.random())
-                    .limit(1)
-                )
-                .scalars()
-                .first()
-            )
+        item = get_item_catalog().random_item(rarity, ("item",))
 
         if item is None:
             return "You explored but found nothing useful."
@@ -390,52 +383,24 @@ class JobsClass:
         update_quest_progress(self.user_id, "JOB_COMPLETE", 1)
         return f"You explored and found something! ({item.item_name})"
 
-async def regen_energy_for_all(bot):
-    with Session() as session:
-        # Fetch only users who are NOT already at max energy
-        rows = session.execute(
-            select(User.user_id, User.energy, User.level)
-            .where(User.energy < (35 + (15 * User.level)))
-        ).all()
-
-        for user_id, energy, level in rows:
-            max_energy = 35 + (15 * level)
-            # Check active energy regen effect
-            effect = get_active_user_effect(session, user_id)
-
-            regen_amount = 1
-
-            if effect == "ENERGY REGEN ELITE":
-                regen_amount = 2
-            elif effect == "ENERGY REGEN DEMON":
-                regen_amount = 5
-
-            new_energy = min(energy + regen_amount, max_energy)
-
-            # Update energy
-            session.execute(
-                User.__table__.update()
-                .where(User.user_id == user_id)
-                .values(energy=new_energy)
-            )
-
-            # Fire notification ONLY if just reached max
-            if energy < max_energy and new_energy == max_energy:
-                await send_notification(bot, user_id, "ENERGY_FULL", session)
+async def notify_energy_full(bot, user_ids):
+    """
+    Send ENERGY_FULL to users whose energy reached the cap.
 
-        session.commit()
+    Dispatched by the event scheduler when the deadline registered by
+    energy_services comes due, so only those users are touched. Energy is
+    re-checked first, so a deadline that moved after it was claimed does not
+    send an early DM.
+    """
+    full_ids = await asyncio.to_thread(_users_at_full_energy, user_ids)
+    if full_ids:
+        await send_notifications(bot, full_ids, "ENERGY_FULL")
 
 
-async def notify_users_with_capped_or_overflow_energy(bot):
-    """
-    Loops through all users whose energy is at or above their maximum
-    and sends them an ENERGY_FULL notification.
-    """
+def _users_at_full_energy(user_ids):
     with Session() as session:
-        rows = session.execute(
-            select(User.user_id, User.energy, User.level)
-            .where(User.energy >= (35 + (15 * User.level)))
-        ).all()
-
-        for user_id, energy, level in rows:
-            await send_notification(bot, user_id, "ENERGY_FULL", session)
+        users = session.query(User).filter(User.user_id.in_(list(user_ids))).all()
+        return [
+            user.user_id for user in users
+            if current_energy(session, user) >= max_energy(user.level)
+        ]
@@ -0,0 +1,176 @@
+"""Leaderboards read through per-metric indexes.
+
+Every ranked column has a btree index. "Top K" is an index scan with
+``ORDER BY value DESC LIMIT k`` and a ``rank()`` window, cached for
+``LEADERBOARD_TTL_SECONDS``. "Rank of user X" reads X's value and counts the
+rows with a strictly higher one, a range scan on the same index, so no query
+ever loads the whole table. That count is O(rank), not O(log n): Postgres
+btrees keep no subtree sizes, and an in-process order-statistic tree would
+have to load and track every row again. Display names come from a directory filled from
+``User.user_name`` and the gateway cache (``bot.get_user``), so rendering a
+leaderboard on a warm cache needs no database query and no REST call.
+"""
+
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+
+from database.sessionmaker import Session
+from models.users_model import User, UserStats, Wallet
+
+LEADERBOARD_TTL_SECONDS = 60
+LEADERBOARD_SIZE = 10
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    rank: int
+    user_id: int
+    user_name: str
+    value: int
+
+
+@dataclass(frozen=True)
+class Metric:
+    key: str
+    label: str
+    column: object
+
+
+METRICS = {
+    "gold": Metric("gold", "Gold", Wallet.gold),
+    "exp": Metric("exp", "Experience", User.exp),
+    "battles_won": Metric("battles_won", "Battles Won", UserStats.battles_won),
+    "races_won": Metric("races_won", "Races Won", UserStats.races_won),
+    "quest_streak": Metric("quest_streak", "Longest Quest Streak", UserStats.longest_quest_streak),
+}
+
+
+class NameDirectory:
+    """user_id -> display name, without REST lookups."""
+
+    def __init__(self):
+        self._names: dict[int, str] = {}
+
+    def remember(self, user_id: int, name: str | None) -> None:
+        if name:
+            self._names[user_id] = name
+
+    def resolve(self, user_id: int, bot=None) -> str:
+        """Prefer the live gateway cache, fall back to the stored name."""
+        if bot is not None:
+            user = bot.get_user(user_id)
+            if user is not None:
+                self._names[user_id] = user.name
+                return user.name
+        return self._names.get(user_id, f"User {user_id}")
+
+    def __len__(self):
+        return len(self._names)
+
+
+names = NameDirectory()
+
+
+# metric key -> (expires_at, top LEADERBOARD_SIZE entries); each swapped in with one assignment
+_top_cache: dict[str, tuple[float, list[LeaderboardEntry]]] = {}
+
+
+def _get_metric(metric_key: str) -> Metric:
+    metric = METRICS.get(metric_key)
+    if metric is None:
+        raise ValueError(f"Unknown leaderboard metric: {metric_key}")
+    return metric
+
+
+def _with_user(stmt, metric: Metric, outer: bool = False):
+    table = metric.column.table
+    if table is User.__table__:
+        return stmt.select_from(User)
+    if outer:
+        return stmt.select_from(User).outerjoin(table, table.c.user_id == User.user_id)
+    return stmt.select_from(table).join(User, User.user_id == table.c.user_id)
+
+
+def _load_top(metric: Metric, limit: int) -> list[LeaderboardEntry]:
+    column = metric.column
+    stmt = _with_user(
+        select(User.user_id, column, User.user_name, func.rank().over(order_by=column.desc())),
+        metric,
+    ).where(column.isnot(None)).order_by(column.desc(), User.user_id).limit(limit)
+
+    with Session() as session:
+        rows = session.execute(stmt).all()
+
+    entries = []
+    for user_id, value, user_name, rank in rows:
+        names.remember(user_id, user_name)
+        entries.append(LeaderboardEntry(rank, user_id, user_name, value))
+    return entries
+
+
+def get_leaderboard(metric_key: str, limit: int = LEADERBOARD_SIZE, fresh: bool = False) -> list[LeaderboardEntry]:
+    """
+    Top `limit` players for a metric, best first. Ties share a rank (1, 2, 2, 4).
+
+    Args:
+        metric_key (str): One of METRICS.
+        limit (int): Number of entries, at most LEADERBOARD_SIZE for a cached answer.
+        fresh (bool): Bypass and refill the cache (e.g. before awarding placements).
+
+    Raises:
+        ValueError: If the metric is unknown.
+    """
+    metric = _get_metric(metric_key)
+
+    if limit > LEADERBOARD_SIZE:
+        return _load_top(metric, limit)
+
+    expires_at, entries = _top_cache.get(metric_key, (0.0, None))
+    if fresh or entries is None or time.monotonic() >= expires_at:
+        entries = _load_top(metric, LEADERBOARD_SIZE)
+        _top_cache[metric_key] = (time.monotonic() + LEADERBOARD_TTL_SECONDS, entries)
+    return entries[:limit]
+
+
+def get_rank(metric_key: str, user_id: int) -> LeaderboardEntry | None:
+    """
+    A user's position for a metric, or None if they are not registered.
+
+    Ties share a rank (1 + players strictly ahead). The count is an index
+    range scan over the players ahead, so it costs O(rank) index entries:
+    cheap near the top, a scan of most of the index for the bottom players.
+    """
+    metric = _get_metric(metric_key)
+    column = metric.column
+
+    with Session() as session:
+        row = session.execute(
+            _with_user(select(func.coalesce(column, 0), User.user_name), metric, outer=True)
+            .where(User.user_id == user_id)
+        ).first()
+        if row is None:
+            return None
+
+        value, user_name = row
+        ahead = session.execute(
+            select(func.count()).select_from(column.table).where(column > value)
+        ).scalar_one()
+
+    names.remember(user_id, user_name)
+    return LeaderboardEntry(ahead + 1, user_id, user_name, value)
+
+
+def count_players() -> int:
+    with Session() as session:
+        return session.execute(select(func.count()).select_from(User)).scalar_one()
+
+
+def get_gold_leaderboard(limit: int = LEADERBOARD_SIZE, fresh: bool = False) -> list[LeaderboardEntry]:
+    """Top players by gold."""
+    return get_leaderboard("gold", limit, fresh)
+
+
+def invalidate_leaderboards() -> None:
+    _top_cache.clear()
@@ -8,6 +8,7 @@ from sqlalchemy import select, update
 from database.sessionmaker import Session
 
 from services.economy_services import remove_gold
+from services.scheduled_events_services import LOAN_DUE_EVENT, cancel_event, schedule_event
 
 from models.users_model import Loan, User
 
@@ -70,6 +71,7 @@ def issue_loan(user_id: int, loan_pack_id: str) -> Tuple[bool, Optional[int], Op
         )
 
         session.add(new_loan)
+        schedule_event(session, LOAN_DUE_EVENT, user_id, due_date - timedelta(days=REMINDER_WINDOW_DAYS))
         session.commit()
         session.refresh(new_loan)
 
@@ -113,6 +115,7 @@ def repay_loan(user_id: int) -> str:
             .where(Loan.id == active_loan.id)
             .values(status="paid", paid_at=now)
         )
+        cancel_event(session, LOAN_DUE_EVENT, user_id)
         session.commit()
 
         # Detach-safe return
@@ -132,8 +135,11 @@ def check_starter_loan_given(user_id: int) -> bool:
         return bool(starter_given)
 
 
-async def send_due_loan_reminders(bot) -> int:
-    """Send a DM reminder to users who have an active loan due within 2 days.
+async def send_loan_reminders(bot, user_ids) -> int:
+    """Send a DM reminder to users whose active loan is now due within 2 days.
+
+    Dispatched by the event scheduler at the LOAN_DUE deadline registered in
+    issue_loan.
 
     Returns:
         int: number of DMs successfully sent
@@ -141,18 +147,20 @@ async def send_due_loan_reminders(bot) -> int:
     import discord
 
     now = datetime.now(timezone.utc)
-    cutoff = now + timedelta(days=REMINDER_WINDOW_DAYS)
 
     sent = 0
 
     with Session() as session:
-        # Query all active loans due within the reminder window
+        # Mark and fetch the reminded loans in one statement
         due_loans = session.execute(
-            select(Loan)
+            update(Loan)
+            .where(Loan.user_id.in_(user_ids))
             .where(Loan.status == ACTIVE_LOAN_STATUS)
-            .where(Loan.due_date <= cutoff)
             .where(Loan.due_date > now)
-        ).scalars().all()
+            .values(due_reminder_sent=True)
+            .returning(Loan.user_id, Loan.loan_pack_id, Loan.due_date)
+        ).all()
+        session.commit()
 
     # Send DMs outside the DB session
     for loan in due_loans:
@@ -197,6 +205,6 @@ async def send_due_loan_reminders(bot) -> int:
             # User has DMs closed
             continue
         except Exception as e:
-            print("send_due_loan_reminders error:", e)
+            print("send_loan_reminders error:", e)
 
     return sent
\ No newline at end of file
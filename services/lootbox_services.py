@@ -1,13 +1,65 @@
 import random
-from sqlalchemy.sql.expression import func
-from models.inventory_model import Items, Inventory
+from collections import Counter
+
+import numpy as np
+
+from models.inventory_model import Inventory
 from database.sessionmaker import Session
-from services.inventory_services import give_item
+from services.inventory_services import give_item, give_items_bulk, take_item
 from services.economy_services import add_gold
 from services.quest_services import update_quest_progress
-from domain.battle.gear_shards import non_droppable_shard_item_ids
+from services.item_catalog_services import get_item_catalog
 from utils.itemname_to_id import get_item_id_safe
-from utils.embeds.lootboxembed import lootbox_embed_and_view
+from utils.embeds.lootboxembed import lootbox_embed_and_view, bulk_lootbox_embed
+
+LOOTBOX_DROP_RATES = {
+    "wooden box": {"common": 88, "rare": 10, "epic": 2},
+    "stone box": {"common": 67, "rare": 28, "epic": 5},
+    "iron box": {"common": 48, "rare": 37, "epic": 15},
+    "platinum box": {"common": 21, "rare": 50, "epic": 25, "legendary": 4}
+}
+
+LOOTBOX_GOLD_RANGES = {
+    "wooden box": (12, 32),
+    "stone box": (60, 122),
+    "iron box": (200, 310),
+    "platinum box": (400, 800)
+}
+
+LOOTBOX_ROLLS = {
+    "wooden box": {1: 85, 2: 15},
+    "stone box": {1: 60, 2: 40},
+    "iron box": {1: 13, 2: 70, 3: 17},
+    "platinum box": {3: 33, 4: 38, 5: 20, 6: 9}
+}
+
+LOOTBOX_AMOUNTS = {
+    "wooden box": {
+        "common": (1, 2),
+        "rare": (1, 1),
+        "epic": (1, 1),
+    },
+    "stone box": {
+        "common": (1, 3),
+        "rare": (1, 2),
+        "epic": (1, 1),
+    },
+    "iron box": {
+        "common": (2, 5),
+        "rare": (1, 3),
+        "epic": (1, 2),
+    },
+    "platinum box": {
+        "common": (4, 7),
+        "rare": (3, 6),
+        "epic": (1, 3),
+        "legendary": (1, 1),
+    }
+}
+
+MAX_BULK_OPEN = 100
+
+RARITY_ORDER = ("legendary", "epic", "rare", "common")
 
 def open_box(user_id, lootbox: str):
     rewards = lootbox_reward(user_id, lootbox)
@@ -30,14 +82,7 @@ def lootbox_reward(user_id: int,lootbox: str):
     """
     lootbox = lootbox.strip().lower()
 
-    drop_rates = {
-        "wooden box": {"common": 88, "rare": 10, "epic": 2},
-        "stone box": {"common": 67, "rare": 28, "epic": 5},
-        "iron box": {"common": 48, "rare": 37, "epic": 15},
-        "platinum box": {"common": 21, "rare": 50, "epic": 25, "legendary": 4}
-    }
-
-    box_config = drop_rates.get(lootbox)
+    box_config = LOOTBOX_DROP_RATES.get(lootbox)
     if not box_config:
         raise ValueError("Wrong box name")
 
@@ -96,25 +141,16 @@ def lootbox_reward(user_id: int,lootbox: str):
 
 def pick_random_item(rarity: str):
     """
-    Selects a random item of the specified rarity from the database.
+    Selects a random droppable item of the specified rarity from the item catalog.
 
     Args:
         rarity (str): Rarity of the item to pick (e.g., "Common", "Rare").
 
     Returns:
-        Items | None: The randomly selected item row, or None if none found.
+        CatalogItem | None: The randomly selected item, or None if none found.
     """
     rarity = rarity.capitalize()
-    with Session() as session:
-        blocked_shards = non_droppable_shard_item_ids()
-        return (
-            session.query(Items)
-            .filter_by(item_rarity=rarity)
-            .where(Items.item_type.in_(("item", "shard")))
-            .where(Items.item_id.notin_(blocked_shards))
-            .order_by(func.random())
-            .first()
-        )  # pylint: disable=not-callable
+    return get_item_catalog().random_item(rarity, ("item", "shard"))
 
 
 def decide_gold(lootbox: str):
@@ -127,13 +163,7 @@ def decide_gold(lootbox: str):
     Returns:
         int: Random gold amount within defined range for the lootbox.
     """
-    gold_ranges = {
-        "wooden box": (12, 32),
-        "stone box": (60, 122),
-        "iron box": (200, 310),
-        "platinum box": (400, 800)
-    }
-    min_gold, max_gold = gold_ranges.get(lootbox, (0, 0))
+    min_gold, max_gold = LOOTBOX_GOLD_RANGES.get(lootbox, (0, 0))
     return random.randint(min_gold, max_gold)
 
 
@@ -150,14 +180,7 @@ def count_rolls(lootbox_name: str):
     Raises:
         ValueError: If the lootbox name is unknown.
     """
-    rolls = {
-        "wooden box": {1: 85, 2: 15},
-        "stone box": {1: 60, 2: 40},
-        "iron box": {1: 13, 2: 70, 3: 17},
-        "platinum box": {3: 33, 4: 38, 5: 20, 6: 9}
-    }
-
-    box_config = rolls.get(lootbox_name.lower())
+    box_config = LOOTBOX_ROLLS.get(lootbox_name.lower())
     if box_config is None:
         raise ValueError(f"Unknown lootbox name: {lootbox_name}")
 
@@ -183,31 +206,7 @@ def count_amount(lootbox_name: str, rarity_of_item: str):
     Raises:
         ValueError: If lootbox or rarity is invalid.
     """
-    amount_table = {
-        "wooden box": {
-            "common": (1, 2),
-            "rare": (1, 1),
-            "epic": (1, 1),
-        },
-        "stone box": {
-            "common": (1, 3),
-            "rare": (1, 2),
-            "epic": (1, 1),
-        },
-        "iron box": {
-            "common": (2, 5),
-            "rare": (1, 3),
-            "epic": (1, 2),
-        },
-        "platinum box": {
-            "common": (4, 7),
-            "rare": (3, 6),
-            "epic": (1, 3),
-            "legendary": (1, 1),
-        }
-    }
-
-    box_data = amount_table.get(lootbox_name)
+    box_data = LOOTBOX_AMOUNTS.get(lootbox_name)
     if not box_data:
         raise ValueError(f"Unknown lootbox: {lootbox_name}")
 
@@ -219,6 +218,130 @@ def count_amount(lootbox_name: str, rarity_of_item: str):
     return random.randint(*rarity_range)
 
 
+def _weights_to_p(weights) -> np.ndarray:
+    weights = np.asarray(list(weights), dtype=float)
+    return weights / weights.sum()
+
+
+def roll_bulk_rewards(lootbox: str, amount: int, rng: np.random.Generator | None = None, catalog=None):
+    """
+    Rolls the rewards of `amount` boxes at once.
+
+    Every random draw (rolls per box, gold, rarities, items and quantities) is
+    one vectorized Generator call instead of a Python loop per box. Unlike a
+    single open, duplicate items across rolls are not re-rolled; their
+    quantities are simply summed.
+
+    Args:
+        lootbox (str): The lootbox name.
+        amount (int): Number of boxes to open.
+        rng: Optional NumPy Generator (seed it for reproducible results).
+        catalog: Optional ItemCatalog, defaults to the loaded catalog.
+
+    Returns:
+        tuple[int, dict[int, int]]: (total gold, {item_id: total quantity})
+
+    Raises:
+        ValueError: If the lootbox name is invalid.
+    """
+    lootbox = lootbox.strip().lower()
+    drop_rates = LOOTBOX_DROP_RATES.get(lootbox)
+    if not drop_rates:
+        raise ValueError("Wrong box name")
+
+    rng = rng or np.random.default_rng()
+    catalog = catalog or get_item_catalog()
+
+    # Gold is the first roll of every box
+    min_gold, max_gold = LOOTBOX_GOLD_RANGES[lootbox]
+    gold = int(rng.integers(min_gold, max_gold, size=amount, endpoint=True).sum())
+
+    rolls = LOOTBOX_ROLLS[lootbox]
+    rolls_per_box = rng.choice(list(rolls.keys()), size=amount, p=_weights_to_p(rolls.values()))
+    item_rolls = int((rolls_per_box - 1).sum())
+
+    rarities = list(drop_rates.keys())
+    rarity_hits = rng.choice(len(rarities), size=item_rolls, p=_weights_to_p(drop_rates.values()))
+    rolls_by_rarity = np.bincount(rarity_hits, minlength=len(rarities))
+
+    items = {}
+    for rarity, count in zip(rarities, rolls_by_rarity):
+        pool = catalog.pool((rarity.capitalize(),), ("item", "shard"))
+        if not count or not pool:
+            continue
+
+        low, high = LOOTBOX_AMOUNTS[lootbox][rarity]
+        picks = np.asarray(pool)[rng.integers(0, len(pool), size=count)]
+        quantities = rng.integers(low, high, size=count, endpoint=True)
+
+        item_ids, inverse = np.unique(picks, return_inverse=True)
+        totals = np.bincount(inverse, weights=quantities)
+        items.update({int(item_id): int(total) for item_id, total in zip(item_ids, totals)})
+
+    return gold, items
+
+
+def open_boxes(user_id: int, lootbox: str, amount: int, rng: np.random.Generator | None = None):
+    """
+    Opens `amount` lootboxes in one transaction: the boxes are consumed, gold is
+    added with one wallet update and all items are granted with one multi-row upsert.
+
+    Args:
+        user_id (int): The user's ID.
+        lootbox (str): The lootbox name.
+        amount (int): Number of boxes to open (1..MAX_BULK_OPEN).
+        rng: Optional NumPy Generator.
+
+    Returns:
+        dict: {'gold': int, 'boxes': int, 'items': list of reward dicts}, items
+              sorted by rarity then quantity.
+
+    Raises:
+        ValueError: If the lootbox name or amount is invalid.
+        NotEnoughItemError: If the user owns fewer than `amount` boxes.
+    """
+    lootbox = lootbox.strip().lower()
+    if not 1 <= amount <= MAX_BULK_OPEN:
+        raise ValueError(f"You can open between 1 and {MAX_BULK_OPEN} boxes at once")
+
+    box_id, _ = get_item_id_safe(lootbox)
+    if box_id is None:
+        raise ValueError("Wrong box name")
+
+    catalog = get_item_catalog()
+    gold, items = roll_bulk_rewards(lootbox, amount, rng, catalog)
+
+    with Session() as session:
+        try:
+            take_item(user_id, box_id, amount, session=session)
+            add_gold(user_id, gold, session)
+            give_items_bulk(user_id, items, session)
+            update_quest_progress(user_id, "LOOTBOX_OPEN", amount, session=session)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+
+    rewards = []
+    for item_id, quantity in items.items():
+        item = catalog.get(item_id)
+        rewards.append({
+            "item": item.item_name,
+            "rarity": item.item_rarity.lower(),
+            "description": item.item_description,
+            "icon": item.item_icon,
+            "quantity": quantity
+        })
+    rewards.sort(key=lambda reward: (RARITY_ORDER.index(reward["rarity"]), -reward["quantity"]))
+
+    return {"gold": gold, "boxes": amount, "items": rewards}
+
+
+def open_boxes_bulk(user_id: int, lootbox: str, amount: int):
+    """Opens `amount` boxes and returns the summary embed."""
+    return bulk_lootbox_embed(open_boxes(user_id, lootbox, amount))
+
+
 def user_lootbox_count(user_id: int, lootbox_name: str):
     """
     Queries the user's inventory to find how many of the specified lootbox they own.
@@ -1,125 +1,184 @@
 import random
 
+from sqlalchemy import func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+
 from database.sessionmaker import Session
-from models.users_model import LotteryEntries
+from models.users_model import LotteryRound, LotteryTicket
 
-from services.economy_services import check_wallet, remove_gold
+from services.economy_services import remove_gold
 
-from utils.custom_errors import UserNotFoundError, UserNotRegisteredError
+from utils.custom_errors import UserNotFoundError, UserNotRegisteredError, NotEnoughGoldError
 
-tickets_created = set()
+# Ticket ids keep counting up across rounds, so a number is never reused
+FIRST_TICKET_ID = 1000000
+ROUND_ID = 1
+MAX_TICKETS_PER_PURCHASE = 100
 
-def create_ticket(user_id: int, ticket_price: int):
+
+def _allocate_ticket_ids(session, ticket_price: int, count: int) -> int:
     """
-    create a lottery draw ticket
+    Reserve `count` consecutive ticket ids and add them to the round totals.
 
+    One upsert on the single round row: it bumps the id counter and the running
+    aggregate together, so stats never need to scan the tickets.
+
+    Returns:
+        int: the first reserved ticket id
+    """
+    stmt = insert(LotteryRound).values(
+        id=ROUND_ID,
+        tickets_sold=count,
+        prize_pool=count * ticket_price,
+        next_ticket_id=FIRST_TICKET_ID + count,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LotteryRound.id],
+        set_={
+            "tickets_sold": LotteryRound.tickets_sold + count,
+            "prize_pool": LotteryRound.prize_pool + count * ticket_price,
+            "next_ticket_id": LotteryRound.next_ticket_id + count,
+        },
+    ).returning(LotteryRound.next_ticket_id)
+
+    return session.execute(stmt).scalar_one() - count
+
+
+def buy_tickets(user_id: int, ticket_price: int, count: int):
     """
-    # return 0 if user doesn't have money for ticket
-    try:
-        wallet_gold = check_wallet(user_id)
-    except UserNotFoundError as exc:
-        raise UserNotRegisteredError(user_id) from exc
-
-    if ticket_price > wallet_gold:
-        return 0
-    try:
-        remove_gold(user_id, ticket_price)
-    except UserNotFoundError as exc:
-        raise UserNotRegisteredError(user_id) from exc
-
-    ticket_id = random.randint(1000000, 9999999)
-    while ticket_id in tickets_created:
-        ticket_id = random.randint(1000000, 9999999)
-    tickets_created.add(ticket_id)
+    Buy `count` lottery tickets in one transaction.
+
+    Gold is debited once, a block of consecutive ids is reserved on the round
+    row, and all tickets are inserted by one INSERT ... SELECT over
+    generate_series, so 100 tickets cost the same handful of statements as one.
+
+    Returns:
+        tuple[int, int] | None: (first_ticket_id, last_ticket_id), or None if
+        the user can't afford them.
+
+    Raises:
+        ValueError: If count is outside 1..MAX_TICKETS_PER_PURCHASE.
+        UserNotRegisteredError: If the user has no wallet.
+    """
+    if not 1 <= count <= MAX_TICKETS_PER_PURCHASE:
+        raise ValueError(f"You can buy between 1 and {MAX_TICKETS_PER_PURCHASE} tickets at once")
 
     with Session() as session:
-        entry = session.get(LotteryEntries, user_id)
-        if entry:
-            entry.tickets = entry.tickets + [ticket_id]
-        else:
-            entry = LotteryEntries(
-                user_id=user_id,
-                tickets=[ticket_id],
-                ticket_price=ticket_price
+        try:
+            remove_gold(user_id, ticket_price * count, session)
+        except UserNotFoundError as exc:
+            raise UserNotRegisteredError(user_id) from exc
+        except NotEnoughGoldError:
+            return None
+
+        first_id = _allocate_ticket_ids(session, ticket_price, count)
+        last_id = first_id + count - 1
+
+        ticket_ids = func.generate_series(first_id, last_id).table_valued("ticket_id").render_derived()
+        session.execute(
+            insert(LotteryTicket).from_select(
+                ["ticket_id", "user_id", "ticket_price"],
+                select(ticket_ids.c.ticket_id, literal(user_id), literal(ticket_price)),
             )
-            session.add(entry)
+        )
 
         session.commit()
-        return ticket_id
+        return first_id, last_id
+
+
+def create_ticket(user_id: int, ticket_price: int):
+    """
+    create a lottery draw ticket
+
+    Returns the ticket id, or 0 if the user can't afford it.
+    """
+    tickets = buy_tickets(user_id, ticket_price, 1)
+    return tickets[0] if tickets else 0
 
 
 def get_lottery_stats():
     """Return (tickets_sold, prize_pool)."""
     with Session() as session:
-        entries = session.query(LotteryEntries).all()
-        if not entries:
+        lottery_round = session.get(LotteryRound, ROUND_ID)
+        if not lottery_round:
             return 0, 0
 
-        tickets_sold = 0
-        prize_pool = 0
-        for entry in entries:
-            count = len(entry.tickets or [])
-            tickets_sold += count
-            prize_pool += count * entry.ticket_price
-
-        return tickets_sold, prize_pool
-
-
+        return lottery_round.tickets_sold, lottery_round.prize_pool
 
 
 def get_user_tickets(user_id: int):
     with Session() as session:
-        entry = session.query(LotteryEntries).filter_by(user_id=user_id).first()
-        return entry.tickets if entry else []
+        return session.scalars(
+            select(LotteryTicket.ticket_id)
+            .where(LotteryTicket.user_id == user_id)
+            .order_by(LotteryTicket.ticket_id)
+        ).all()
 
 
 def get_lottery_round_entries():
     """Return current lottery participants with ticket counts before reset."""
     with Session() as session:
-        entries = session.query(LotteryEntries).all()
+        rows = session.execute(
+            select(
+                LotteryTicket.user_id,
+                func.count().label("ticket_count"),
+                func.max(LotteryTicket.ticket_price).label("ticket_price"),
+            )
+            .group_by(LotteryTicket.user_id)
+        ).all()
         return [
             {
-                "user_id": entry.user_id,
-                "ticket_count": len(entry.tickets or []),
-                "ticket_price": entry.ticket_price,
+                "user_id": row.user_id,
+                "ticket_count": row.ticket_count,
+                "ticket_price": row.ticket_price,
             }
-            for entry in entries
-            if entry.tickets
+            for row in rows
         ]
 
 
 def pick_lottery_winner():
+    """
+    Draw a winning ticket.
+
+    Every ticket is equally likely: the winner is picked from per-user ticket
+    counts weighted by count, then one of their tickets is picked by offset.
+    """
     with Session() as session:
-        all_entries = session.query(LotteryEntries).all()
-        if not all_entries:
+        counts = session.execute(
+            select(LotteryTicket.user_id, func.count())
+            .group_by(LotteryTicket.user_id)
+        ).all()
+        if not counts:
             return None
 
-        all_tickets = [(e.user_id, t) for e in all_entries for t in e.tickets]
-        if not all_tickets:
-            return None
+        user_ids = [user_id for user_id, _ in counts]
+        weights = [count for _, count in counts]
+        winner_index = random.choices(range(len(user_ids)), weights=weights, k=1)[0]
+        winner_user_id = user_ids[winner_index]
 
-        winner_user_id, winning_ticket = random.choice(all_tickets)
+        winning_ticket = session.scalar(
+            select(LotteryTicket.ticket_id)
+            .where(LotteryTicket.user_id == winner_user_id)
+            .order_by(LotteryTicket.ticket_id)
+            .offset(random.randrange(weights[winner_index]))
+            .limit(1)
+        )
 
         return winner_user_id, winning_ticket
 
 
 def reset_lottery():
     with Session() as session:
-        session.query(LotteryEntries).delete()
+        # Zeroing the round row first waits out in-flight purchases, which hold its lock
+        session.execute(
+            update(LotteryRound)
+            .where(LotteryRound.id == ROUND_ID)
+            .values(tickets_sold=0, prize_pool=0)
+        )
+        session.query(LotteryTicket).delete()
         session.commit()
-    tickets_created.clear()
 
 
 def calculate_prize_pool():
     """Calculate the total gold in the prize pool based on all tickets sold."""
-    with Session() as session:
-        entries = session.query(LotteryEntries).all()
-        if not entries:
-            return 0
-
-        total = 0
-        for entry in entries:
-            print(entry.tickets)
-            total += len(entry.tickets) * entry.ticket_price
-        print (total)
-        return total
+    return get_lottery_stats()[1]
@@ -1,19 +1,24 @@
 import logging
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
 
 from database.sessionmaker import Session
-from services.economy_services import add_gold, remove_gold
+from services.economy_services import add_gold, remove_gold, lock_wallets
 from services.game_events_services import create_game_event
 from services.inventory_services import take_item, give_item
+from services.item_catalog_services import get_item_catalog
 from models.marketplace_model import Marketplace
+from models.inventory_model import Items
+from models.users_model import User
 from services.quest_services import update_quest_progress
 from domain.battle.gear_shards import account_bound_shard_item_ids, is_account_bound_shard_item
 from utils.custom_errors import VeyraError, NotEnoughGoldError, FullInventoryError, PartialInventoryError
-from utils.embeds.marketplaceembed import build_marketplace
+from utils.embeds.marketplaceembed import build_marketplace_page
 from utils.emotes import GOLD_EMOJI
 
 logger = logging.getLogger(__name__)
 
+LISTINGS_PER_PAGE = 9
+
 def create_listing(user_id: int, item_id: int, quantity: int, price: int) -> int:
     """
     Create a new listing for an item on the marketplace.
@@ -62,6 +67,12 @@ def buy_listed_item(buyer_id: int, listing_id: int, quantity: int):
     """
     Attempt to buy a listed item from the marketplace.
 
+    The whole purchase is one transaction: the listing row is taken with
+    SELECT ... FOR UPDATE SKIP LOCKED (a buyer racing for the same listing is
+    told to retry instead of queueing behind the lock), both wallets are locked
+    in user_id order, and gold, items, quests, events and the listing update
+    are committed together.
+
     Args:
         buyer_id (int): The ID of the buyer.
         listing_id (int): The listing ID to purchase from.
@@ -70,9 +81,20 @@ def buy_listed_item(buyer_id: int, listing_id: int, quantity: int):
     Returns:
         str: Result message (success or error).
     """
+    if quantity < 1:
+        return "You need to buy at least 1 item."
+
     with Session() as session:
-        listing = session.get(Marketplace, listing_id)
+        listing = session.execute(
+            select(Marketplace)
+            .where(Marketplace.listing_id == listing_id)
+            .with_for_update(skip_locked=True)
+        ).scalar_one_or_none()
+
         if not listing:
+            # A plain read does not wait on the row lock
+            if session.scalar(select(Marketplace.listing_id).where(Marketplace.listing_id == listing_id)):
+                return "Someone else is buying from this listing right now, try again in a moment."
             return f"There is currently no listing available with ID {listing_id}"
 
         if listing.user_id == buyer_id:
@@ -86,64 +108,77 @@ def buy_listed_item(buyer_id: int, listing_id: int, quantity: int):
         if is_account_bound_shard_item(item_id):
             return "That shard is account-bound and cannot be bought or sold on the marketplace."
 
-        item_name = listing.item.item_name
+        item_name = get_item_catalog().get(item_id).item_name
         price = listing.price
-        seller_name = listing.user.user_name
-        seller_id = listing.user.user_id
+        seller_id = listing.user_id
         total_price = quantity * price
         seller_earnings = int(total_price * 0.93)
 
-        # Attempt to deduct buyer's gold
         try:
-            remove_gold(buyer_id, total_price)
+            lock_wallets(session, (buyer_id, seller_id))
+
+            if total_price:
+                remove_gold(buyer_id, total_price, session)
+            give_item(buyer_id, item_id, quantity, session=session)
+            if seller_earnings:
+                add_gold(seller_id, seller_earnings, session) #Charge the 7 % listing fee
+
+            # Quest progress: seller sold items, buyer bought items
+            update_quest_progress(seller_id, "ITEM_SELL", quantity, session=session)
+            update_quest_progress(buyer_id, "ITEM_BUY", quantity, session=session)
+
+            # Remove or update listing
+            if items_in_stock == quantity:
+                session.delete(listing)
+            else:
+                listing.quantity -= quantity
+
+            create_game_event(
+                buyer_id,
+                "marketplace_purchase",
+                f"Bought {quantity}x {item_name} from the marketplace for {total_price} gold.",
+                {
+                    "listing_id": listing_id,
+                    "item_id": item_id,
+                    "item_name": item_name,
+                    "quantity": quantity,
+                    "total_price": total_price,
+                    "seller_id": seller_id,
+                },
+                session=session,
+            )
+            create_game_event(
+                seller_id,
+                "marketplace_sale",
+                f"Sold {quantity}x {item_name} on the marketplace for {seller_earnings} gold after fees.",
+                {
+                    "listing_id": listing_id,
+                    "item_id": item_id,
+                    "item_name": item_name,
+                    "quantity": quantity,
+                    "gross_price": total_price,
+                    "net_gold": seller_earnings,
+                    "buyer_id": buyer_id,
+                },
+                session=session,
+            )
+            session.commit()
+
         except NotEnoughGoldError as e:
+            session.rollback()
             return str(e)
 
-        # Transfer item and gold
-        give_item(buyer_id, item_id, quantity)
-        add_gold(listing.user_id, seller_earnings) #Charge the 7 % listing fee
+        except (FullInventoryError, PartialInventoryError):
+            session.rollback()
+            return "You don't have enough inventory space for that many items."
 
-        # Quest progress: seller sold items, buyer bought items
-        update_quest_progress(listing.user_id, "ITEM_SELL", quantity)
-        update_quest_progress(buyer_id, "ITEM_BUY", quantity)
+        except Exception:
+            session.rollback()
+            raise
 
-        # Remove or update listing
-        if items_in_stock == quantity:
-            session.delete(listing)
-        else:
-            listing.quantity -= quantity
-
-        session.commit()
-        create_game_event(
-            buyer_id,
-            "marketplace_purchase",
-            f"Bought {quantity}x {item_name} from the marketplace for {total_price} gold.",
-            {
-                "listing_id": listing_id,
-                "item_id": item_id,
-                "item_name": item_name,
-                "quantity": quantity,
-                "total_price": total_price,
-                "seller_id": seller_id,
-            },
-        )
-        create_game_event(
-            seller_id,
-            "marketplace_sale",
-            f"Sold {quantity}x {item_name} on the marketplace for {seller_earnings} gold after fees.",
-            {
-                "listing_id": listing_id,
-                "item_id": item_id,
-                "item_name": item_name,
-                "quantity": quantity,
-                "gross_price": total_price,
-                "net_gold": seller_earnings,
-                "buyer_id": buyer_id,
-            },
-        )
         logger.info("Items traded on marketplace", extra={
             "user": buyer_id,
-            "flex": f"Item bought-> {item_name} at rate-> {price} amount->{quantity} from {seller_name}"
+            "flex": f"Item bought-> {item_name} at rate-> {price} amount->{quantity} from {seller_id}"
         })
         return f"Successfully bought {quantity}×{item_name} from <@{seller_id}> for {total_price} {GOLD_EMOJI}"
 
@@ -192,38 +227,130 @@ def remove_listing(user_id: int, listing_id: int) -> str:
 
         return f"Your listing for {listing_name} ×{quantity} has been removed and refunded successfully!"
 
-def fill_marketplace_list():
+def browse_listings(
+    *,
+    item_id: int | None = None,
+    item_type: str | None = None,
+    rarity: str | None = None,
+    min_price: int | None = None,
+    max_price: int | None = None,
+    after: tuple[int, int] | None = None,
+    limit: int = LISTINGS_PER_PAGE,
+):
     """
-    Fetch all current marketplace listings and build a structured list.
+    Fetch one page of the order book, cheapest first.
+
+    Pages are keyset-paginated on (price, listing_id), so a page costs the same
+    no matter how deep the user has scrolled. Seller and item are joined in the
+    same query.
+
+    Args:
+        item_id (int | None): Only listings of this item.
+        item_type (str | None): Only items of this type (e.g. "item", "shard").
+        rarity (str | None): Only items of this rarity.
+        min_price (int | None): Lowest unit price, inclusive.
+        max_price (int | None): Highest unit price, inclusive.
+        after (tuple[int, int] | None): Cursor returned with the previous page.
+        limit (int): Page size.
 
     Returns:
-        list[dict]: List of structured listing data for rendering.
+        tuple[list[dict], tuple[int, int] | None]: The listings and the cursor
+        of the next page (None on the last page).
     """
+    stmt = (
+        select(
+            Marketplace.listing_id,
+            Marketplace.item_id,
+            Marketplace.quantity,
+            Marketplace.price,
+            Items.item_name,
+            Items.item_type,
+            Items.item_rarity,
+            User.user_name,
+        )
+        .join(Items, Items.item_id == Marketplace.item_id)
+        .join(User, User.user_id == Marketplace.user_id)
+        .where(Marketplace.item_id.notin_(account_bound_shard_item_ids()))
+    )
+
+    if item_id is not None:
+        stmt = stmt.where(Marketplace.item_id == item_id)
+    if item_type is not None:
+        stmt = stmt.where(Items.item_type == item_type)
+    if rarity is not None:
+        stmt = stmt.where(Items.item_rarity == rarity)
+    if min_price is not None:
+        stmt = stmt.where(Marketplace.price >= min_price)
+    if max_price is not None:
+        stmt = stmt.where(Marketplace.price <= max_price)
+    if after is not None:
+        stmt = stmt.where(tuple_(Marketplace.price, Marketplace.listing_id) > tuple_(*after))
+
+    # One extra row tells us whether a next page exists
+    stmt = stmt.order_by(Marketplace.price, Marketplace.listing_id).limit(limit + 1)
+
     with Session() as session:
-        stmt = select(Marketplace).where(Marketplace.item_id.notin_(account_bound_shard_item_ids()))
-        listings = session.execute(stmt).scalars().all()
+        rows = session.execute(stmt).all()
+
+    listings = [
+        {
+            'user_name': row.user_name,
+            'listing_id': row.listing_id,
+            'item_id': row.item_id,
+            'item_name': row.item_name,
+            'quantity': row.quantity,
+            'price': row.price,
+            'type': row.item_type,
+            'rarity': row.item_rarity,
+        }
+        for row in rows[:limit]
+    ]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = listings[-1]
+        next_cursor = (last['price'], last['listing_id'])
+
+    return listings, next_cursor
+
+
+def best_asks(item_ids=None) -> dict[int, dict]:
+    """
+    Cheapest open listing per item.
 
-        marketplace_listings = []
-        for listing in listings:
-            marketplace_listings.append({
-                'user_name': listing.user.user_name,
-                'listing_id': listing.listing_id,
-                'item_name': listing.item.item_name,
-                'quantity': listing.quantity,
-                'price': listing.price,
-                'type': listing.item.item_type,
-                'rarity': listing.item.item_rarity,
-            })
+    Args:
+        item_ids (Iterable[int] | None): Restrict to these items; all items if None.
 
-        return marketplace_listings
+    Returns:
+        dict[int, dict]: item_id -> {'listing_id', 'price', 'quantity'}
+    """
+    stmt = (
+        select(Marketplace.item_id, Marketplace.listing_id, Marketplace.price, Marketplace.quantity)
+        .distinct(Marketplace.item_id)
+        .where(Marketplace.item_id.notin_(account_bound_shard_item_ids()))
+        .order_by(Marketplace.item_id, Marketplace.price, Marketplace.listing_id)
+    )
+    if item_ids is not None:
+        stmt = stmt.where(Marketplace.item_id.in_(list(item_ids)))
+
+    with Session() as session:
+        return {
+            row.item_id: {'listing_id': row.listing_id, 'price': row.price, 'quantity': row.quantity}
+            for row in session.execute(stmt).all()
+        }
 
 
-def load_marketplace():
+def load_marketplace_page(filters: dict, after: tuple[int, int] | None = None, page_num: int = 1):
     """
-    Build and return the marketplace embed using current listings.
+    Build the marketplace embed for one page of the order book.
+
+    Args:
+        filters (dict): Keyword filters accepted by browse_listings.
+        after (tuple[int, int] | None): Cursor of the page to load.
+        page_num (int): Page number shown in the footer.
 
     Returns:
-        discord.Embed: Embed object with marketplace data.
+        tuple[discord.Embed, tuple[int, int] | None]: The embed and the next page cursor.
     """
-    listings = fill_marketplace_list()
-    return build_marketplace(listings)
+    listings, next_cursor = browse_listings(after=after, **filters)
+    return build_marketplace_page(listings, page_num, next_cursor is not None), next_cursor
@@ -4,24 +4,54 @@ from database.sessionmaker import Session
 
 from utils.embeds.notif.notificationembed import build_notification_embed
 
+import asyncio
 import json
+import logging
+import time
 from pathlib import Path
+
+import discord
 from discord.ext.commands import Bot
+from sqlalchemy import select
+
+logger = logging.getLogger(__name__)
 
 _NOTIF_CACHE = None
 
+# Workers draining the DM queue
+NOTIF_WORKERS = 4
+# Minimum spacing between DM sends across all workers (seconds)
+NOTIF_SEND_INTERVAL = 0.25
+# How long every worker backs off after Discord answers 429
+RATE_LIMIT_BACKOFF = 5.0
+MAX_SEND_ATTEMPTS = 3
+
 
 def notif_enabled(user_id: int, session):
     user = session.get(User, user_id)
     return user.notif
 
+def opted_in_users(user_ids) -> set[int]:
+    """Return the subset of user_ids with notifications enabled, in one query."""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return set()
+
+    with Session() as session:
+        rows = session.execute(
+            select(User.user_id)
+            .where(User.user_id.in_(user_ids))
+            .where(User.notif.is_(True))
+        ).scalars().all()
+    return set(rows)
+
 def disable_notif(user_id: int):
     with Session() as session:
         user = session.get(User, user_id)
         user.notif = False
         session.commit()
 
-async def send_notification(bot: Bot, user_id: int, notif_key: str, session):
+def _load_notif(notif_key: str):
     global _NOTIF_CACHE
 
     if _NOTIF_CACHE is None:
@@ -29,24 +59,104 @@ async def send_notification(bot: Bot, user_id: int, notif_key: str, session):
         with open(notif_path, "r", encoding="utf-8") as f:
             _NOTIF_CACHE = json.load(f)
 
-    notif_data = _NOTIF_CACHE
-
-    if notif_key not in notif_data:
-        return
-
-    data = notif_data[notif_key]
-
-    embed, view = build_notification_embed(data)
-
-    user = await bot.fetch_user(user_id)
-    if not user:
-        return
-
-    if not notif_enabled(user_id, session):
-        return
-
-    try:
-        await user.send(embed=embed, view=view)
-    except Exception:
-        # User has DMs closed or blocked the bot
-        return
+    return _NOTIF_CACHE.get(notif_key)
+
+
+class NotificationDispatcher:
+    """
+    Queue of notification DMs drained by a small worker pool.
+
+    Opted-out users are filtered with one query before anything is queued, and
+    no DB session is held while sending. Sends are spaced out globally and a
+    429 pauses every worker, so a burst of notifications does not trip
+    Discord's DM rate limits.
+    """
+
+    def __init__(self, workers: int = NOTIF_WORKERS, send_interval: float = NOTIF_SEND_INTERVAL):
+        self.workers = workers
+        self.send_interval = send_interval
+        self._queue = None
+        self._tasks = []
+        self._next_send_at = 0.0
+        self._paused_until = 0.0
+        self._pace_lock = None
+        self.sent = 0
+        self.dropped = 0
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._pace_lock = asyncio.Lock()
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.get_running_loop().create_task(self._worker()))
+
+    async def enqueue(self, bot: Bot, user_ids, notif_key: str) -> int:
+        """Queue notif_key for every opted-in user. Returns how many were queued."""
+        if _load_notif(notif_key) is None:
+            return 0
+
+        user_ids = list(user_ids)
+        enabled = await asyncio.to_thread(opted_in_users, user_ids)
+        self.dropped += len(user_ids) - len(enabled)
+
+        self._ensure_workers()
+        for user_id in user_ids:
+            if user_id in enabled:
+                self._queue.put_nowait((bot, user_id, notif_key, 1))
+        return len(enabled)
+
+    async def join(self):
+        """Wait until everything queued so far has been sent or dropped."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _pace(self):
+        async with self._pace_lock:
+            now = time.monotonic()
+            wait = max(self._next_send_at, self._paused_until) - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = time.monotonic()
+            self._next_send_at = now + self.send_interval
+
+    async def _worker(self):
+        while True:
+            bot, user_id, notif_key, attempt = await self._queue.get()
+            try:
+                await self._deliver(bot, user_id, notif_key, attempt)
+            except Exception as e:
+                logger.error("Notification %s to %s failed: %s", notif_key, user_id, e)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, bot: Bot, user_id: int, notif_key: str, attempt: int):
+        await self._pace()
+
+        try:
+            # Cache hit avoids the REST round trip
+            user = bot.get_user(user_id) or await bot.fetch_user(user_id)
+            embed, view = build_notification_embed(_load_notif(notif_key))
+            await user.send(embed=embed, view=view)
+            self.sent += 1
+        except discord.Forbidden:
+            # User has DMs closed or blocked the bot
+            self.dropped += 1
+        except discord.HTTPException as e:
+            if e.status != 429 or attempt >= MAX_SEND_ATTEMPTS:
+                self.dropped += 1
+                return
+            self._paused_until = time.monotonic() + RATE_LIMIT_BACKOFF
+            self._queue.put_nowait((bot, user_id, notif_key, attempt + 1))
+
+
+notifier = NotificationDispatcher()
+
+
+async def send_notifications(bot: Bot, user_ids, notif_key: str) -> int:
+    """Queue a notification DM for each opted-in user. Returns how many were queued."""
+    return await notifier.enqueue(bot, user_ids, notif_key)
+
+
+async def send_notification(bot: Bot, user_id: int, notif_key: str) -> int:
+    return await send_notifications(bot, [user_id], notif_key)
@@ -0,0 +1,112 @@
+"""Per-command request context.
+
+The first time anything in a command asks about the invoking user, their
+``User`` row is loaded together with the wallet and upgrades in one query and
+kept on ``ctx``. The global checks and the command body then read from that
+snapshot instead of each opening a session for the same row.
+"""
+
+import asyncio
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from database.sessionmaker import Session
+from models.users_model import User
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    user_id: int
+    user_name: str
+    level: int
+    exp: int
+    tutorial_state: int
+    campaign_stage: int
+    notif: bool
+    gold: int
+    upgrades: dict[str, int] = field(default_factory=dict)
+
+
+def load_user_snapshot(user_id: int) -> UserSnapshot | None:
+    """Load the user with wallet and upgrades in a single round trip."""
+    with Session() as session:
+        user = session.execute(
+            select(User)
+            .options(joinedload(User.wallet), joinedload(User.upgrades))
+            .where(User.user_id == user_id)
+        ).unique().scalar_one_or_none()
+
+        if user is None:
+            return None
+
+        return UserSnapshot(
+            user_id=user.user_id,
+            user_name=user.user_name,
+            level=user.level,
+            exp=user.exp,
+            tutorial_state=user.tutorial_state,
+            campaign_stage=user.campaign_stage,
+            notif=user.notif,
+            gold=user.wallet.gold if user.wallet else 0,
+            upgrades={upgrade.upgrade_name: upgrade.level for upgrade in user.upgrades},
+        )
+
+
+class RequestContext:
+    """Lazily loaded view of the invoking user, scoped to one command."""
+
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self._snapshot = None
+        self._loaded = False
+
+    @property
+    def user(self) -> UserSnapshot | None:
+        if not self._loaded:
+            self._snapshot = load_user_snapshot(self.user_id)
+            self._loaded = True
+        return self._snapshot
+
+    async def load(self) -> UserSnapshot | None:
+        """Load the snapshot in a worker thread, so async callers never query on the loop."""
+        if not self._loaded:
+            self._snapshot = await asyncio.to_thread(load_user_snapshot, self.user_id)
+            self._loaded = True
+        return self._snapshot
+
+    @property
+    def is_registered(self) -> bool:
+        return self.user is not None
+
+    @property
+    def tutorial_state(self):
+        from services.tutorial_services import TutorialState, _coerce_tutorial_state
+
+        if self.user is None:
+            return TutorialState.NOT_STARTED
+        return _coerce_tutorial_state(self.user.tutorial_state)
+
+    @property
+    def gold(self) -> int:
+        return self.user.gold if self.user else 0
+
+    def upgrade_level(self, upgrade_name: str) -> int:
+        if self.user is None:
+            return 0
+        return self.user.upgrades.get(upgrade_name, 0)
+
+    def invalidate(self) -> None:
+        """Forget the snapshot after the command mutates the user."""
+        self._snapshot = None
+        self._loaded = False
+
+
+def get_request_context(ctx) -> RequestContext:
+    """Return the context attached to ``ctx``, creating it on first use."""
+    context = getattr(ctx, "request_context", None)
+    if context is None or context.user_id != ctx.author.id:
+        context = RequestContext(ctx.author.id)
+        ctx.request_context = context
+    return context
@@ -0,0 +1,161 @@
+"""Per-user deadlines: energy full, loan due, effect expiry, battle queue expiry.
+
+Services that know when something will happen register it here instead of a
+job scanning tables for it. Rows in ``scheduled_events`` are the source of
+truth and survive restarts; an in-process timer wheel holds the same deadlines
+so the per-second tick only touches events that are actually due.
+
+The wheel is armed before the caller commits. A due event is claimed by
+deleting its row, so a registration that was rolled back or moved later
+simply fails the claim and is dropped or re-armed.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from database.sessionmaker import Session
+
+from models.users_model import ScheduledEvent
+
+from utils.timer_wheel import TimerWheel
+
+logger = logging.getLogger(__name__)
+
+ENERGY_FULL_EVENT = "ENERGY_FULL"
+LOAN_DUE_EVENT = "LOAN_DUE"
+EFFECT_EXPIRED_EVENT = "EFFECT_EXPIRED"
+BATTLE_QUEUE_EXPIRED_EVENT = "BATTLE_QUEUE_EXPIRED"
+
+# Retry delay for events whose claim failed on a database error
+CLAIM_RETRY = timedelta(minutes=1)
+
+_handlers = {}
+_wheel_lock = threading.Lock()
+_wheel = TimerWheel(tick_seconds=1.0, now=datetime.now(timezone.utc).timestamp())
+
+
+def _naive_utc(when: datetime) -> datetime:
+    if when.tzinfo is not None:
+        return when.astimezone(timezone.utc).replace(tzinfo=None)
+    return when
+
+
+def _epoch(when: datetime) -> float:
+    return _naive_utc(when).replace(tzinfo=timezone.utc).timestamp()
+
+
+def _arm(event_type: str, user_id: int, due_at: datetime) -> None:
+    with _wheel_lock:
+        _wheel.schedule((event_type, user_id), _epoch(due_at))
+
+
+def _disarm(event_type: str, user_id: int) -> None:
+    with _wheel_lock:
+        _wheel.cancel((event_type, user_id))
+
+
+def register_event_handler(event_type: str, handler) -> None:
+    """Route due events of ``event_type`` to ``await handler(bot, user_ids)``."""
+    _handlers[event_type] = handler
+
+
+def schedule_event(session, event_type: str, user_id: int, due_at: datetime) -> None:
+    """Register or move a user's deadline. The caller owns the commit."""
+    due_at = _naive_utc(due_at)
+    stmt = insert(ScheduledEvent).values(event_type=event_type, user_id=user_id, due_at=due_at)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ScheduledEvent.event_type, ScheduledEvent.user_id],
+            set_={"due_at": due_at},
+        )
+    )
+    _arm(event_type, user_id, due_at)
+
+
+def cancel_event(session, event_type: str, user_id: int) -> None:
+    """Drop a user's pending deadline. The caller owns the commit."""
+    session.execute(
+        delete(ScheduledEvent)
+        .where(ScheduledEvent.event_type == event_type)
+        .where(ScheduledEvent.user_id == user_id)
+    )
+    _disarm(event_type, user_id)
+
+
+def load_scheduled_events() -> int:
+    """Arm the wheel from the table. Called at startup; overdue rows fire on the next tick."""
+    with Session() as session:
+        rows = session.execute(
+            select(ScheduledEvent.event_type, ScheduledEvent.user_id, ScheduledEvent.due_at)
+        ).all()
+
+    for event_type, user_id, due_at in rows:
+        _arm(event_type, user_id, due_at)
+    return len(rows)
+
+
+def _claim_due(keys, now: datetime):
+    """Delete the due rows for ``keys`` and return {event_type: [user_id]} of the ones claimed."""
+    key_column = tuple_(ScheduledEvent.event_type, ScheduledEvent.user_id)
+
+    with Session() as session:
+        claimed = session.execute(
+            delete(ScheduledEvent)
+            .where(key_column.in_(keys))
+            .where(ScheduledEvent.due_at <= now)
+            .returning(ScheduledEvent.event_type, ScheduledEvent.user_id)
+        ).all()
+        session.commit()
+
+        # Rows that were moved later since they were armed go back on the wheel
+        unclaimed = set(keys) - {tuple(row) for row in claimed}
+        if unclaimed:
+            rows = session.execute(
+                select(ScheduledEvent.event_type, ScheduledEvent.user_id, ScheduledEvent.due_at)
+                .where(key_column.in_(unclaimed))
+            ).all()
+            for event_type, user_id, due_at in rows:
+                _arm(event_type, user_id, due_at)
+
+    due = defaultdict(list)
+    for event_type, user_id in claimed:
+        due[event_type].append(user_id)
+    return due
+
+
+async def run_due_events(bot) -> int:
+    """Advance the wheel and dispatch every event that came due. Runs every second."""
+    now = datetime.utcnow()
+    with _wheel_lock:
+        fired = _wheel.advance(_epoch(now))
+    if not fired:
+        return 0
+
+    keys = [key for key, _ in fired]
+    try:
+        # DELETE ... RETURNING plus the re-arm query; keep both off the loop
+        due = await asyncio.to_thread(_claim_due, keys, now)
+    except Exception as e:
+        logger.error("Failed to claim %s scheduled events: %s", len(keys), e)
+        for event_type, user_id in keys:
+            _arm(event_type, user_id, now + CLAIM_RETRY)
+        return 0
+
+    dispatched = 0
+    for event_type, user_ids in due.items():
+        handler = _handlers.get(event_type)
+        if handler is None:
+            logger.warning("No handler registered for scheduled event %s", event_type)
+            continue
+        try:
+            await handler(bot, user_ids)
+            dispatched += len(user_ids)
+        except Exception as e:
+            logger.error("Scheduled event %s handler failed: %s", event_type, e)
+    return dispatched
@@ -1,12 +1,10 @@
 import logging
 import random
-from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import insert
 from datetime import date
 from datetime import timedelta
 
 from database.sessionmaker import Session
-from models.inventory_model import Items
 from models.marketplace_model import ShopDaily
 
 from utils.embeds.shopembed import get_shop_view_and_embed
@@ -16,6 +14,7 @@ from utils.custom_errors import VeyraError
 
 from services.inventory_services import give_item, take_item, fetch_inventory
 from services.economy_services import remove_gold, add_gold, check_wallet, add_chip, remove_chips
+from services.item_catalog_services import get_item_catalog
 
 from domain.casino.rules import CONVERSION_RATES, CHIP_OFFERS
 from domain.battle.gear_shards import shard_item_ids
@@ -71,15 +70,12 @@ def update_daily_shop():
         if existing > 0:
             return
 
-        random_items = (
-            session.query(Items)
-            .where(Items.item_type == "item")
-            .where(Items.item_rarity.in_(("Common", "Rare", "Epic")))
-            .where(Items.item_name.notin_(EXCLUDED_ITEMS))
-            .where(Items.item_id.notin_(shard_item_ids()))
-            .order_by(func.random())
-            .limit(6)
-            .all()
+        random_items = get_item_catalog().sample(
+            ("Common", "Rare", "Epic"),
+            ("item",),
+            k=6,
+            exclude_names=EXCLUDED_ITEMS,
+            droppable_only=False,
         )
 
         for item in random_items:
@@ -110,23 +106,20 @@ def update_daily_buyback_shop():
         if existing > 0:
             return
 
-        sell_ids_subq = (
-            session.query(ShopDaily.item_id)
-            .where(
+        sell_ids = [
+            item_id
+            for (item_id,) in session.query(ShopDaily.item_id).where(
                 ShopDaily.date == today(),
                 ShopDaily.shop_type == "sell"
             )
-        )
+        ]
 
-        random_items = (
-            session.query(Items)
-            .where(Items.item_type == "item")
-            .where(Items.item_rarity.in_(("Common", "Rare", "Epic", "Legendary")))
-            .where(Items.item_id.notin_(sell_ids_subq))
-            .where(Items.item_id.notin_(shard_item_ids()))
-            .order_by(func.random())
-            .limit(5)
-            .all()
+        random_items = get_item_catalog().sample(
+            ("Common", "Rare", "Epic", "Legendary"),
+            ("item",),
+            k=5,
+            exclude_ids=sell_ids,
+            droppable_only=False,
         )
 
         for idx, item in enumerate(random_items):
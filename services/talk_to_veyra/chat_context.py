@@ -0,0 +1,107 @@
+"""Rolling per-channel chat context for talk-to-Veyra.
+
+Messages in chat channels are recorded as they arrive (and patched on edit or
+delete), so building the context for a reply is a dictionary read instead of
+a ``channel.history`` REST fetch. History is only read once per channel, to
+backfill a cold buffer after a restart.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+# Messages kept per channel; enough to still find `limit` entries after skipping extra bot replies
+CONTEXT_BUFFER_SIZE = 80
+MAX_BOT_REPLIES = 2
+
+
+class ChatContextBuffer:
+    def __init__(self, size: int = CONTEXT_BUFFER_SIZE):
+        self.size = size
+        # channel_id -> message_id -> entry, oldest first
+        self._channels: dict[int, OrderedDict[int, dict]] = {}
+        self._warm: set[int] = set()
+
+    def _entry(self, msg, bot_id: int | None) -> dict | None:
+        content = msg.content.strip()
+        if not content:
+            return None
+
+        is_self_bot = bool(msg.author.bot and (bot_id is None or msg.author.id == bot_id))
+        if msg.author.bot and not is_self_bot:
+            return None
+
+        return {
+            "author": msg.author.display_name,
+            "role": "assistant" if is_self_bot else "user",
+            "content": content,
+        }
+
+    def record(self, msg, bot_id: int | None = None) -> None:
+        entry = self._entry(msg, bot_id)
+        if entry is None:
+            return
+
+        buffer = self._channels.setdefault(msg.channel.id, OrderedDict())
+        # Snowflakes grow with time, so arrival order is almost always id order
+        out_of_order = bool(buffer) and msg.id not in buffer and msg.id < next(reversed(buffer))
+        buffer[msg.id] = entry
+        if out_of_order:
+            buffer = self._channels[msg.channel.id] = OrderedDict(sorted(buffer.items()))
+        while len(buffer) > self.size:
+            buffer.popitem(last=False)
+
+    def edit(self, channel_id: int, message_id: int, content: str) -> None:
+        buffer = self._channels.get(channel_id)
+        if buffer is None or message_id not in buffer:
+            return
+
+        content = content.strip()
+        if content:
+            buffer[message_id]["content"] = content
+        else:
+            del buffer[message_id]
+
+    def delete(self, channel_id: int, message_ids) -> None:
+        buffer = self._channels.get(channel_id)
+        if buffer is None:
+            return
+        for message_id in message_ids:
+            buffer.pop(message_id, None)
+
+    def is_warm(self, channel_id: int) -> bool:
+        return channel_id in self._warm
+
+    async def backfill(self, channel, bot_id: int | None = None) -> None:
+        """Seed a cold buffer from channel history, keeping anything recorded meanwhile."""
+        recorded = self._channels.get(channel.id, OrderedDict())
+        merged = dict(recorded)
+        async for msg in channel.history(limit=self.size):
+            if msg.id not in merged:
+                entry = self._entry(msg, bot_id)
+                if entry is not None:
+                    merged[msg.id] = entry
+
+        newest = sorted(merged.items())[-self.size:]
+        self._channels[channel.id] = OrderedDict(newest)
+        self._warm.add(channel.id)
+
+    def recent(self, channel_id: int, limit: int = 10) -> list[dict]:
+        """The last `limit` entries, oldest first, with at most MAX_BOT_REPLIES of Veyra's own."""
+        messages = []
+        bot_reply_count = 0
+
+        for entry in reversed(self._channels.get(channel_id, OrderedDict()).values()):
+            if entry["role"] == "assistant":
+                if bot_reply_count >= MAX_BOT_REPLIES:
+                    continue
+                bot_reply_count += 1
+
+            messages.append(dict(entry))
+            if len(messages) >= limit:
+                break
+
+        return list(reversed(messages))
+
+
+chat_context = ChatContextBuffer()
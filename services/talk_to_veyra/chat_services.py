@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import codecs
+import json
+import logging
 import os
+import time
+from collections import deque
+from contextlib import aclosing, asynccontextmanager
+from dataclasses import dataclass, field
 from typing import Any
 
 import aiohttp
@@ -8,15 +15,122 @@ import asyncio
 import discord
 from dotenv import load_dotenv
 
+from services.talk_to_veyra.chat_context import chat_context
+
 load_dotenv("veyra.env")
 
+logger = logging.getLogger(__name__)
+
+
+# Requests posted to the model at once; the rest wait their turn
+MAX_IN_FLIGHT = 4
+# Waiting requests beyond this are refused instead of holding a typing indicator for a minute
+MAX_QUEUED = 16
+# Consecutive failures that open the breaker, and how long it stays open before a trial request
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_SECONDS = 30.0
+# Streamed replies are edited at most this often, well inside Discord's edit rate limit
+STREAM_EDIT_INTERVAL = 1.0
+DISCORD_MESSAGE_LIMIT = 2000
+
 
 class ConversationServiceError(RuntimeError):
     """Raised when the external conversation service cannot be reached cleanly."""
 
 
+class ConversationUnavailableError(ConversationServiceError):
+    """Raised without calling the service, because the breaker is open or the queue is full."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after `threshold` consecutive failures.
+
+    While open, one trial request is let through every `reset_after` seconds;
+    a success closes the breaker, a failure keeps it open for another window.
+    """
+
+    def __init__(self, threshold: int = BREAKER_FAILURE_THRESHOLD, reset_after: float = BREAKER_RESET_SECONDS, clock=time.monotonic):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.clock() - self.opened_at >= self.reset_after:
+            self.opened_at = self.clock()  # one trial per window
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = self.clock()
+
+
+@dataclass
+class ConversationMetrics:
+    requests: int = 0
+    failures: int = 0
+    rejected: int = 0
+    dropped: int = 0
+    in_flight: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=200))
+    first_token_latencies: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def latency_percentile(self, pct: float, samples=None) -> float | None:
+        samples = self.latencies if samples is None else samples
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "latency_p50": self.latency_percentile(50),
+            "latency_p95": self.latency_percentile(95),
+            "first_token_p50": self.latency_percentile(50, self.first_token_latencies),
+        }
+
+
 class ConversationService:
-    def __init__(self, endpoint: str | None = None):
+    """
+    Client for the conversation model.
+
+    At most `max_in_flight` requests are posted at once and at most
+    `max_queued` wait behind them. A user with a reply already on the way has
+    further mentions dropped, and the circuit breaker refuses requests for a
+    while after repeated errors or timeouts, so a slow model server costs a
+    quick "not now" instead of a pile of minute-long requests.
+    """
+
+    def __init__(
+        self,
+        endpoint: str | None = None,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        max_queued: int = MAX_QUEUED,
+        breaker: CircuitBreaker | None = None,
+    ):
         self.endpoint = endpoint or os.getenv("CONVO_MODEL_URL", "http://127.0.0.1:8000/chat")
         self.api_key = os.getenv("CONVO_MODEL_API_KEY")
         if not self.api_key:
@@ -27,6 +141,12 @@ class ConversationService:
         self._session: aiohttp.ClientSession | None = None
         self._timeout = aiohttp.ClientTimeout(total=60, connect=5, sock_connect=5, sock_read=25)
 
+        self.max_queued = max_queued
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._inflight_keys: set = set()
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = ConversationMetrics()
+
     async def start(self) -> None:
         if self._session is None or self._session.closed:
             self._session = aiohttp.ClientSession(timeout=self._timeout)
@@ -46,7 +166,7 @@ class ConversationService:
         except (aiohttp.ClientError, asyncio.TimeoutError):
             return False
 
-    async def get_reply(self, payload: dict[str, Any]):
+    async def _post(self, payload: dict[str, Any]):
         await self.start()
         assert self._session is not None
 
@@ -65,6 +185,168 @@ class ConversationService:
         except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
             raise ConversationServiceError(f"Conversation service request failed: {exc}") from exc
 
+    def _admit(self, key) -> bool:
+        """Apply single-flight, queue bound and breaker. False means drop as a repeat."""
+        metrics = self.metrics
+        if key is not None and key in self._inflight_keys:
+            metrics.dropped += 1
+            return False
+
+        if self._slots.locked() and metrics.queued >= self.max_queued:
+            metrics.rejected += 1
+            raise ConversationUnavailableError("Conversation service queue is full")
+
+        if not self.breaker.allow():
+            metrics.rejected += 1
+            raise ConversationUnavailableError("Conversation service is failing; circuit open")
+
+        if key is not None:
+            self._inflight_keys.add(key)
+        metrics.requests += 1
+        return True
+
+    @asynccontextmanager
+    async def _request_slot(self, key):
+        """Wait for a free slot, then account the request's outcome to metrics and the breaker."""
+        metrics = self.metrics
+        metrics.queued += 1
+        metrics.max_queued = max(metrics.max_queued, metrics.queued)
+        waiting = True
+
+        try:
+            async with self._slots:
+                metrics.queued -= 1
+                waiting = False
+                metrics.in_flight += 1
+                started = time.monotonic()
+                try:
+                    yield
+                except ConversationServiceError:
+                    metrics.failures += 1
+                    self.breaker.record_failure()
+                    if self.breaker.is_open:
+                        logger.warning("Conversation breaker open after %s failures: %s", self.breaker.failures, metrics.snapshot())
+                    raise
+                finally:
+                    metrics.in_flight -= 1
+
+                metrics.latencies.append(time.monotonic() - started)
+                self.breaker.record_success()
+        finally:
+            if waiting:
+                metrics.queued -= 1
+            if key is not None:
+                self._inflight_keys.discard(key)
+
+    async def get_reply(self, payload: dict[str, Any], key=None):
+        """
+        Post a chat payload and return the decoded reply.
+
+        Args:
+            payload (dict): Request body for the model.
+            key: Single-flight key (the user id); while a request with the
+                same key is pending, new ones are dropped.
+
+        Returns:
+            The model's JSON reply, or None if the request was dropped as a repeat.
+
+        Raises:
+            ConversationUnavailableError: If the breaker is open or the queue is full.
+            ConversationServiceError: If the request itself fails.
+        """
+        if not self._admit(key):
+            return None
+
+        async with self._request_slot(key):
+            return await self._post(payload)
+
+    async def _post_stream(self, payload: dict[str, Any]):
+        await self.start()
+        assert self._session is not None
+
+        try:
+            async with self._session.post(
+                self.endpoint,
+                json=payload,
+                headers={"api-key": self.api_key, "Accept": "text/event-stream, application/json"},
+            ) as resp:
+                if resp.status != 200:
+                    detail = (await resp.text()).strip()
+                    raise ConversationServiceError(
+                        f"Conversation service returned HTTP {resp.status}: {detail or 'no response body'}"
+                    )
+
+                if resp.content_type == "text/event-stream":
+                    async for chunk in _iter_sse(resp.content):
+                        yield chunk
+                elif resp.content_type == "application/json":
+                    # Server does not stream: the whole reply is one chunk
+                    reply = await resp.json()
+                    if isinstance(reply, str):
+                        yield reply
+                else:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                    async for data in resp.content.iter_any():
+                        yield decoder.decode(data)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise ConversationServiceError(f"Conversation service request failed: {exc}") from exc
+
+    async def stream_reply(self, payload: dict[str, Any], key=None):
+        """
+        Like get_reply, but yield the reply text as the model produces it.
+
+        Reads server-sent events or a chunked text body; a plain JSON reply
+        comes through as a single chunk. Yields nothing if dropped as a repeat.
+        """
+        if not self._admit(key):
+            return
+
+        async with self._request_slot(key):
+            started = time.monotonic()
+            first = True
+            async for chunk in self._post_stream(payload):
+                if not chunk:
+                    continue
+                if first:
+                    self.metrics.first_token_latencies.append(time.monotonic() - started)
+                    first = False
+                yield chunk
+
+
+def _sse_chunk(data: str) -> str:
+    """Text of one SSE event: a JSON string, a JSON object with the text under a usual key, or raw text."""
+    try:
+        decoded = json.loads(data)
+    except ValueError:
+        return data
+    if isinstance(decoded, str):
+        return decoded
+    if isinstance(decoded, dict):
+        for field_name in ("delta", "content", "text", "reply"):
+            if isinstance(decoded.get(field_name), str):
+                return decoded[field_name]
+    return ""
+
+
+async def _iter_sse(stream):
+    data_lines = []
+    async for raw_line in stream:
+        line = raw_line.decode("utf-8", errors="replace").rstrip("\r\n")
+        if line.startswith("data:"):
+            data_lines.append(line[5:].removeprefix(" "))
+            continue
+        if line or not data_lines:
+            continue  # other fields and comments
+
+        data = "\n".join(data_lines)
+        data_lines = []
+        if data == "[DONE]":
+            return
+        yield _sse_chunk(data)
+
+    if data_lines and "\n".join(data_lines) != "[DONE]":
+        yield _sse_chunk("\n".join(data_lines))
+
 
 brain = ConversationService()
 
@@ -76,7 +358,7 @@ async def handle_user_message(message: str, user: dict, message_history: list):
         "message_history": message_history,
     }
 
-    reply = await brain.get_reply(payload)
+    reply = await brain.get_reply(payload, key=user.get("user_id"))
     if not isinstance(reply, str):
         return None
 
@@ -84,37 +366,73 @@ async def handle_user_message(message: str, user: dict, message_history: list):
     return reply if reply else None
 
 
-async def fetch_channel_msgs(channel: discord.TextChannel, limit: int = 10, bot_id: int | None = None):
-    """Fetch recent structured chat context with explicit user/assistant roles."""
-    messages = []
-    bot_reply_count = 0
+async def stream_user_message(message: str, user: dict, message_history: list, send, clock=time.monotonic):
+    """
+    Stream a reply into Discord.
 
-    async for msg in channel.history(limit=80):
-        content = msg.content.strip()
-        if not content:
-            continue
+    `send(text)` posts the first non-empty text and returns the message; the
+    rest is applied with `edit` at most every STREAM_EDIT_INTERVAL seconds,
+    plus a final edit with the full text. If the stream breaks after
+    something was posted, the partial reply stays and the error is logged.
+    If Discord refuses a send or edit (say the message was deleted), the
+    stream is closed early so its request slot is released.
 
-        is_self_bot = bool(msg.author.bot and (bot_id is None or msg.author.id == bot_id))
-        if msg.author.bot and not is_self_bot:
-            continue
+    Returns:
+        str | None: the final reply text, or None if nothing was posted.
+
+    Raises:
+        ConversationServiceError: If the request fails before any text arrives.
+    """
+    payload = {
+        "message": message,
+        "user": user,
+        "message_history": message_history,
+    }
+
+    sent = None
+    text = ""
+    shown = ""
+    last_edit = 0.0
+
+    try:
+        async with aclosing(brain.stream_reply(payload, key=user.get("user_id"))) as stream:
+            async for chunk in stream:
+                text += chunk
+                visible = text.strip()[:DISCORD_MESSAGE_LIMIT]
+                if not visible or visible == shown:
+                    continue
+                if sent is None:
+                    sent = await send(visible)
+                elif clock() - last_edit >= STREAM_EDIT_INTERVAL:
+                    await sent.edit(content=visible)
+                else:
+                    continue
+                shown = visible
+                last_edit = clock()
+    except ConversationServiceError as exc:
+        if sent is None:
+            raise
+        logger.error("talk-to-Veyra stream broke off: %s", exc)
+    except discord.HTTPException as exc:
+        logger.warning("talk-to-Veyra reply could not be posted or edited: %s", exc)
+        return shown if sent is not None else None
+
+    final = text.strip()[:DISCORD_MESSAGE_LIMIT]
+    if sent is not None and final and final != shown:
+        try:
+            await sent.edit(content=final)
+        except discord.HTTPException as exc:
+            logger.warning("talk-to-Veyra final edit failed: %s", exc)
+            return shown
+    return final if sent is not None else None
+
+
+async def fetch_channel_msgs(channel: discord.TextChannel, limit: int = 10, bot_id: int | None = None):
+    """Recent structured chat context with explicit user/assistant roles.
 
-        if is_self_bot:
-            if bot_reply_count >= 2:
-                continue
-            bot_reply_count += 1
-            role = "assistant"
-        else:
-            role = "user"
-
-        messages.append(
-            {
-                "author": msg.author.display_name,
-                "role": role,
-                "content": content,
-            }
-        )
-
-        if len(messages) >= limit:
-            break
-
-    return list(reversed(messages))
\ No newline at end of file
+    Served from the rolling channel buffer; history is only fetched to warm a
+    channel the first time it is asked for after a restart.
+    """
+    if not chat_context.is_warm(channel.id):
+        await chat_context.backfill(channel, bot_id=bot_id)
+    return chat_context.recent(channel.id, limit)
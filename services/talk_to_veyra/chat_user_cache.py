@@ -0,0 +1,61 @@
+"""Short-lived snapshots of talk-to-Veyra user payloads.
+
+Building a chat user takes a query with three joinedloads plus the recent game
+events, so the payload is kept for ``CHAT_USER_TTL_SECONDS`` and back-to-back
+chat turns are served from memory. Game event, wallet and loadout writers drop
+it early through ``invalidate_chat_user``.
+
+Writers usually call it inside a transaction. The snapshot is dropped at once
+and again when that session commits, so a chat turn that reloads between the
+write and its commit does not keep the old values.
+"""
+
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as OrmSession
+
+CHAT_USER_TTL_SECONDS = 30
+
+_PENDING_KEY = "chat_user_invalidations"
+
+# user_id -> (expires_at, payload)
+_snapshots: dict[int, tuple[float, dict]] = {}
+
+
+def get_chat_user(user_id: int) -> dict | None:
+    cached = _snapshots.get(user_id)
+    if cached is None:
+        return None
+
+    expires_at, payload = cached
+    if time.monotonic() >= expires_at:
+        _snapshots.pop(user_id, None)
+        return None
+    return dict(payload)
+
+
+def store_chat_user(user_id: int, payload: dict) -> None:
+    _snapshots[user_id] = (time.monotonic() + CHAT_USER_TTL_SECONDS, dict(payload))
+
+
+def invalidate_chat_user(user_id: int, session=None) -> None:
+    """Drop a user's snapshot now and, if `session` is given, again once it commits."""
+    _snapshots.pop(user_id, None)
+    if getattr(session, "info", None) is not None:
+        session.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+def clear_chat_users() -> None:
+    _snapshots.clear()
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _drop_committed(session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        _snapshots.pop(user_id, None)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop(_PENDING_KEY, None)
@@ -4,12 +4,18 @@ from sqlalchemy.orm import joinedload
 
 from database.sessionmaker import Session
 from domain.friendship.rules import friendship_title_and_progress
+from services.energy_services import current_energy
 from services.game_events_services import get_recent_game_events
+from services.talk_to_veyra.chat_user_cache import get_chat_user, store_chat_user
 from models.users_model import User
 
 
 def build_chat_user(user_id: int, user_name: str) -> dict:
-    """Build conversation-model user payload from Veyra DB state."""
+    """Build conversation-model user payload from Veyra DB state, cached briefly per user."""
+    cached = get_chat_user(user_id)
+    if cached is not None:
+        return cached
+
     with Session() as session:
         user = session.get(
             User,
@@ -20,6 +26,8 @@ def build_chat_user(user_id: int, user_name: str) -> dict:
                 joinedload(User.battle_loadout),
             ],
         )
+        energy = current_energy(session, user) if user is not None else 0
+        recent_events = get_recent_game_events(user_id, limit=10, session=session) if user is not None else []
 
     # Fallback for users that are not yet registered in Veyra DB.
     if user is None:
@@ -45,15 +53,13 @@ def build_chat_user(user_id: int, user_name: str) -> dict:
     if user.battle_loadout and (user.battle_loadout.weapon or user.battle_loadout.spell):
         loadout = f"{user.battle_loadout.weapon}/{user.battle_loadout.spell}"
 
-    recent_events = get_recent_game_events(user.user_id, limit=10)
-
-    return {
+    payload = {
         "user_id": user.user_id,
         "name": user.user_name,
         "frndship_title": frndship_title,
         "gold": user.wallet.gold if user.wallet else 0,
         "chips": user.wallet.chip if user.wallet else 0,
-        "current_energy": user.energy or 0,
+        "current_energy": energy,
         "exp": user.exp or 0,
         "lvl": user.level or 1,
         "game_events": recent_events,
@@ -61,3 +67,5 @@ def build_chat_user(user_id: int, user_name: str) -> dict:
         "current_quest": None,
         "loadout": loadout,
     }
+    store_chat_user(user_id, payload)
+    return payload
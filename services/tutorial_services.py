@@ -51,8 +51,9 @@ async def tutorial_completed(user_id: int):
         return _coerce_tutorial_state(user.tutorial_state) == TutorialState.COMPLETED
 
 
-async def tutorial_guard(ctx, command_name, args):
-    state = await get_tutorial_state(ctx.author.id)
+async def tutorial_guard(ctx, command_name, args, state=None):
+    if state is None:
+        state = await get_tutorial_state(ctx.author.id)
 
     if state == TutorialState.COMPLETED:
         return False
@@ -82,7 +83,18 @@ async def get_tutorial_state(user_id: int) -> TutorialState:
 
 
 async def advance(user_id: int, state: TutorialState):
+    set_tutorial_state(user_id, state)
+
+
+def set_tutorial_state(user_id: int, state: TutorialState, session=None):
+    """Persist the user's tutorial state. With a session, the caller owns the commit."""
     Session, User = _session_and_user_model()
+    if session is not None:
+        user = session.get(User, user_id)
+        if user:
+            user.tutorial_state = int(state)
+        return
+
     with Session() as session:
         user = session.get(User, user_id)
         if not user:
@@ -3,6 +3,7 @@ from database.sessionmaker import Session
 from models.users_model import Upgrades, UpgradeDefinitions
 
 from services.economy_services import remove_gold, check_wallet
+from services.inventory_services import reset_slots_used
 
 
 
@@ -33,6 +34,9 @@ def upgrade_building(user_id: int, building_name: str):
         remove_gold(user_id, upgrade_def.cost)
 
         user_upgrade.level = next_level
+        if building_name == "pockets":
+            # Stack sizes changed, so the materialized slot count is stale
+            reset_slots_used(user_id, session)
         session.commit()
         return f"Congratulations {building_name} has been upgraded to {next_level}"
 
@@ -7,7 +7,7 @@ statistics in the database.
 import logging
 from datetime import datetime
 
-from sqlalchemy import func, update
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import joinedload, selectinload
 
 from database.sessionmaker import Session
@@ -15,10 +15,20 @@ from models.inventory_model import Inventory
 from models.users_model import User, UserStats, Wallet, Upgrades
 
 from domain.friendship.rules import friendship_title_and_progress
+from domain.progression.rules import energy_full_at
 from services.battle.gear_shard_services import grant_starter_weapon_shard
+from services.energy_services import current_energy
+from services.scheduled_events_services import ENERGY_FULL_EVENT, schedule_event
 
 logger = logging.getLogger(__name__)
 
+# Process-wide registered-user membership so is_user() on the command/message
+# hot path is a set lookup instead of a DB round trip.
+_registered_user_ids: set[int] = set()
+# Users registered while a refresh snapshot is being taken.
+_recent_registrations: set[int] = set()
+_registered_cache_warm = False
+
 
 def ensure_user_stats(session, user_id: int) -> None:
     """Ensure a UserStats row exists for the given user.
@@ -47,7 +57,15 @@ def add_user(user_id: int, user_name: str):
         True if created successfully, False otherwise.
     """
     with Session() as session:
-        new_user = User(user_id=user_id, user_name=user_name, joined=datetime.utcnow())
+        now = datetime.utcnow()
+        new_user = User(
+            user_id=user_id,
+            user_name=user_name,
+            joined=now,
+            energy=0,
+            energy_updated_at=now,
+            energy_full_at=energy_full_at(0, 1, now),
+        )
         new_user.wallet = Wallet()
         new_user.user_stats = UserStats()
         new_user.upgrades.append(Upgrades(upgrade_name="pockets", level=1))
@@ -55,7 +73,9 @@ def add_user(user_id: int, user_name: str):
         session.add(new_user)
         try:
             grant_starter_weapon_shard(user_id, session)
+            schedule_event(session, ENERGY_FULL_EVENT, user_id, new_user.energy_full_at)
             session.commit()
+            _remember_registered_user(user_id)
             return True
         except Exception as e:
             session.rollback()
@@ -63,11 +83,38 @@ def add_user(user_id: int, user_name: str):
             return False
 
 
+def _remember_registered_user(user_id: int) -> None:
+    _registered_user_ids.add(user_id)
+    _recent_registrations.add(user_id)
+
+
+def warm_registered_users() -> int:
+    """Load every registered user id into the in-memory membership set.
+
+    Called at startup and periodically afterwards; the fresh snapshot is
+    swapped in with one assignment so readers never see a partial set.
+
+    Returns:
+        Number of registered users cached.
+    """
+    global _registered_user_ids, _registered_cache_warm
+
+    _recent_registrations.clear()
+    with Session() as session:
+        user_ids = set(session.execute(select(User.user_id)).scalars())
+
+    _registered_user_ids = user_ids | _recent_registrations
+    _registered_cache_warm = True
+    logger.info("Registered user cache warmed with %s users", len(_registered_user_ids))
+    return len(_registered_user_ids)
+
+
 def is_user(user_id: int, session=None) -> bool:
     """Check if a user exists in the database.
 
-    If a session is provided, it will be used (and NOT closed here).
-    Otherwise this function creates its own session.
+    Answered from the in-memory membership set once it has been warmed.
+    Before that, if a session is provided, it will be used (and NOT closed
+    here). Otherwise this function creates its own session.
 
     Args:
         user_id: Discord user id.
@@ -77,6 +124,9 @@ def is_user(user_id: int, session=None) -> bool:
         True if the user exists, False otherwise.
     """
 
+    if _registered_cache_warm:
+        return user_id in _registered_user_ids
+
     if session is not None:
         return session.get(User, user_id) is not None
 
@@ -166,26 +216,35 @@ def update_biggest_lottery_win(user_id: int, new_amount: int) -> None:
         session.commit()
 
 
-def inc_battles_won(user_id: int, amount: int = 1) -> None:
+def inc_battles_won(user_id: int, amount: int = 1, session=None) -> None:
     """Increment the user's battle wins counter.
 
     Args:
         user_id: Discord user id.
         amount: Increment amount.
+        session: Optional SQLAlchemy session. If provided, the caller owns the commit.
     """
+    if session is not None:
+        _inc_battles_won(session, user_id, amount)
+        return
+
     with Session() as session:
-        ensure_user_stats(session, user_id)
-        session.execute(
-            update(UserStats)
-            .where(UserStats.user_id == user_id)
-            .values(
-                battles_won=UserStats.battles_won + amount,
-                updated_at=func.now(),
-            )
-        )
+        _inc_battles_won(session, user_id, amount)
         session.commit()
 
 
+def _inc_battles_won(session, user_id: int, amount: int) -> None:
+    ensure_user_stats(session, user_id)
+    session.execute(
+        update(UserStats)
+        .where(UserStats.user_id == user_id)
+        .values(
+            battles_won=UserStats.battles_won + amount,
+            updated_at=func.now(),
+        )
+    )
+
+
 def inc_races_won(user_id: int, amount: int = 1) -> None:
     """Increment the user's race wins counter.
 
@@ -288,7 +347,7 @@ def get_user_profile_new(user_id: int) -> dict:
             "progression": {
                 "level": user.level,
                 "exp": user.exp,
-                "energy": user.energy,
+                "energy": current_energy(session, user),
                 "campaign_stage": user.campaign_stage,
                 "friendship": {
                     "progress": progress,
@@ -0,0 +1,103 @@
+import sys
+import types
+from datetime import datetime, timedelta
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules.setdefault("database.sessionmaker", sessionmaker_stub)
+
+# The real module loads the item table at import
+item_map_stub = types.ModuleType("utils.itemname_to_id")
+item_map_stub.get_item_id_safe = lambda name: None
+sys.modules.setdefault("utils.itemname_to_id", item_map_stub)
+
+from domain.progression.rules import ENERGY_REGEN_INTERVAL, energy_full_at
+from models.users_model import User, UserEffects
+from services import alchemy_services, energy_services
+from services.energy_services import current_energy
+
+
+class FakeQuery:
+    def __init__(self, session):
+        self.session = session
+
+    def filter(self, *_):
+        return self
+
+    def first(self):
+        return self.session.effect
+
+
+class FakeSession:
+    def __init__(self, user, effect=None):
+        self.user = user
+        self.effect = effect
+        self.events = []
+
+    def get(self, model, user_id):
+        return self.user if model is User and user_id == self.user.user_id else None
+
+    def query(self, model):
+        assert model is UserEffects
+        return FakeQuery(self)
+
+    def add(self, row):
+        self.effect = row
+
+    def flush(self):
+        pass
+
+    def commit(self):
+        pass
+
+
+def _record_events(monkeypatch, session):
+    def schedule_event(_, event_type, user_id, due_at):
+        session.events.append(("schedule", event_type, due_at))
+
+    def cancel_event(_, event_type, user_id):
+        session.events.append(("cancel", event_type, None))
+
+    for module in (alchemy_services, energy_services):
+        monkeypatch.setattr(module, "schedule_event", schedule_event)
+        monkeypatch.setattr(module, "cancel_event", cancel_event)
+
+
+def _idle_user(idle):
+    now = datetime.utcnow()
+    return User(user_id=1, level=20, energy=0, energy_updated_at=now - idle, energy_full_at=None)
+
+
+def test_effect_applied_after_idle_gap_is_not_credited_for_the_gap(monkeypatch):
+    user = _idle_user(ENERGY_REGEN_INTERVAL * 20)
+    session = FakeSession(user)
+    _record_events(monkeypatch, session)
+
+    alchemy_services.apply_user_effect(session, 1, "ENERGY REGEN ELITE", strain=1, expire_hours=2)
+
+    # The two idle hours regenerate at the base rate, not the potion's
+    assert user.energy == 20
+    assert current_energy(session, user, now=user.energy_updated_at + ENERGY_REGEN_INTERVAL) == 22
+
+    # ENERGY_FULL is timed at the boosted rate
+    boosted_full_at = energy_full_at(
+        20, user.level, user.energy_updated_at, session.effect.effect_name, session.effect.expire_at,
+    )
+    assert user.energy_full_at == boosted_full_at
+    assert ("schedule", energy_services.ENERGY_FULL_EVENT, boosted_full_at) in session.events
+
+
+def test_expiring_an_effect_banks_boosted_regen_and_retimes_full_energy(monkeypatch):
+    user = _idle_user(ENERGY_REGEN_INTERVAL * 3)
+    effect = UserEffects(
+        user_id=1, effect_name="ENERGY REGEN ELITE", strain=0,
+        expire_at=datetime.utcnow() + timedelta(hours=1),
+    )
+    session = FakeSession(user, effect)
+    _record_events(monkeypatch, session)
+
+    alchemy_services.expire_user_effect(session, 1, "ENERGY REGEN ELITE")
+
+    # Three boosted ticks are banked, then full energy is timed at the base rate
+    assert user.energy == 6
+    assert user.energy_full_at == energy_full_at(6, user.level, user.energy_updated_at)
@@ -0,0 +1,70 @@
+import asyncio
+import sys
+import threading
+import types
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules.setdefault("database.sessionmaker", sessionmaker_stub)
+
+from services import economy_services, inventory_services
+
+
+class FakeSession:
+    def __init__(self):
+        self.committed = False
+
+
+def _install_runner(monkeypatch):
+    """Same contract as run_in_async_session: one session per call, committed in a worker thread."""
+    sessions = []
+
+    def run(work):
+        session = FakeSession()
+        sessions.append(session)
+        result = work(session)
+        session.committed = True
+        return result
+
+    async def run_in_async_session(work):
+        return await asyncio.to_thread(run, work)
+
+    monkeypatch.setattr(
+        sys.modules["database.sessionmaker"],
+        "run_in_async_session",
+        run_in_async_session,
+        raising=False,
+    )
+    return sessions
+
+
+def test_wallet_variants_run_the_sync_service_off_the_loop(monkeypatch):
+    sessions = _install_runner(monkeypatch)
+    calls = []
+
+    def add_gold(user_id, amount, session):
+        calls.append((user_id, amount, session, threading.current_thread()))
+        return 150, amount
+
+    monkeypatch.setattr(economy_services, "add_gold", add_gold)
+
+    assert asyncio.run(economy_services.add_gold_async(1, 50)) == (150, 50)
+
+    user_id, amount, session, thread = calls[0]
+    assert (user_id, amount) == (1, 50)
+    assert session is sessions[0] and session.committed
+    assert thread is not threading.main_thread()
+
+
+def test_item_variants_pass_their_arguments_through(monkeypatch):
+    _install_runner(monkeypatch)
+    calls = []
+    monkeypatch.setattr(
+        inventory_services,
+        "give_item",
+        lambda target_id, item_id, amount, overflow, session: calls.append((target_id, item_id, amount, overflow)),
+    )
+
+    asyncio.run(inventory_services.give_item_async(3, 183, 2, True))
+
+    assert calls == [(3, 183, 2, True)]
@@ -11,8 +11,8 @@ from services.battle.campaign import campaign_services
 def test_stage_10_unlock_reward_grants_veyras_grimoire_shard(monkeypatch):
     calls = []
 
-    monkeypatch.setattr(campaign_services, "get_campaign_stage", lambda user_id: 10)
-    monkeypatch.setattr(campaign_services, "give_item", lambda *args: calls.append(args))
+    monkeypatch.setattr(campaign_services, "get_campaign_stage", lambda user_id, session=None: 10)
+    monkeypatch.setattr(campaign_services, "give_item", lambda *args, **kwargs: calls.append(args))
 
     campaign_services.give_stage_rewards(123)
 
@@ -20,7 +20,7 @@ def test_stage_10_unlock_reward_grants_veyras_grimoire_shard(monkeypatch):
 
 
 def test_stage_10_unlock_reward_details_mentions_signature_shard(monkeypatch):
-    monkeypatch.setattr(campaign_services, "get_campaign_stage", lambda user_id: 10)
+    monkeypatch.setattr(campaign_services, "get_campaign_stage", lambda user_id, session=None: 10)
 
     details = campaign_services.stage_reward_details(123)
 
@@ -32,8 +32,8 @@ def test_stage_10_unlock_reward_details_mentions_signature_shard(monkeypatch):
 def test_stage_15_reward_grants_bardok_shard_after_normal_reward(monkeypatch):
     calls = []
 
-    monkeypatch.setattr(campaign_services, "get_campaign_stage", lambda user_id: 15)
-    monkeypatch.setattr(campaign_services, "give_item", lambda *args: calls.append(args))
+    monkeypatch.setattr(campaign_services, "get_campaign_stage", lambda user_id, session=None: 15)
+    monkeypatch.setattr(campaign_services, "give_item", lambda *args, **kwargs: calls.append(args))
 
     campaign_services.give_stage_rewards(123)
 
@@ -0,0 +1,137 @@
+import random
+import sys
+import types
+
+import pytest
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules.setdefault("database.sessionmaker", sessionmaker_stub)
+
+from services.battle import battle_queue
+from services.battle.matchmaking import MatchmakingIndex, QueueEntry
+
+
+def brute_force_match(entries, min_bet, max_bet):
+    candidates = [e for e in entries if e.min_bet <= max_bet and e.max_bet >= min_bet]
+    if not candidates:
+        return None
+    best_score = max(e.score for e in candidates)
+    return min((e for e in candidates if e.score == best_score), key=lambda e: e.min_bet)
+
+
+def test_prefers_highest_score_then_lowest_min_bet():
+    index = MatchmakingIndex()
+    index.add(QueueEntry(1, 100, 500, score=0))
+    index.add(QueueEntry(2, 300, 400, score=5))
+    index.add(QueueEntry(3, 200, 900, score=5))
+    index.add(QueueEntry(4, 50, 60, score=9))
+
+    assert index.find_match(250, 350).user_id == 3
+    assert index.find_match(55, 55).user_id == 4
+    assert index.find_match(450, 480).user_id == 3
+    assert index.find_match(901, 1000) is None
+
+
+def test_equal_ranges_match_longest_waiting_first():
+    index = MatchmakingIndex()
+    index.add(QueueEntry(1, 100, 200))
+    index.add(QueueEntry(2, 100, 200))
+
+    assert index.find_match(100, 100).user_id == 1
+    index.add(QueueEntry(1, 100, 200))  # re-queue goes to the back
+    assert index.find_match(100, 100).user_id == 2
+
+
+def test_matches_brute_force_under_random_churn():
+    rng = random.Random(7)
+    index = MatchmakingIndex()
+    queued = {}
+
+    for _ in range(5000):
+        user_id = rng.randrange(200)
+        roll = rng.random()
+        if roll < 0.5:
+            low = rng.randrange(10, 1000)
+            entry = QueueEntry(user_id, low, low + rng.randrange(500), rng.choice([0, 0, 1, 3]))
+            index.add(entry)
+            queued[user_id] = entry
+        elif roll < 0.7:
+            assert index.remove(user_id) == queued.pop(user_id, None)
+        else:
+            low = rng.randrange(10, 1200)
+            high = low + rng.randrange(300)
+            match = index.find_match(low, high)
+            expected = brute_force_match(queued.values(), low, high)
+            assert (match is None) == (expected is None)
+            if expected is not None:
+                assert (match.score, match.min_bet) == (expected.score, expected.min_bet)
+
+    assert len(index) == len(queued)
+
+
+class FakeSession:
+    def __init__(self):
+        self.added = []
+        self.statements = []
+        self.commits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def get(self, _model, _key):
+        return None
+
+    def add(self, row):
+        self.added.append(row)
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return types.SimpleNamespace(rowcount=2)
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    session = FakeSession()
+    events = []
+    monkeypatch.setattr(battle_queue, "Session", lambda: session)
+    monkeypatch.setattr(battle_queue, "schedule_event", lambda _s, event, user_id, _due: events.append(("schedule", user_id)))
+    monkeypatch.setattr(battle_queue, "cancel_event", lambda _s, event, user_id: events.append(("cancel", user_id)))
+    monkeypatch.setattr(battle_queue, "queue_index", MatchmakingIndex())
+    return session, events
+
+
+def test_open_to_battle_queues_then_matches(queue):
+    session, events = queue
+
+    assert battle_queue.open_to_battle(1, 100, 300) == (None, None, None)
+    assert 1 in battle_queue.queue_index
+    assert session.added[0].user_id == 1
+    assert ("schedule", 1) in events
+
+    assert battle_queue.open_to_battle(2, 200, 500) == (2, 1, 300)
+    assert len(battle_queue.queue_index) == 0
+    assert ("cancel", 1) in events and ("cancel", 2) in events
+    assert session.commits == 2
+
+
+def test_open_to_battle_restores_index_when_the_write_fails(queue, monkeypatch):
+    session, _ = queue
+    battle_queue.queue_index.add(QueueEntry(1, 100, 300))
+
+    def failing_commit():
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(session, "commit", failing_commit)
+
+    with pytest.raises(RuntimeError):
+        battle_queue.open_to_battle(2, 200, 500)
+
+    assert 1 in battle_queue.queue_index
+    assert 2 not in battle_queue.queue_index
@@ -0,0 +1,73 @@
+import pytest
+
+from services.battle.battle_class import Battle
+from services.battle.battlemanager_class import BattleManager
+from services.battle.content_registry import CONTENT_REGISTRY
+from services.battle.replay import BattleReplay, ReplayFormatError, replay_battle
+from services.battle.session_runner import BattleSession
+from services.battle.veyra_ai import VeyraAI
+
+
+def make_fighter(name, weapon="trainingblade", spell="nightfall"):
+    return Battle(name, CONTENT_REGISTRY.create_spell(spell), CONTENT_REGISTRY.create_weapon(weapon))
+
+
+def play(seed, rounds=30):
+    p1 = make_fighter("P1", "moonslasher", "frostbite")
+    p2 = make_fighter("P2", "darkblade", "nightfall")
+    p2.hp += 15
+    p2.origin = "bardok"
+    manager = BattleManager(p1, p2, seed=seed)
+    manager.arena = CONTENT_REGISTRY.create_arena("lava")
+    session = BattleSession(manager)
+
+    ai_rng = manager.ai_rng()
+    p1_ai = VeyraAI(veyra=p1, player=p2, rng=ai_rng)
+    p2_ai = VeyraAI(veyra=p2, player=p1, rng=ai_rng)
+    for round_number in range(1, rounds + 1):
+        session.process_round(round_number, p1_ai.choose_move(), p2_ai.choose_move(), round_number == 2, False, "P1", "P2")
+        if session.get_result_state().finished:
+            break
+    return session
+
+
+def fighter_state(fighter):
+    return (fighter.hp, fighter.mana, fighter.attack, fighter.defense, fighter.speed, fighter.frost)
+
+
+def test_same_seed_plays_the_same_battle():
+    first = play(seed=11)
+    second = play(seed=11)
+
+    assert first.replay.rounds == second.replay.rounds
+    assert fighter_state(first.p1) == fighter_state(second.p1)
+    assert fighter_state(first.p2) == fighter_state(second.p2)
+
+
+def test_replay_round_trips_through_bytes():
+    replay = play(seed=5).replay
+
+    data = replay.encode()
+    decoded = BattleReplay.decode(data)
+
+    assert decoded == replay
+    assert len(data) == len(BattleReplay(replay.seed, replay.arena, replay.p1, replay.p2).encode()) + len(replay.rounds)
+    assert decoded.p2.stat_deltas[3] == 15
+    assert decoded.p2.origin == "bardok"
+    assert decoded.rounds[1].p1_timed_out is True
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 99])
+def test_replay_resimulates_the_recorded_battle(seed):
+    live = play(seed=seed)
+
+    replayed = replay_battle(BattleReplay.decode(live.replay.encode()))
+
+    assert fighter_state(replayed.p1) == fighter_state(live.p1)
+    assert fighter_state(replayed.p2) == fighter_state(live.p2)
+
+
+@pytest.mark.parametrize("data", [b"", b"XX" + bytes(20), play(seed=4).replay.encode()[:-1]])
+def test_decode_rejects_corrupt_replays(data):
+    with pytest.raises(ReplayFormatError):
+        BattleReplay.decode(data)
@@ -1,3 +1,8 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+
 from services.battle.battle_class import Battle
 from services.battle.battlemanager_class import BattleManager
 from services.battle.session_runner import BattleSession
@@ -10,6 +15,27 @@ def make_battle(name="Tester", spell=None, weapon=None):
     return Battle(name, spell or Nightfall(), weapon or TrainingBlade())
 
 
+class FakeUnitOfWork:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    @contextmanager
+    def __call__(self):
+        try:
+            yield self
+        except Exception:
+            self.rollbacks += 1
+            raise
+        self.commits += 1
+
+
+def install_unit_of_work(monkeypatch):
+    unit_of_work = FakeUnitOfWork()
+    monkeypatch.setattr("services.battle.settlement_services._unit_of_work", unit_of_work)
+    return unit_of_work
+
+
 def test_battle_session_process_round_collects_resolution_and_penalties():
     manager = BattleManager(make_battle("P1"), make_battle("P2"))
     session = BattleSession(manager, timeout_penalty=25)
@@ -52,10 +78,11 @@ def test_battle_session_get_result_state_handles_wins_and_double_ko():
 
 def test_pvp_settlement_pays_winner_and_updates_progress(monkeypatch):
     calls = []
-    monkeypatch.setattr("services.battle.settlement_services._add_gold", lambda *args: calls.append(("gold", args)))
-    monkeypatch.setattr("services.battle.settlement_services._inc_battles_won", lambda *args: calls.append(("wins", args)))
-    monkeypatch.setattr("services.battle.settlement_services._update_quest_progress", lambda *args: calls.append(("quest", args)))
-    monkeypatch.setattr("services.battle.settlement_services._decrease_quest_progress", lambda *args: calls.append(("decrease", args)))
+    unit_of_work = install_unit_of_work(monkeypatch)
+    monkeypatch.setattr("services.battle.settlement_services._add_gold", lambda *args, **kwargs: calls.append(("gold", args)))
+    monkeypatch.setattr("services.battle.settlement_services._inc_battles_won", lambda *args, **kwargs: calls.append(("wins", args)))
+    monkeypatch.setattr("services.battle.settlement_services._update_quest_progress", lambda *args, **kwargs: calls.append(("quest", args)))
+    monkeypatch.setattr("services.battle.settlement_services._decrease_quest_progress", lambda *args, **kwargs: calls.append(("decrease", args)))
 
     p1 = make_battle("Challenger")
     p2 = make_battle("Target")
@@ -77,13 +104,45 @@ def test_pvp_settlement_pays_winner_and_updates_progress(monkeypatch):
     assert ("quest", (2, "BATTLE_WIN", 1)) in calls
     assert ("quest", (2, "BATTLE_WIN_STREAK", 1)) in calls
     assert ("decrease", (1, "BATTLE_WIN_STREAK")) in calls
+    assert unit_of_work.commits == 1
+
+
+def test_pvp_settlement_rolls_back_every_write_when_one_fails(monkeypatch):
+    calls = []
+    unit_of_work = install_unit_of_work(monkeypatch)
+
+    def failing_quest_update(*args, **kwargs):
+        raise RuntimeError("quest write failed")
+
+    monkeypatch.setattr("services.battle.settlement_services._add_gold", lambda *args, **kwargs: calls.append(("gold", kwargs["session"])))
+    monkeypatch.setattr("services.battle.settlement_services._inc_battles_won", lambda *args, **kwargs: calls.append(("wins", kwargs["session"])))
+    monkeypatch.setattr("services.battle.settlement_services._update_quest_progress", failing_quest_update)
+
+    p1 = make_battle("Challenger")
+    p2 = make_battle("Target")
+    p2.hp = 0
+
+    with pytest.raises(RuntimeError):
+        SettlementService.resolve_pvp(
+            challenger_id=1,
+            challenger_name="Challenger",
+            target_id=2,
+            target_name="Target",
+            bet=100,
+            p1=p1,
+            p2=p2,
+        )
+
+    assert calls == [("gold", unit_of_work), ("wins", unit_of_work)]
+    assert unit_of_work.commits == 0
+    assert unit_of_work.rollbacks == 1
 
 
 def test_pvp_settlement_handles_double_ko_without_side_effects(monkeypatch):
-    monkeypatch.setattr("services.battle.settlement_services._add_gold", lambda *args: (_ for _ in ()).throw(AssertionError("unexpected payout")))
-    monkeypatch.setattr("services.battle.settlement_services._inc_battles_won", lambda *args: (_ for _ in ()).throw(AssertionError("unexpected win update")))
-    monkeypatch.setattr("services.battle.settlement_services._update_quest_progress", lambda *args: (_ for _ in ()).throw(AssertionError("unexpected quest update")))
-    monkeypatch.setattr("services.battle.settlement_services._decrease_quest_progress", lambda *args: (_ for _ in ()).throw(AssertionError("unexpected quest decrease")))
+    monkeypatch.setattr("services.battle.settlement_services._add_gold", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("unexpected payout")))
+    monkeypatch.setattr("services.battle.settlement_services._inc_battles_won", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("unexpected win update")))
+    monkeypatch.setattr("services.battle.settlement_services._update_quest_progress", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("unexpected quest update")))
+    monkeypatch.setattr("services.battle.settlement_services._decrease_quest_progress", lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("unexpected quest decrease")))
 
     p1 = make_battle("Challenger")
     p2 = make_battle("Target")
@@ -106,11 +165,12 @@ def test_pvp_settlement_handles_double_ko_without_side_effects(monkeypatch):
 
 def test_campaign_settlement_returns_followup_and_event_summary(monkeypatch):
     calls = []
-    monkeypatch.setattr("services.battle.settlement_services._stage_reward_details", lambda player_id: f"Reward for {player_id}")
-    monkeypatch.setattr("services.battle.settlement_services._give_stage_rewards", lambda *args: calls.append(("rewards", args)))
-    monkeypatch.setattr("services.battle.settlement_services._advance_campaign_stage", lambda *args: calls.append(("advance", args)))
-    monkeypatch.setattr("services.battle.settlement_services._update_quest_progress", lambda *args: calls.append(("quest", args)))
-    monkeypatch.setattr("services.battle.settlement_services._create_game_event", lambda *args: calls.append(("event", args)))
+    unit_of_work = install_unit_of_work(monkeypatch)
+    monkeypatch.setattr("services.battle.settlement_services._stage_reward_details", lambda player_id, session=None: f"Reward for {player_id}")
+    monkeypatch.setattr("services.battle.settlement_services._give_stage_rewards", lambda *args, **kwargs: calls.append(("rewards", args)))
+    monkeypatch.setattr("services.battle.settlement_services._advance_campaign_stage", lambda *args, **kwargs: calls.append(("advance", args)))
+    monkeypatch.setattr("services.battle.settlement_services._update_quest_progress", lambda *args, **kwargs: calls.append(("quest", args)))
+    monkeypatch.setattr("services.battle.settlement_services._create_game_event", lambda *args, **kwargs: calls.append(("event", args)))
 
     p1 = make_battle("Player")
     p2 = make_battle("Bardok")
@@ -133,3 +193,61 @@ def test_campaign_settlement_returns_followup_and_event_summary(monkeypatch):
     assert ("advance", (7,)) in calls
     assert ("quest", (7, "CAMPAIGN_WIN", 1)) in calls
     assert calls[-1][0] == "event"
+    assert unit_of_work.commits == 1
+
+
+def test_pvp_settlement_async_variant_applies_same_payout(monkeypatch):
+    calls = []
+    install_unit_of_work(monkeypatch)
+    monkeypatch.setattr("services.battle.settlement_services._add_gold", lambda *args, **kwargs: calls.append(("gold", args)))
+    monkeypatch.setattr("services.battle.settlement_services._inc_battles_won", lambda *args, **kwargs: calls.append(("wins", args)))
+    monkeypatch.setattr("services.battle.settlement_services._update_quest_progress", lambda *args, **kwargs: calls.append(("quest", args)))
+    monkeypatch.setattr("services.battle.settlement_services._decrease_quest_progress", lambda *args, **kwargs: calls.append(("decrease", args)))
+
+    p1 = make_battle("Challenger")
+    p2 = make_battle("Target")
+    p2.hp = 0
+
+    result = asyncio.run(
+        SettlementService.resolve_pvp_async(
+            challenger_id=1,
+            challenger_name="Challenger",
+            target_id=2,
+            target_name="Target",
+            bet=50,
+            p1=p1,
+            p2=p2,
+        )
+    )
+
+    assert result.winner_name == "Challenger"
+    assert ("gold", (1, 90)) in calls
+    assert ("decrease", (2, "BATTLE_WIN_STREAK")) in calls
+
+
+def test_pvp_settlement_saves_replay_in_the_same_transaction(monkeypatch):
+    saved = []
+    unit_of_work = install_unit_of_work(monkeypatch)
+    for name in ("_add_gold", "_inc_battles_won", "_update_quest_progress", "_decrease_quest_progress"):
+        monkeypatch.setattr(f"services.battle.settlement_services.{name}", lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        "services.battle.settlement_services._save_replay",
+        lambda *args, **kwargs: saved.append((args, kwargs["session"])),
+    )
+
+    session = BattleSession(BattleManager(make_battle("Challenger"), make_battle("Target"), seed=3))
+    session.p2.hp = 0
+
+    SettlementService.resolve_pvp(
+        challenger_id=1,
+        challenger_name="Challenger",
+        target_id=2,
+        target_name="Target",
+        bet=100,
+        p1=session.p1,
+        p2=session.p2,
+        replay=session.replay,
+    )
+
+    assert saved == [(("pvp", 1, 2, session.replay), unit_of_work)]
+    assert unit_of_work.commits == 1
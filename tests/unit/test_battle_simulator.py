@@ -0,0 +1,26 @@
+from services.battle.simulator import Loadout, run_simulation, simulate_fight
+
+
+LOADOUTS = [Loadout("trainingblade", "fireball"), Loadout("elephanthammer", "nightfall")]
+
+
+def test_simulate_fight_returns_an_outcome():
+    assert simulate_fight(LOADOUTS[0], LOADOUTS[1], "null") in (-1, 0, 1)
+
+
+def test_run_simulation_is_reproducible_for_a_seed():
+    first = run_simulation(fights=5, seed=7, workers=1, arenas=["null", "lava"], loadouts=LOADOUTS)
+    second = run_simulation(fights=5, seed=7, workers=1, arenas=["null", "lava"], loadouts=LOADOUTS)
+
+    assert first.matrices == second.matrices
+    assert set(first.matrices) == {"null", "lava"}
+    assert len(first.matrices["null"]) == 4
+    assert all(stats.fights == 5 for stats in first.matrices["lava"].values())
+
+
+def test_random_policy_runs_against_the_ai():
+    result = run_simulation(fights=3, seed=1, workers=1, arenas=["frozen"], loadouts=LOADOUTS, p1_policy="random")
+
+    rates = result.loadout_win_rates("frozen")
+    assert set(rates) == {loadout.key for loadout in LOADOUTS}
+    assert all(0.0 <= rate <= 1.0 for rate in rates.values())
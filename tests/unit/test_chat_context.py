@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+
+from services.talk_to_veyra.chat_context import ChatContextBuffer
+
+BOT_ID = 99
+CHANNEL_ID = 5
+
+
+def make_message(message_id, content, author_id=1, bot=False, name=None):
+    author = SimpleNamespace(id=author_id, bot=bot, display_name=name or f"user{author_id}")
+    return SimpleNamespace(id=message_id, content=content, author=author, channel=SimpleNamespace(id=CHANNEL_ID))
+
+
+class FakeChannel:
+    def __init__(self, history):
+        self.id = CHANNEL_ID
+        self._history = history  # newest first, like channel.history
+        self.history_calls = 0
+
+    async def _iterate(self, limit):
+        for msg in self._history[:limit]:
+            yield msg
+
+    def history(self, limit):
+        self.history_calls += 1
+        return self._iterate(limit)
+
+
+def test_recent_keeps_roles_and_caps_veyra_replies():
+    buffer = ChatContextBuffer()
+    buffer.record(make_message(1, "hi veyra"), BOT_ID)
+    for message_id in (2, 3, 4):
+        buffer.record(make_message(message_id, f"reply {message_id}", author_id=BOT_ID, bot=True, name="Veyra"), BOT_ID)
+    buffer.record(make_message(5, "   "), BOT_ID)
+    buffer.record(make_message(6, "beep", author_id=7, bot=True), BOT_ID)
+    buffer.record(make_message(8, "still there?"), BOT_ID)
+
+    recent = buffer.recent(CHANNEL_ID, limit=10)
+
+    assert recent == [
+        {"author": "user1", "role": "user", "content": "hi veyra"},
+        {"author": "Veyra", "role": "assistant", "content": "reply 3"},
+        {"author": "Veyra", "role": "assistant", "content": "reply 4"},
+        {"author": "user1", "role": "user", "content": "still there?"},
+    ]
+
+
+def test_buffer_is_bounded_and_follows_edits_and_deletes():
+    buffer = ChatContextBuffer(size=3)
+    for message_id in range(1, 6):
+        buffer.record(make_message(message_id, f"msg {message_id}"), BOT_ID)
+
+    buffer.edit(CHANNEL_ID, 4, "edited")
+    buffer.delete(CHANNEL_ID, [5])
+    buffer.edit(CHANNEL_ID, 1, "gone already")
+
+    assert [entry["content"] for entry in buffer.recent(CHANNEL_ID)] == ["msg 3", "edited"]
+
+
+def test_backfill_runs_once_and_keeps_messages_recorded_meanwhile():
+    buffer = ChatContextBuffer()
+    channel = FakeChannel([make_message(3, "third"), make_message(2, "second"), make_message(1, "first")])
+    buffer.record(make_message(4, "fourth"), BOT_ID)
+    buffer.record(make_message(3, "third"), BOT_ID)
+
+    asyncio.run(buffer.backfill(channel, BOT_ID))
+
+    assert buffer.is_warm(CHANNEL_ID)
+    assert [entry["content"] for entry in buffer.recent(CHANNEL_ID)] == ["first", "second", "third", "fourth"]
+    assert channel.history_calls == 1
@@ -0,0 +1,53 @@
+from sqlalchemy.orm import Session
+
+from services.talk_to_veyra import chat_user_cache
+
+
+def setup_function():
+    chat_user_cache.clear_chat_users()
+
+
+def test_snapshot_is_served_until_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(chat_user_cache.time, "monotonic", lambda: now[0])
+
+    chat_user_cache.store_chat_user(1, {"user_id": 1, "gold": 50})
+    now[0] += chat_user_cache.CHAT_USER_TTL_SECONDS - 1
+    assert chat_user_cache.get_chat_user(1) == {"user_id": 1, "gold": 50}
+
+    now[0] += 1
+    assert chat_user_cache.get_chat_user(1) is None
+
+
+def test_returned_snapshot_is_a_copy():
+    chat_user_cache.store_chat_user(1, {"user_id": 1, "gold": 50})
+    chat_user_cache.get_chat_user(1)["gold"] = 0
+
+    assert chat_user_cache.get_chat_user(1)["gold"] == 50
+
+
+def test_invalidate_drops_now_and_again_after_commit():
+    session = Session()
+    chat_user_cache.store_chat_user(1, {"user_id": 1, "gold": 50})
+    chat_user_cache.invalidate_chat_user(1, session)
+    assert chat_user_cache.get_chat_user(1) is None
+
+    # A chat turn reloads the old balance before the writer commits
+    chat_user_cache.store_chat_user(1, {"user_id": 1, "gold": 50})
+    chat_user_cache.store_chat_user(2, {"user_id": 2, "gold": 10})
+    session.commit()
+
+    assert chat_user_cache.get_chat_user(1) is None
+    assert chat_user_cache.get_chat_user(2) == {"user_id": 2, "gold": 10}
+
+
+def test_rollback_forgets_pending_invalidations():
+    session = Session()
+    session.begin()
+    chat_user_cache.invalidate_chat_user(1, session)
+    session.rollback()
+
+    chat_user_cache.store_chat_user(1, {"user_id": 1, "gold": 50})
+    session.commit()
+
+    assert chat_user_cache.get_chat_user(1) == {"user_id": 1, "gold": 50}
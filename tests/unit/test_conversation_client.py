@@ -0,0 +1,257 @@
+import asyncio
+import os
+
+import pytest
+from aiohttp import web
+
+os.environ.setdefault("CONVO_MODEL_API_KEY", "test-key")
+
+from services.talk_to_veyra.chat_services import (
+    CircuitBreaker,
+    ConversationService,
+    ConversationServiceError,
+    ConversationUnavailableError,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def start_stub(handler):
+    """Local stand-in for the model server."""
+    app = web.Application()
+    app.router.add_post("/chat", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/chat"
+
+
+def test_breaker_opens_after_threshold_and_lets_one_trial_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, reset_after=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_concurrency_is_capped_and_repeat_mentions_are_dropped():
+    async def scenario():
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.05)
+            active -= 1
+            body = await request.json()
+            return web.json_response(f"hi {body['user']['user_id']}")
+
+        runner, url = await start_stub(handler)
+        service = ConversationService(endpoint=url, max_in_flight=2)
+        try:
+            replies = await asyncio.gather(
+                *(service.get_reply({"user": {"user_id": user_id}}, key=user_id) for user_id in (1, 2, 3, 4, 1))
+            )
+        finally:
+            await service.close()
+            await runner.cleanup()
+        return replies, peak, service.metrics
+
+    replies, peak, metrics = asyncio.run(scenario())
+
+    assert replies == ["hi 1", "hi 2", "hi 3", "hi 4", None]
+    assert peak == 2
+    assert metrics.dropped == 1
+    assert metrics.max_queued >= 2
+    assert metrics.in_flight == 0 and metrics.queued == 0
+    assert metrics.latency_percentile(50) is not None
+
+
+def test_failures_open_the_breaker_and_later_requests_fail_fast():
+    async def scenario():
+        calls = 0
+
+        async def handler(_request):
+            nonlocal calls
+            calls += 1
+            return web.Response(status=503, text="overloaded")
+
+        runner, url = await start_stub(handler)
+        service = ConversationService(endpoint=url, breaker=CircuitBreaker(threshold=2, reset_after=60))
+        errors = []
+        try:
+            for _ in range(4):
+                try:
+                    await service.get_reply({"message": "hi"})
+                except ConversationServiceError as exc:
+                    errors.append(type(exc))
+        finally:
+            await service.close()
+            await runner.cleanup()
+        return calls, errors, service.metrics
+
+    calls, errors, metrics = asyncio.run(scenario())
+
+    assert calls == 2
+    assert errors == [ConversationServiceError, ConversationServiceError, ConversationUnavailableError, ConversationUnavailableError]
+    assert metrics.failures == 2 and metrics.rejected == 2
+
+
+def test_full_queue_is_refused():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def handler(_request):
+            await release.wait()
+            return web.json_response("ok")
+
+        runner, url = await start_stub(handler)
+        service = ConversationService(endpoint=url, max_in_flight=1, max_queued=1)
+        try:
+            first = asyncio.create_task(service.get_reply({}))
+            second = asyncio.create_task(service.get_reply({}))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ConversationUnavailableError):
+                await service.get_reply({})
+            release.set()
+            return await asyncio.gather(first, second)
+        finally:
+            await service.close()
+            await runner.cleanup()
+
+    assert asyncio.run(scenario()) == ["ok", "ok"]
+
+
+async def collect_stream(handler):
+    runner, url = await start_stub(handler)
+    service = ConversationService(endpoint=url)
+    try:
+        return [chunk async for chunk in service.stream_reply({"message": "hi"})], service.metrics
+    finally:
+        await service.close()
+        await runner.cleanup()
+
+
+def test_stream_reply_reads_server_sent_events():
+    async def handler(request):
+        assert "text/event-stream" in request.headers["Accept"]
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        for event in ('data: "Hel"\n\n', ': keepalive\n\n', 'data: {"delta": "lo"}\n\n', "data: !\n\n", "data: [DONE]\n\n"):
+            await resp.write(event.encode())
+        return resp
+
+    chunks, metrics = asyncio.run(collect_stream(handler))
+
+    assert chunks == ["Hel", "lo", "!"]
+    assert len(metrics.first_token_latencies) == 1
+
+
+def test_stream_reply_falls_back_to_a_buffered_json_reply():
+    async def handler(_request):
+        return web.json_response("whole reply")
+
+    chunks, _ = asyncio.run(collect_stream(handler))
+
+    assert chunks == ["whole reply"]
+
+
+def test_stream_reply_reads_chunked_text():
+    async def handler(request):
+        resp = web.StreamResponse(headers={"Content-Type": "text/plain"})
+        await resp.prepare(request)
+        for part in ("Ve", "yra ", "é".encode()[:1], "é".encode()[1:]):
+            await resp.write(part.encode() if isinstance(part, str) else part)
+        return resp
+
+    chunks, _ = asyncio.run(collect_stream(handler))
+
+    assert "".join(chunks) == "Veyra é"
+
+
+class FakeSentMessage:
+    def __init__(self, content):
+        self.content = content
+        self.edits = []
+
+    async def edit(self, content):
+        self.content = content
+        self.edits.append(content)
+
+
+def test_stream_user_message_posts_early_and_rate_limits_edits(monkeypatch):
+    from services.talk_to_veyra import chat_services
+
+    clock = FakeClock()
+
+    async def fake_stream(_payload, key=None):
+        for chunk, at in (("Hi", 0.0), (" there", 0.2), (",", 0.5), (" friend", 1.3), ("!", 1.4)):
+            clock.now = at
+            yield chunk
+
+    monkeypatch.setattr(chat_services.brain, "stream_reply", fake_stream)
+    posted = []
+
+    async def send(text):
+        posted.append(FakeSentMessage(text))
+        return posted[0]
+
+    final = asyncio.run(chat_services.stream_user_message("hey", {"user_id": 1}, [], send, clock=clock))
+
+    assert final == "Hi there, friend!"
+    assert len(posted) == 1 and posted[0].edits[0] == "Hi there, friend"
+    assert posted[0].content == "Hi there, friend!"
+    assert len(posted[0].edits) == 2
+
+
+def test_deleted_reply_closes_the_stream(monkeypatch):
+    from types import SimpleNamespace
+
+    import discord
+
+    from services.talk_to_veyra import chat_services
+
+    clock = FakeClock()
+    closed = []
+
+    async def fake_stream(_payload, key=None):
+        try:
+            for chunk, at in (("Hi", 0.0), (" there", 2.0), (" friend", 4.0)):
+                clock.now = at
+                yield chunk
+        finally:
+            closed.append(True)
+
+    class DeletedMessage(FakeSentMessage):
+        async def edit(self, content):
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+
+    monkeypatch.setattr(chat_services.brain, "stream_reply", fake_stream)
+
+    async def send(text):
+        return DeletedMessage(text)
+
+    async def run():
+        final = await chat_services.stream_user_message("hey", {"user_id": 1}, [], send, clock=clock)
+        # Closed right away, not when the loop shuts down
+        return final, list(closed)
+
+    assert asyncio.run(run()) == ("Hi", [True])
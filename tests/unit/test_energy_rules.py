@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+from domain.progression.rules import (
+    ENERGY_REGEN_INTERVAL,
+    energy_full_at,
+    max_energy,
+    regenerate_energy,
+)
+
+
+T0 = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def test_regen_applies_whole_ticks_and_keeps_partial_progress():
+    now = T0 + ENERGY_REGEN_INTERVAL * 3 + timedelta(minutes=2)
+
+    energy, updated_at = regenerate_energy(10, 1, T0, now)
+
+    assert energy == 13
+    assert updated_at == T0 + ENERGY_REGEN_INTERVAL * 3
+
+
+def test_regen_stops_at_cap_and_restarts_clock():
+    now = T0 + ENERGY_REGEN_INTERVAL * 500
+
+    energy, updated_at = regenerate_energy(10, 1, T0, now)
+
+    assert energy == max_energy(1)
+    assert updated_at == now
+
+
+def test_overflow_energy_is_not_touched_by_regen():
+    now = T0 + ENERGY_REGEN_INTERVAL * 10
+
+    assert regenerate_energy(200, 1, T0, now) == (200, now)
+
+
+def test_effect_rate_only_applies_until_effect_expires():
+    expire_at = T0 + ENERGY_REGEN_INTERVAL * 4
+    now = T0 + ENERGY_REGEN_INTERVAL * 6
+
+    energy, _ = regenerate_energy(0, 1, T0, now, "ENERGY REGEN DEMON", expire_at)
+
+    assert energy == 4 * 5 + 2 * 1
+
+
+def test_energy_full_at_matches_regen():
+    full_at = energy_full_at(40, 1, T0, "ENERGY REGEN ELITE", None)
+
+    assert full_at == T0 + ENERGY_REGEN_INTERVAL * 5
+    assert regenerate_energy(40, 1, T0, full_at, "ENERGY REGEN ELITE", None)[0] == max_energy(1)
+    assert regenerate_energy(40, 1, T0, full_at - timedelta(seconds=1), "ENERGY REGEN ELITE", None)[0] < max_energy(1)
+
+
+def test_energy_full_at_is_none_when_capped():
+    assert energy_full_at(max_energy(3), 3, T0) is None
@@ -0,0 +1,169 @@
+import asyncio
+import sys
+import types
+
+
+class EmptySession:
+    """Import-time stand-in for modules that preload lookup tables."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def query(self, *_args):
+        return self
+
+    def all(self):
+        return []
+
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = EmptySession
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from services import exp_services
+
+
+class FakeUser:
+    def __init__(self, user_id, level):
+        self.user_id = user_id
+        self.level = level
+        self.energy = 0
+        self.energy_updated_at = None
+        self.energy_full_at = None
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows, users):
+        self.rows = rows
+        self.users = users
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return FakeResult(self.rows)
+
+    def get(self, _model, user_id):
+        return self.users[user_id]
+
+    def query(self, *_args):
+        return self
+
+    def filter(self, *_args):
+        return self
+
+    def first(self):
+        return None
+
+
+def _install_runner(monkeypatch, session):
+    async def run_in_async_session(work, session_arg=None):
+        return work(session)
+
+    monkeypatch.setattr(
+        sys.modules["database.sessionmaker"],
+        "run_in_async_session",
+        run_in_async_session,
+        raising=False,
+    )
+
+
+class LevelUpSession(FakeSession):
+    def __init__(self, users, failing=()):
+        super().__init__(rows=[], users=users)
+        self.failing = set(failing)
+        self.committed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def get(self, _model, user_id):
+        if user_id in self.failing:
+            raise RuntimeError("level up exploded")
+        return self.users.get(user_id)
+
+    def commit(self):
+        self.committed = True
+
+
+def test_accumulator_sums_grants_and_flushes_in_one_statement(monkeypatch):
+    user = FakeUser(2, level=1)
+    session = FakeSession(rows=[(1, 50, 1), (2, 120, 1)], users={})
+    _install_runner(monkeypatch, session)
+    level_up_sessions = []
+
+    def level_up_session():
+        level_up_sessions.append(LevelUpSession({2: user}))
+        return level_up_sessions[-1]
+
+    monkeypatch.setattr(exp_services, "Session", level_up_session)
+
+    accumulator = exp_services.ExpAccumulator()
+    accumulator.add(1, 20)
+    accumulator.add(1, 30)
+    accumulator.add(2, 5)
+    accumulator.add(3, 0)
+
+    assert accumulator.pending() == 2
+
+    leveled_up = asyncio.run(accumulator.flush())
+
+    # One bulk UPDATE; the level up runs afterwards in its own session
+    assert [stmt.is_update for stmt in session.statements] == [True]
+    assert leveled_up == {2: 2}
+    assert user.level == 2
+    assert user.energy == 15
+    assert len(level_up_sessions) == 1 and level_up_sessions[0].committed
+    assert accumulator.pending() == 0
+
+
+def test_failing_level_up_does_not_block_other_users(monkeypatch):
+    user = FakeUser(2, level=1)
+    session = FakeSession(rows=[(1, 120, 1), (2, 120, 1)], users={})
+    _install_runner(monkeypatch, session)
+    monkeypatch.setattr(exp_services, "Session", lambda: LevelUpSession({2: user}, failing={1}))
+
+    accumulator = exp_services.ExpAccumulator()
+    accumulator.add(1, 5)
+    accumulator.add(2, 5)
+
+    assert asyncio.run(accumulator.flush()) == {2: 2}
+    # The EXP itself was written; user 1's level up is retried on their next flush
+    assert accumulator.pending() == 0
+
+
+def test_failed_flush_requeues_deltas_up_to_the_attempt_cap(monkeypatch):
+    async def failing_runner(work, session=None):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(
+        sys.modules["database.sessionmaker"],
+        "run_in_async_session",
+        failing_runner,
+        raising=False,
+    )
+
+    accumulator = exp_services.ExpAccumulator()
+    accumulator.add(7, 4)
+
+    assert asyncio.run(accumulator.flush()) == {}
+
+    accumulator.add(7, 1)
+    assert accumulator._pending == {7: 5}
+
+    for _ in range(exp_services.MAX_FLUSH_ATTEMPTS - 1):
+        asyncio.run(accumulator.flush())
+    assert accumulator.pending() == 0
@@ -0,0 +1,106 @@
+import sys
+import types
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from domain.inventory.rules import slots_for_quantity
+from services import inventory_services
+from services.item_catalog_services import CatalogItem, ItemCatalog
+
+
+def test_slots_for_quantity_rounds_up_per_stack():
+    assert slots_for_quantity(0, 10) == 0
+    assert slots_for_quantity(1, 10) == 1
+    assert slots_for_quantity(10, 10) == 1
+    assert slots_for_quantity(11, 10) == 2
+    assert slots_for_quantity(3, 0) == 3
+
+
+class FakeSession:
+    def __init__(self, pockets_level):
+        self.pockets = types.SimpleNamespace(level=pockets_level)
+        self.deltas = []
+
+    def get(self, _model, _key):
+        return self.pockets
+
+    def execute(self, stmt):
+        params = stmt.compile().params
+        self.deltas.append(next(value for key, value in params.items() if key.startswith("inventory_slots_used")))
+
+
+def _install_catalog(monkeypatch):
+    bread = CatalogItem(1, "Bread", "", "item", "Common", None, None, None, False)
+    catalog = ItemCatalog([bread])
+    monkeypatch.setattr(inventory_services, "get_item_catalog", lambda: catalog)
+
+
+def test_track_slots_only_writes_when_stack_count_changes(monkeypatch):
+    _install_catalog(monkeypatch)
+    session = FakeSession(pockets_level=1)  # items stack to 10
+
+    inventory_services._track_slots(session, 5, 1, 3, 8)
+    inventory_services._track_slots(session, 5, 1, 8, 21)
+    inventory_services._track_slots(session, 5, 1, 21, 0)
+
+    assert session.deltas == [2, -3]
+
+
+class ReconcileSession:
+    """Records the isolation level each query ran under."""
+
+    def __init__(self, log, inventory, stored):
+        self.log = log
+        self.inventory = inventory
+        self.stored = stored
+        self.isolation = "READ COMMITTED"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def connection(self, execution_options=None):
+        self.isolation = execution_options["isolation_level"]
+
+    def query(self, *columns):
+        names = [column.key for column in columns]
+        self.log.append((self.isolation, names[-1]))
+        rows = {"level": [], "item_quantity": self.inventory, "inventory_slots_used": self.stored}[names[-1]]
+        return types.SimpleNamespace(
+            filter=lambda *_: types.SimpleNamespace(all=lambda: rows),
+            yield_per=lambda _n: rows,
+        )
+
+    def execute(self, stmt, params):
+        self.log.append((self.isolation, "update", params))
+
+    def rollback(self):
+        self.log.append((self.isolation, "rollback"))
+
+    def commit(self):
+        self.log.append((self.isolation, "commit"))
+
+
+def test_reconcile_reads_one_snapshot_and_fixes_in_a_new_transaction(monkeypatch):
+    _install_catalog(monkeypatch)
+    log = []
+    sessions = iter([
+        ReconcileSession(log, inventory=[(5, 1, 25)], stored=[(5, 1), (6, 0)]),
+        ReconcileSession(log, inventory=[], stored=[]),
+    ])
+    monkeypatch.setattr(inventory_services, "Session", lambda: next(sessions))
+
+    assert inventory_services.reconcile_slots_used() == 1
+
+    assert log == [
+        ("REPEATABLE READ", "level"),
+        ("REPEATABLE READ", "item_quantity"),
+        ("REPEATABLE READ", "inventory_slots_used"),
+        ("REPEATABLE READ", "rollback"),
+        ("READ COMMITTED", "update", [{"uid": 5, "old": 1, "slots": 25}]),
+        ("READ COMMITTED", "commit"),
+    ]
@@ -0,0 +1,60 @@
+import random
+import sys
+import types
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from services.item_catalog_services import CatalogItem, ItemCatalog
+
+
+def make_item(item_id, name, rarity, item_type="item"):
+    return CatalogItem(
+        item_id=item_id,
+        item_name=name,
+        item_description="",
+        item_type=item_type,
+        item_rarity=rarity,
+        item_icon=None,
+        item_durability=None,
+        item_price=None,
+        item_usable=False,
+    )
+
+
+CATALOG = ItemCatalog(
+    [
+        make_item(1, "Bread", "Common"),
+        make_item(2, "Apple", "Common"),
+        make_item(3, "Ruby", "Rare"),
+        make_item(4, "Wooden Box", "Common", "lootbox"),
+        make_item(5, "Blade Shard", "Common", "shard"),
+        make_item(6, "Bound Shard", "Common", "shard"),
+    ],
+    non_droppable_ids=frozenset({6}),
+)
+
+
+def test_pools_split_by_rarity_type_and_droppable():
+    assert CATALOG.pool(("Common",), ("item",)) == (1, 2)
+    assert CATALOG.pool(("Common",), ("item", "shard")) == (1, 2, 5)
+    assert CATALOG.pool(("Common",), ("shard",), droppable_only=False) == (5, 6)
+    assert CATALOG.pool(("Legendary",), ("item",)) == ()
+    assert CATALOG.get(3).item_name == "Ruby"
+    assert CATALOG.get(99) is None
+
+
+def test_random_item_only_draws_from_matching_pool():
+    rng = random.Random(7)
+    drawn = {CATALOG.random_item("Common", ("item", "shard"), rng=rng).item_id for _ in range(50)}
+
+    assert drawn == {1, 2, 5}
+    assert CATALOG.random_item("Epic", ("item",), rng=rng) is None
+
+
+def test_sample_respects_exclusions_and_size():
+    rng = random.Random(1)
+    picked = CATALOG.sample(("Common", "Rare"), ("item",), k=5, exclude_ids={3}, exclude_names={"Bread"}, rng=rng)
+
+    assert [item.item_id for item in picked] == [2]
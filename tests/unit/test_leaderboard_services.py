@@ -0,0 +1,130 @@
+import asyncio
+import sys
+import types
+
+import pytest
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from sqlalchemy.dialects import postgresql
+
+from services import leaderboard_services
+from services.leaderboard_services import LeaderboardEntry, NameDirectory
+
+
+class FakeBot:
+    def __init__(self, cached):
+        self.cached = cached
+
+    def get_user(self, user_id):
+        name = self.cached.get(user_id)
+        return types.SimpleNamespace(name=name) if name else None
+
+
+class FakeSession:
+    def __init__(self, results):
+        self.results = list(results)
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        rows = self.results.pop(0)
+        return types.SimpleNamespace(
+            all=lambda: rows,
+            first=lambda: rows[0] if rows else None,
+            scalar_one=lambda: rows,
+        )
+
+
+def test_top_k_is_an_indexed_limit_query_cached_until_ttl(monkeypatch):
+    sessions = []
+
+    def fake_session():
+        sessions.append(FakeSession([[(rank, 100 - rank, f"user{rank}", rank) for rank in range(1, 11)]]))
+        return sessions[-1]
+
+    clock = [1000.0]
+    monkeypatch.setattr(leaderboard_services, "Session", fake_session)
+    monkeypatch.setattr(leaderboard_services.time, "monotonic", lambda: clock[0])
+    leaderboard_services.invalidate_leaderboards()
+
+    assert len(leaderboard_services.get_gold_leaderboard()) == 10
+    assert [entry.rank for entry in leaderboard_services.get_gold_leaderboard(3)] == [1, 2, 3]
+    assert len(sessions) == 1
+
+    sql = sessions[0].statements[0]
+    assert "FROM wallet JOIN users" in sql
+    assert "rank() OVER (ORDER BY wallet.gold DESC)" in sql
+    assert "ORDER BY wallet.gold DESC, users.user_id" in sql
+    assert "LIMIT" in sql
+
+    clock[0] += leaderboard_services.LEADERBOARD_TTL_SECONDS
+    leaderboard_services.get_gold_leaderboard()
+    leaderboard_services.get_gold_leaderboard(3, fresh=True)
+    assert len(sessions) == 3
+
+
+def test_rank_counts_strictly_higher_values(monkeypatch):
+    session = FakeSession([[(50, "carol")], 7])
+    monkeypatch.setattr(leaderboard_services, "Session", lambda: session)
+
+    entry = leaderboard_services.get_rank("battles_won", 3)
+
+    assert entry == LeaderboardEntry(8, 3, "carol", 50)
+    assert "LEFT OUTER JOIN user_stats" in session.statements[0]
+    assert "FROM user_stats" in session.statements[1]
+    assert "user_stats.battles_won >" in session.statements[1]
+
+
+def test_rank_of_unregistered_user_is_none(monkeypatch):
+    session = FakeSession([[]])
+    monkeypatch.setattr(leaderboard_services, "Session", lambda: session)
+
+    assert leaderboard_services.get_rank("exp", 99) is None
+    assert len(session.statements) == 1
+
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ValueError):
+        leaderboard_services.get_leaderboard("charisma")
+
+
+def test_name_directory_prefers_gateway_cache_then_stored_name():
+    directory = NameDirectory()
+    directory.remember(1, "stored")
+    directory.remember(2, "old")
+
+    bot = FakeBot({2: "renamed"})
+
+    assert directory.resolve(1, bot) == "stored"
+    assert directory.resolve(2, bot) == "renamed"
+    assert directory.resolve(2) == "renamed"
+    assert directory.resolve(3, bot) == "User 3"
+
+
+def test_weekly_gold_awards_by_position_when_ranks_tie(monkeypatch):
+    from utils.embeds.leaderboard import leaderboardembed
+
+    tied = [
+        LeaderboardEntry(1, 1, "alice", 500),
+        LeaderboardEntry(1, 2, "bob", 500),
+        LeaderboardEntry(3, 3, "carol", 100),
+    ]
+    awarded = []
+    monkeypatch.setattr(leaderboardembed, "get_gold_leaderboard", lambda limit, fresh: tied)
+    monkeypatch.setattr(leaderboardembed, "inc_top_leaderboard", awarded.append)
+
+    embed = asyncio.run(leaderboardembed.weekly_gold_leaderboard(FakeBot({1: "alice", 2: "bob", 3: "carol"})))
+
+    placements = [field.name for field in embed.fields if field.name != "\u200b"]
+    assert placements == ["🥇 #1 — alice", "🥈 #1 — bob", "🥉 #3 — carol"]
+    assert len(embed.fields) == 5
+    assert awarded == [1]
@@ -0,0 +1,69 @@
+import sys
+import types
+
+import numpy as np
+
+
+class EmptySession:
+    """Import-time stand-in for modules that preload lookup tables."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def query(self, *_args):
+        return self
+
+    def all(self):
+        return []
+
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = EmptySession
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from services import lootbox_services
+from services.item_catalog_services import CatalogItem, ItemCatalog
+
+
+def make_item(item_id, name, rarity, item_type="item"):
+    return CatalogItem(item_id, name, "", item_type, rarity, None, None, None, False)
+
+
+CATALOG = ItemCatalog(
+    [
+        make_item(1, "Bread", "Common"),
+        make_item(2, "Apple", "Common"),
+        make_item(3, "Ruby", "Rare"),
+        make_item(4, "Blade Shard", "Epic", "shard"),
+        make_item(5, "Wooden Box", "Common", "lootbox"),
+    ]
+)
+
+
+def test_bulk_rolls_stay_within_box_tables():
+    gold, items = lootbox_services.roll_bulk_rewards("Wooden Box", 50, np.random.default_rng(3), CATALOG)
+
+    # 50 boxes of 12..32 gold and at most one item roll each (1..2 of an item)
+    assert 50 * 12 <= gold <= 50 * 32
+    assert set(items) <= {1, 2, 3, 4}
+    assert 0 < sum(items.values()) <= 50 * 2
+    assert all(isinstance(item_id, int) and isinstance(qty, int) for item_id, qty in items.items())
+
+
+def test_bulk_rolls_are_reproducible_with_a_seeded_generator():
+    first = lootbox_services.roll_bulk_rewards("platinum box", 20, np.random.default_rng(11), CATALOG)
+    second = lootbox_services.roll_bulk_rewards("platinum box", 20, np.random.default_rng(11), CATALOG)
+
+    assert first == second
+
+
+def test_bulk_rolls_skip_rarities_without_items():
+    # No legendary items in the catalog, so those rolls yield nothing
+    empty = ItemCatalog([make_item(9, "Crown", "Legendary", "lootbox")])
+    gold, items = lootbox_services.roll_bulk_rewards("platinum box", 10, np.random.default_rng(0), empty)
+
+    assert gold >= 10 * 400
+    assert items == {}
@@ -0,0 +1,107 @@
+import sys
+import types
+
+import pytest
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from sqlalchemy.dialects import postgresql
+
+from services import lottery_services
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalar_one(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows=None, scalar=None):
+        self.rows = rows
+        self.scalar_value = scalar
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.rows)
+
+    def scalar(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return self.scalar_value
+
+
+def test_allocation_bumps_counter_and_totals_in_one_upsert():
+    session = FakeSession(rows=1000010)
+
+    first_id = lottery_services._allocate_ticket_ids(session, ticket_price=10, count=3)
+
+    assert first_id == 1000007
+    sql = session.statements[0]
+    assert "ON CONFLICT (id) DO UPDATE" in sql
+    assert "RETURNING lottery_round.next_ticket_id" in sql
+
+
+def test_winner_is_weighted_by_ticket_count(monkeypatch):
+    session = FakeSession(rows=[(11, 1), (22, 9)], scalar=1000042)
+    monkeypatch.setattr(lottery_services, "Session", lambda: session)
+    drawn = {}
+
+    def fake_choices(population, weights, k):
+        drawn["weights"] = weights
+        return [1]
+
+    monkeypatch.setattr(lottery_services.random, "choices", fake_choices)
+    monkeypatch.setattr(lottery_services.random, "randrange", lambda n: n - 1)
+
+    assert lottery_services.pick_lottery_winner() == (22, 1000042)
+    assert drawn["weights"] == [1, 9]
+    assert "GROUP BY lottery_tickets.user_id" in session.statements[0]
+    assert "OFFSET" in session.statements[1]
+
+
+def test_no_tickets_means_no_winner(monkeypatch):
+    monkeypatch.setattr(lottery_services, "Session", lambda: FakeSession(rows=[]))
+
+    assert lottery_services.pick_lottery_winner() is None
+
+
+class RecordingSession(FakeSession):
+    def __init__(self, next_ticket_id):
+        super().__init__(rows=next_ticket_id)
+        self.commits = 0
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_bulk_purchase_debits_once_and_inserts_a_range(monkeypatch):
+    session = RecordingSession(next_ticket_id=1000105)
+    debits = []
+    monkeypatch.setattr(lottery_services, "Session", lambda: session)
+    monkeypatch.setattr(lottery_services, "remove_gold", lambda uid, amount, _s: debits.append((uid, amount)))
+
+    assert lottery_services.buy_tickets(7, 10, 100) == (1000005, 1000104)
+    assert debits == [(7, 1000)]
+    assert len(session.statements) == 2
+    assert "generate_series" in session.statements[1]
+    assert session.commits == 1
+
+
+@pytest.mark.parametrize("count", [0, lottery_services.MAX_TICKETS_PER_PURCHASE + 1])
+def test_bulk_purchase_rejects_out_of_range_counts(count):
+    with pytest.raises(ValueError):
+        lottery_services.buy_tickets(7, 10, count)
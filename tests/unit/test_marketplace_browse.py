@@ -0,0 +1,101 @@
+import sys
+import types
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from sqlalchemy.dialects import postgresql
+
+from services import marketplace_services
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.rows)
+
+
+def _row(listing_id, price):
+    return types.SimpleNamespace(
+        listing_id=listing_id, item_id=1, quantity=2, price=price,
+        item_name="Bread", item_type="item", item_rarity="Common", user_name="seller",
+    )
+
+
+def test_browse_returns_next_cursor_from_the_extra_row(monkeypatch):
+    session = FakeSession([_row(4, 10), _row(2, 12), _row(9, 12)])
+    monkeypatch.setattr(marketplace_services, "Session", lambda: session)
+
+    listings, cursor = marketplace_services.browse_listings(item_id=1, after=(10, 3), limit=2)
+
+    assert [listing["listing_id"] for listing in listings] == [4, 2]
+    assert cursor == (12, 2)
+    sql = session.statements[0]
+    assert "(marketplace.price, marketplace.listing_id) > (" in sql
+    assert "JOIN users" in sql and "JOIN items" in sql
+    assert "ORDER BY marketplace.price, marketplace.listing_id" in sql
+
+
+def test_browse_last_page_has_no_cursor(monkeypatch):
+    monkeypatch.setattr(marketplace_services, "Session", lambda: FakeSession([_row(4, 10)]))
+
+    listings, cursor = marketplace_services.browse_listings(limit=2)
+
+    assert len(listings) == 1
+    assert cursor is None
+
+
+def test_best_asks_picks_one_row_per_item(monkeypatch):
+    row = types.SimpleNamespace(item_id=1, listing_id=4, price=10, quantity=2)
+    session = FakeSession([row])
+    monkeypatch.setattr(marketplace_services, "Session", lambda: session)
+
+    assert marketplace_services.best_asks([1]) == {1: {"listing_id": 4, "price": 10, "quantity": 2}}
+    assert "DISTINCT ON (marketplace.item_id)" in session.statements[0]
+
+
+def test_marketplace_view_only_pages_for_its_author():
+    import asyncio
+
+    from utils.embeds.marketplaceembed import MarketplaceView
+
+    class FakeResponse:
+        def __init__(self):
+            self.sent = []
+
+        async def send_message(self, content, ephemeral=False):
+            self.sent.append((content, ephemeral))
+
+    def interaction(user_id):
+        return types.SimpleNamespace(user=types.SimpleNamespace(id=user_id), response=FakeResponse())
+
+    async def run():
+        view = MarketplaceView(lambda cursor, page: (None, None), next_cursor=None, author_id=1)
+        stranger = interaction(2)
+        allowed = await view.interaction_check(interaction(1)), await view.interaction_check(stranger)
+        return allowed, stranger.response.sent
+
+    (author_ok, stranger_ok), sent = asyncio.run(run())
+
+    assert author_ok is True
+    assert stranger_ok is False
+    assert sent and sent[0][1] is True
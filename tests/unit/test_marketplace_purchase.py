@@ -0,0 +1,104 @@
+import sys
+import types
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from sqlalchemy.dialects import postgresql
+
+from services import marketplace_services
+from services.item_catalog_services import CatalogItem, ItemCatalog
+from utils.custom_errors import NotEnoughGoldError
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class FakeSession:
+    def __init__(self, listing, exists=False):
+        self.listing = listing
+        self.exists = exists
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.deleted = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def execute(self, stmt):
+        self.statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.listing)
+
+    def scalar(self, _stmt):
+        return 7 if self.exists else None
+
+    def delete(self, obj):
+        self.deleted.append(obj)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _install(monkeypatch, session, calls):
+    monkeypatch.setattr(marketplace_services, "Session", lambda: session)
+    catalog = ItemCatalog([CatalogItem(1, "Bread", "", "item", "Common", None, None, None, False)])
+    monkeypatch.setattr(marketplace_services, "get_item_catalog", lambda: catalog)
+    monkeypatch.setattr(marketplace_services, "lock_wallets", lambda _s, ids: calls.append(("lock", tuple(ids))))
+    monkeypatch.setattr(marketplace_services, "remove_gold", lambda uid, amount, _s: calls.append(("remove", uid, amount)))
+    monkeypatch.setattr(marketplace_services, "add_gold", lambda uid, amount, _s: calls.append(("add", uid, amount)))
+    monkeypatch.setattr(marketplace_services, "give_item", lambda uid, iid, qty, session: calls.append(("give", uid, iid, qty)))
+    monkeypatch.setattr(marketplace_services, "update_quest_progress", lambda *args, **kwargs: None)
+    monkeypatch.setattr(marketplace_services, "create_game_event", lambda *args, **kwargs: 1)
+
+
+def test_locked_listing_is_skipped_instead_of_waited_on(monkeypatch):
+    session = FakeSession(listing=None, exists=True)
+    _install(monkeypatch, session, [])
+
+    message = marketplace_services.buy_listed_item(1, 7, 1)
+
+    assert "right now" in message
+    assert "FOR UPDATE SKIP LOCKED" in session.statements[0]
+
+
+def test_purchase_locks_wallets_first_and_commits_once(monkeypatch):
+    listing = types.SimpleNamespace(listing_id=7, user_id=2, item_id=1, quantity=5, price=100)
+    session = FakeSession(listing)
+    calls = []
+    _install(monkeypatch, session, calls)
+
+    message = marketplace_services.buy_listed_item(1, 7, 2)
+
+    assert message.startswith("Successfully bought 2×Bread")
+    assert calls == [("lock", (1, 2)), ("remove", 1, 200), ("give", 1, 1, 2), ("add", 2, 186)]
+    assert listing.quantity == 3
+    assert (session.commits, session.rollbacks) == (1, 0)
+
+
+def test_failed_payment_rolls_back_everything(monkeypatch):
+    listing = types.SimpleNamespace(listing_id=7, user_id=2, item_id=1, quantity=2, price=100)
+    session = FakeSession(listing)
+    _install(monkeypatch, session, [])
+
+    def broke(*_args):
+        raise NotEnoughGoldError(200, "gold")
+
+    monkeypatch.setattr(marketplace_services, "remove_gold", broke)
+
+    marketplace_services.buy_listed_item(1, 7, 2)
+
+    assert (session.commits, session.rollbacks) == (0, 1)
+    assert session.deleted == []
@@ -0,0 +1,89 @@
+import asyncio
+import sys
+import types
+
+import discord
+
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = object
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from services import notif_services
+
+
+class FakeUser:
+    def __init__(self, user_id, failures=None):
+        self.id = user_id
+        self.failures = list(failures or [])
+        self.sent = []
+
+    async def send(self, embed=None, view=None):
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent.append(embed.title)
+
+
+class FakeBot:
+    def __init__(self, cached, remote):
+        self.cached = cached
+        self.remote = remote
+        self.fetched = []
+
+    def get_user(self, user_id):
+        return self.cached.get(user_id)
+
+    async def fetch_user(self, user_id):
+        self.fetched.append(user_id)
+        return self.remote[user_id]
+
+
+def _rate_limited():
+    response = types.SimpleNamespace(status=429, reason="Too Many Requests")
+    return discord.HTTPException(response, "rate limited")
+
+
+def _dispatch(monkeypatch, bot, user_ids, opted_in):
+    lookups = []
+
+    def fake_opted_in_users(ids):
+        lookups.append(list(ids))
+        return set(opted_in)
+
+    monkeypatch.setattr(notif_services, "opted_in_users", fake_opted_in_users)
+    monkeypatch.setattr(notif_services, "RATE_LIMIT_BACKOFF", 0.0)
+    dispatcher = notif_services.NotificationDispatcher(workers=2, send_interval=0.0)
+
+    async def run():
+        queued = await dispatcher.enqueue(bot, user_ids, "ENERGY_FULL")
+        await dispatcher.join()
+        return queued
+
+    return dispatcher, asyncio.run(run()), lookups
+
+
+def test_opted_out_users_are_dropped_before_any_network_call(monkeypatch):
+    cached = {1: FakeUser(1)}
+    remote = {2: FakeUser(2), 3: FakeUser(3)}
+    bot = FakeBot(cached, remote)
+
+    dispatcher, queued, lookups = _dispatch(monkeypatch, bot, [1, 2, 3], opted_in={1, 2})
+
+    assert queued == 2
+    assert lookups == [[1, 2, 3]]
+    assert bot.fetched == [2]
+    assert cached[1].sent == ["⚡ Energy Full"]
+    assert remote[2].sent == ["⚡ Energy Full"]
+    assert remote[3].sent == []
+    assert dispatcher.sent == 2
+
+
+def test_rate_limited_send_is_retried(monkeypatch):
+    user = FakeUser(1, failures=[_rate_limited()])
+    bot = FakeBot({1: user}, {})
+
+    dispatcher, _, _ = _dispatch(monkeypatch, bot, [1], opted_in={1})
+
+    assert user.sent == ["⚡ Energy Full"]
+    assert dispatcher.sent == 1
+    assert dispatcher.dropped == 0
@@ -0,0 +1,100 @@
+import asyncio
+
+from nsfw_classifier import nsfw_classifier as nsfw
+from nsfw_classifier.nsfw_classifier import NsfwClassifier
+
+
+class CountingBatch:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [(1 if "spicy" in text else 0, (0.1, 0.9)) for text in texts]
+
+
+def test_concurrent_messages_share_one_batch():
+    batch_fn = CountingBatch()
+
+    async def run():
+        classifier = NsfwClassifier(batch_fn=batch_fn, batch_window=0.01)
+        return await asyncio.gather(
+            classifier.classify("hello"),
+            classifier.classify("something spicy"),
+            classifier.classify("  HELLO "),
+        )
+
+    results = asyncio.run(run())
+
+    assert batch_fn.calls == [["hello", "something spicy"]]
+    assert [prediction for prediction, _ in results] == [0, 1, 0]
+
+
+def test_full_batch_flushes_without_waiting_for_window():
+    batch_fn = CountingBatch()
+
+    async def run():
+        classifier = NsfwClassifier(batch_fn=batch_fn, batch_window=60, max_batch_size=2)
+        return await asyncio.wait_for(
+            asyncio.gather(classifier.classify("a"), classifier.classify("b")),
+            timeout=1,
+        )
+
+    asyncio.run(run())
+
+    assert batch_fn.calls == [["a", "b"]]
+
+
+def test_lru_cache_skips_the_model_and_evicts_oldest():
+    batch_fn = CountingBatch()
+
+    async def run():
+        classifier = NsfwClassifier(batch_fn=batch_fn, batch_window=0, cache_size=2)
+        for text in ("a", "b", "A", "c", "b", "a"):
+            await classifier.classify(text)
+
+    asyncio.run(run())
+
+    # "A" hits and refreshes "a", so "c" evicts "b"; "b" then evicts "a"
+    assert batch_fn.calls == [["a"], ["b"], ["c"], ["b"], ["a"]]
+
+
+def test_failed_batch_reaches_every_waiter_and_is_not_cached():
+    calls = []
+
+    def broken(texts):
+        calls.append(texts)
+        raise RuntimeError("model exploded")
+
+    async def run():
+        classifier = NsfwClassifier(batch_fn=broken, batch_window=0)
+        results = await asyncio.gather(
+            classifier.classify("a"), classifier.classify("a"), return_exceptions=True,
+        )
+        assert all(isinstance(result, RuntimeError) for result in results)
+        await asyncio.gather(classifier.classify("a"), return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert calls == [["a"], ["a"]]
+
+
+def test_classify_batch_matches_single_predictions():
+    texts = ["hello there", "you look great today", "good morning veyra"]
+
+    batched = nsfw.classify_batch(texts)
+    model, vectorizer = nsfw._load()
+
+    for text, (prediction, confidence) in zip(texts, batched):
+        vec = vectorizer.transform([text])
+        assert prediction == model.predict(vec)[0]
+        assert confidence == tuple(model.predict_proba(vec)[0])
+
+
+def test_normalized_text_scores_like_the_raw_text():
+    texts = ["ﬁne day", "  Hello\tTHERE  friend ", "Straße ÉCOLE"]
+
+    raw = nsfw.classify_batch(texts)
+    normalized = nsfw.classify_batch([nsfw.normalize(text) for text in texts])
+
+    assert normalized == raw
@@ -0,0 +1,78 @@
+import asyncio
+import sys
+import threading
+import types
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from services import request_context_services
+from services.request_context_services import UserSnapshot, get_request_context
+from services.tutorial_services import TutorialState
+
+
+class FakeCtx:
+    def __init__(self, user_id):
+        self.author = types.SimpleNamespace(id=user_id)
+
+
+def _snapshot(user_id, tutorial_state=-1):
+    return UserSnapshot(
+        user_id=user_id,
+        user_name="tester",
+        level=3,
+        exp=120,
+        tutorial_state=tutorial_state,
+        campaign_stage=2,
+        notif=True,
+        gold=450,
+        upgrades={"pockets": 2, "inventory": 1},
+    )
+
+
+def test_context_loads_user_once_and_is_reused_across_lookups(monkeypatch):
+    loads = []
+
+    def fake_load(user_id):
+        loads.append(user_id)
+        return _snapshot(user_id)
+
+    monkeypatch.setattr(request_context_services, "load_user_snapshot", fake_load)
+    ctx = FakeCtx(42)
+
+    assert get_request_context(ctx).is_registered is True
+    assert get_request_context(ctx).tutorial_state == TutorialState.COMPLETED
+    assert get_request_context(ctx).gold == 450
+    assert get_request_context(ctx).upgrade_level("pockets") == 2
+    assert get_request_context(ctx).upgrade_level("brewing stand") == 0
+    assert loads == [42]
+
+
+def test_context_for_unregistered_user_and_unknown_tutorial_state(monkeypatch):
+    monkeypatch.setattr(request_context_services, "load_user_snapshot", lambda user_id: None)
+    context = get_request_context(FakeCtx(7))
+
+    assert context.is_registered is False
+    assert context.tutorial_state == TutorialState.NOT_STARTED
+    assert context.gold == 0
+
+    monkeypatch.setattr(request_context_services, "load_user_snapshot", lambda user_id: _snapshot(user_id, tutorial_state=99))
+    context.invalidate()
+
+    assert context.tutorial_state == TutorialState.NOT_STARTED
+
+
+def test_async_load_runs_off_the_loop_and_warms_sync_reads(monkeypatch):
+    threads = []
+
+    def fake_load(user_id):
+        threads.append(threading.current_thread())
+        return _snapshot(user_id)
+
+    monkeypatch.setattr(request_context_services, "load_user_snapshot", fake_load)
+    context = get_request_context(FakeCtx(42))
+
+    assert asyncio.run(context.load()) == _snapshot(42)
+    assert context.is_registered is True
+    assert len(threads) == 1 and threads[0] is not threading.main_thread()
@@ -0,0 +1,37 @@
+import asyncio
+import sys
+import threading
+import types
+from datetime import datetime, timedelta
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules.setdefault("database.sessionmaker", sessionmaker_stub)
+
+from services import scheduled_events_services as events
+
+
+def test_due_events_are_claimed_off_the_loop_then_dispatched(monkeypatch):
+    claims = []
+    handled = []
+
+    def claim_due(keys, now):
+        claims.append((sorted(keys), threading.current_thread()))
+        return {"TEST_EVENT": [user_id for _, user_id in keys]}
+
+    async def handler(bot, user_ids):
+        handled.append((bot, sorted(user_ids)))
+
+    monkeypatch.setattr(events, "_claim_due", claim_due)
+    monkeypatch.setitem(events._handlers, "TEST_EVENT", handler)
+
+    past = datetime.utcnow() - timedelta(seconds=5)
+    events._arm("TEST_EVENT", 1, past)
+    events._arm("TEST_EVENT", 2, past)
+
+    assert asyncio.run(events.run_due_events("bot")) == 2
+
+    keys, thread = claims[0]
+    assert keys == [("TEST_EVENT", 1), ("TEST_EVENT", 2)]
+    assert thread is not threading.main_thread()
+    assert handled == [("bot", [1, 2])]
@@ -0,0 +1,45 @@
+from utils.timer_wheel import TimerWheel
+
+
+def test_timer_fires_at_deadline_not_before():
+    wheel = TimerWheel(tick_seconds=1.0, now=0)
+    wheel.schedule("a", 10.5, payload="energy")
+
+    assert wheel.advance(10) == []
+    assert wheel.advance(11) == [("a", "energy")]
+    assert "a" not in wheel
+
+
+def test_cancel_and_reschedule_replace_deadline():
+    wheel = TimerWheel(tick_seconds=1.0, now=0)
+    wheel.schedule("a", 5)
+    wheel.schedule("b", 5)
+    wheel.schedule("a", 20)
+    assert wheel.cancel("b") is True
+    assert wheel.cancel("missing") is False
+
+    assert wheel.advance(10) == []
+    assert wheel.advance(20) == [("a", None)]
+    assert len(wheel) == 0
+
+
+def test_far_deadlines_cascade_through_levels_and_overflow():
+    # 4 slots x 2 levels covers 16 ticks; anything further starts in overflow
+    wheel = TimerWheel(tick_seconds=1.0, slots=4, levels=2, now=0)
+    deadlines = {"near": 3, "mid": 9, "wrap": 16, "far": 37, "very_far": 70}
+    for key, when in deadlines.items():
+        wheel.schedule(key, when)
+
+    fired_at = {}
+    for now in range(1, 80):
+        for key, _ in wheel.advance(now):
+            fired_at[key] = now
+
+    assert fired_at == deadlines
+
+
+def test_past_deadline_fires_on_next_advance():
+    wheel = TimerWheel(tick_seconds=1.0, now=100)
+    wheel.schedule("late", 50)
+
+    assert wheel.advance(100) == [("late", None)]
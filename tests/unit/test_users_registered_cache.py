@@ -0,0 +1,62 @@
+import sys
+import types
+
+sessionmaker_stub = types.ModuleType("database.sessionmaker")
+sessionmaker_stub.Session = lambda: None
+sys.modules["database.sessionmaker"] = sessionmaker_stub
+
+from services import users_services
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return iter(self.rows)
+
+
+class FakeSession:
+    def __init__(self, rows, on_execute=None):
+        self.rows = rows
+        self.on_execute = on_execute
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def execute(self, _stmt):
+        if self.on_execute:
+            self.on_execute()
+        return FakeResult(self.rows)
+
+    def get(self, *_args):
+        raise AssertionError("is_user should not hit the DB once the cache is warm")
+
+
+def test_is_user_answers_from_warm_cache_without_db(monkeypatch):
+    monkeypatch.setattr(users_services, "_registered_cache_warm", False)
+    monkeypatch.setattr(users_services, "_registered_user_ids", set())
+    monkeypatch.setattr(users_services, "Session", lambda: FakeSession([1, 2, 3]))
+
+    assert users_services.warm_registered_users() == 3
+    assert users_services.is_user(2) is True
+    assert users_services.is_user(99) is False
+    assert users_services.is_user(3, FakeSession([])) is True
+
+
+def test_refresh_keeps_users_registered_while_snapshot_runs(monkeypatch):
+    monkeypatch.setattr(users_services, "_registered_cache_warm", False)
+    monkeypatch.setattr(users_services, "_registered_user_ids", set())
+    monkeypatch.setattr(
+        users_services,
+        "Session",
+        lambda: FakeSession([1], on_execute=lambda: users_services._remember_registered_user(42)),
+    )
+
+    users_services.warm_registered_users()
+
+    assert users_services.is_user(1) is True
+    assert users_services.is_user(42) is True
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 import random
 
-from services.exp_services import add_exp
+from services.exp_services import add_exp, exp_accumulator
 from services.response_services import create_response
 on_cooldown = {}  # A dictionary to store users on cooldown
 
@@ -16,7 +16,8 @@ async def chatexp(ctx):
         if (now - last_time).total_seconds() < 30:  # Checks if user is still in cooldown
             return
 
-    await add_exp_with_announcement(ctx, user_id, random.randint(1,2))
+    # Buffered; applied in bulk by the exp flush job
+    exp_accumulator.add(user_id, random.randint(1,2))
 
     on_cooldown[user_id] = now  # Starts the cooldown till next exp gainp
 
@@ -1,6 +1,6 @@
 import discord
 from discord.ui import View, button, Button
-from services.economy_services import check_wallet, remove_gold
+from services.economy_services import check_wallet_async, remove_gold_async
 class BattleRequestView(View):
     def __init__(self, challenger: discord.User, target: discord.User, bet_amount: int):
         super().__init__(timeout=60)
@@ -14,7 +14,7 @@ class BattleRequestView(View):
         if interaction.user.id != self.target.id:
             await interaction.response.send_message("You can't accept someone else's challenge!", ephemeral=True)
             return
-        if self.bet_amount > check_wallet(self.target.id):
+        if self.bet_amount > await check_wallet_async(self.target.id):
             await interaction.response.send_message("You don't have enough gold to accept this. Aborting challenge.")
             self.accepted = False
             for child in self.children:
@@ -25,7 +25,7 @@ class BattleRequestView(View):
         )
         self.stop()
         #accept the challange only if target has enough gold
-        remove_gold(self.target.id, self.bet_amount) #deduct the gold amount for pot
+        await remove_gold_async(self.target.id, self.bet_amount) #deduct the gold amount for pot
         self.accepted = True
         for child in self.children:
             child.disabled = True
@@ -96,7 +96,8 @@ def build_slash_help_embed() -> discord.Embed:
     )
     embed.add_field(
         name="💰 Economy",
-        value="`/leaderboard` - Richest players\n"
+        value="`/leaderboard [metric]` - Top players by gold, exp, wins or streaks\n"
+              "`/rank [metric] [user]` - See anyone's position\n"
               "`/loan` - Claim starter loan\n"
               "`/transfer_gold <user> <amount>` - Send gold",
         inline=False
@@ -1,27 +1,49 @@
+import asyncio
+
 import discord
 
-from services.economy_services import get_richest_users
+from services.leaderboard_services import METRICS, get_gold_leaderboard, get_leaderboard, get_rank, names
 from services.users_services import inc_top_leaderboard
 
 from utils.emotes import GOLD_EMOJI
 
+METRIC_STYLE = {
+    "gold": ("🏆 Richest Players", "The elite few who made the gold rain 💰", GOLD_EMOJI),
+    "exp": ("📈 Most Experienced", "Countless hours, countless levels.", "✨"),
+    "battles_won": ("⚔️ Battle Champions", "Undefeated? Not quite, but close.", "⚔️"),
+    "races_won": ("🏇 Race Kings", "They always bet on the right animal.", "🏁"),
+    "quest_streak": ("📜 Quest Streaks", "Never missed a day.", "🔥"),
+}
+
+def format_rank_line(metric: str, entry) -> str:
+    _, _, icon = METRIC_STYLE[metric]
+    return f"{icon} {entry.value:,}"
+
 async def gold_leaderboard_embed(bot):
+    return await leaderboard_embed(bot, "gold")
 
+async def leaderboard_embed(bot, metric: str = "gold", viewer_id: int | None = None):
+
+    title, description, _ = METRIC_STYLE[metric]
     embed = discord.Embed(
-        title="🏆 Richest Players",
-        description="The elite few who made the gold rain 💰",
+        title=title,
+        description=description,
         color=discord.Color.gold()
     )
-    rich_users = get_richest_users()
-    for i, wallet in enumerate(rich_users, start=1):
-        user = await bot.fetch_user(wallet.user_id)
+    # Off the loop: a cache miss or a rank lookup is a database query
+    for entry in await asyncio.to_thread(get_leaderboard, metric):
         embed.add_field(
-            name=f"#{i} — {user.name}",
-            value=f"{GOLD_EMOJI} {wallet.gold:,}",
+            name=f"#{entry.rank} — {names.resolve(entry.user_id, bot)}",
+            value=format_rank_line(metric, entry),
             inline=False
         )
 
-    embed.set_footer(text="Veyra’s economy leaderboard — updated live!")
+    footer = f"Veyra’s {METRICS[metric].label.lower()} leaderboard — updated every minute!"
+    if viewer_id is not None:
+        viewer = await asyncio.to_thread(get_rank, metric, viewer_id)
+        if viewer is not None:
+            footer = f"You are #{viewer.rank} with {viewer.value:,} • " + footer
+    embed.set_footer(text=footer)
 
     return embed
 
@@ -38,17 +60,18 @@ async def weekly_gold_leaderboard(bot):
         3: ("🥉", "The bronze grinder who clawed their way to glory.")
     }
 
-    rich_users = get_richest_users(3)
-    for i, wallet in enumerate(rich_users, start=1):
-        user = await bot.fetch_user(wallet.user_id)
+    # Placements are awarded from this list, so never serve it stale
+    # Ties share entry.rank, so placement and awards go by list position
+    entries = await asyncio.to_thread(get_gold_leaderboard, 3, True)
+    for i, entry in enumerate(entries, start=1):
         medal, tagline = medals.get(i, ("💰", "A true gold hoarder."))
 
         if i == 1:
-            inc_top_leaderboard(wallet.user_id)
+            inc_top_leaderboard(entry.user_id)
 
         embed.add_field(
-            name=f"{medal} #{i} — {user.name}",
-            value=f"{GOLD_EMOJI} {wallet.gold:,}\n*{tagline}*",
+            name=f"{medal} #{entry.rank} — {names.resolve(entry.user_id, bot)}",
+            value=f"{GOLD_EMOJI} {entry.value:,}\n*{tagline}*",
             inline=False
         )
         if i < 3:
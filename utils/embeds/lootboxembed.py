@@ -84,4 +84,28 @@ def build_lootbox_embed_pages(rewards: dict) -> list[discord.Embed]:
 def lootbox_embed_and_view(rewards: dict):
     pages = build_lootbox_embed_pages(rewards)
     view = LootboxView(pages)
-    return(pages[0],view)
\ No newline at end of file
+    return(pages[0],view)
+
+BULK_SUMMARY_LINES = 25
+
+def bulk_lootbox_embed(rewards: dict) -> discord.Embed:
+    """Single summary embed for opening many boxes at once."""
+    rarity_icons = {"common": "⚪", "rare": "🔵", "epic": "🟣", "legendary": "🟠"}
+    lines = [
+        f"{rarity_icons.get(item['rarity'], '▫️')} {item['quantity']} × **{item['item']}**"
+        for item in rewards["items"][:BULK_SUMMARY_LINES]
+    ]
+    hidden = len(rewards["items"]) - BULK_SUMMARY_LINES
+    if hidden > 0:
+        lines.append(f"...and {hidden} more item{'s' if hidden != 1 else ''}")
+
+    embed = discord.Embed(
+        title=f"🎉 Opened {rewards['boxes']} Lootboxes!",
+        description=(
+            f"You received **{rewards['gold']} gold** and:\n\n"
+            + ("\n".join(lines) if lines else "No items this time. Better luck next time!")
+        ),
+        color=discord.Color.gold()
+    )
+    embed.set_thumbnail(url="https://cdn-icons-png.flaticon.com/512/138/138292.png")
+    return embed
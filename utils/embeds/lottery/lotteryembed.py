@@ -3,6 +3,8 @@ from discord.ui import View, Button
 
 from services.game_events_services import create_game_event
 from services.lottery_services import (
+    MAX_TICKETS_PER_PURCHASE,
+    buy_tickets,
     calculate_prize_pool,
     create_ticket,
     get_lottery_round_entries,
@@ -43,10 +45,61 @@ class LotteryButton(View):
             )
 
 
+    @discord.ui.button(label="🎟️ Buy Many", style=discord.ButtonStyle.blurple)
+    async def buy_many(self, _button: Button, interaction: discord.Interaction):
+        await interaction.response.send_modal(BulkTicketModal(self.ticket_price))
+
+
+class BulkTicketModal(discord.ui.Modal):
+    """Asks how many tickets to buy in one go."""
+
+    def __init__(self, ticket_price: int):
+        super().__init__(title="Buy Lottery Tickets")
+        self.ticket_price = ticket_price
+
+        self.amount = discord.ui.InputText(
+            label=f"How many tickets? (1-{MAX_TICKETS_PER_PURCHASE})",
+            placeholder="10",
+            required=True,
+            max_length=3,
+        )
+        self.add_item(self.amount)
+
+    async def callback(self, interaction: discord.Interaction):
+        value = (self.amount.value or "").strip()
+        if not value.isdigit() or not 1 <= int(value) <= MAX_TICKETS_PER_PURCHASE:
+            await interaction.response.send_message(
+                f"Pick a number between 1 and {MAX_TICKETS_PER_PURCHASE}.",
+                ephemeral=True,
+            )
+            return
+
+        count = int(value)
+        try:
+            tickets = buy_tickets(interaction.user.id, self.ticket_price, count)
+        except UserNotRegisteredError:
+            await interaction.response.send_message(
+                f"{interaction.user.mention} you need to use `!helloVeyra` first to participate in the lottery."
+            )
+            return
+
+        if tickets is None:
+            await interaction.response.send_message(
+                f"❌ {interaction.user.mention} you need {self.ticket_price * count}{GOLD_EMOJI} for {count} tickets."
+            )
+            return
+
+        first_id, last_id = tickets
+        tickets_sold, prize_pool = get_lottery_stats()
+        await interaction.response.send_message(
+            f"✅ You bought {count} tickets, <@{interaction.user.id}>! Your ticket numbers are `{first_id}` – `{last_id}`.\n 🎫 Tickets Sold: {tickets_sold}\nTotal Prize Pool: {prize_pool}{GOLD_EMOJI}"
+        )
+
+
 def create_lottery_embed(ticket_price):
     embed = discord.Embed(
         title="🎰 Veyra’s Lottery",
-        description="Feeling lucky? Wanna try your luck?\nPress the button below to buy a ticket!",
+        description="Feeling lucky? Wanna try your luck?\nPress a button below to buy a ticket, or a whole stack of them!",
         color=discord.Color.gold(),
     )
     view = LotteryButton(ticket_price)
@@ -1,48 +1,79 @@
 import discord
-from math import ceil
+from discord.ui import View, button
 from utils.emotes import GOLD_EMOJI
 
-def build_marketplace(listings: list):
-    # Split listings into pages of 9
-    listings_per_page = 9
-    pages = []
-
-    total_pages = ceil(len(listings) / listings_per_page)
-
+def build_marketplace_page(listings: list, page_num: int = 1, has_next: bool = False):
     if not listings:
-        embed = discord.Embed(
+        return discord.Embed(
             title="🛒 Marketplace",
             description="⚠️ No listings found.",
             color=discord.Color.blurple()
         )
-        pages.append(embed)
-        return pages
 
-    for page_num in range(total_pages):
-        start = page_num * listings_per_page
-        end = start + listings_per_page
-        current_listings = listings[start:end]
+    embed = discord.Embed(
+        title="🛒 Marketplace",
+        description="Listings created by other users, cheapest first ↓",
+        color=discord.Color.blurple()
+    )
 
-        embed = discord.Embed(
-            title="🛒 Marketplace",
-            description="Listings created by other users ↓",
-            color=discord.Color.blurple()
+    for listing in listings:
+        embed.add_field(
+            name=f"📌 Listing #{listing['listing_id']}",
+            value=(
+                f" **{listing['item_name']}**\n"
+                f"Price: `{listing['price']}`{GOLD_EMOJI} per unit\n"
+                f"In stock: `{listing['quantity']}` left\n"
+                f"👤 Seller: `{listing['user_name']}` \n"
+                "---------------------"
+            ),
+            inline=True
         )
 
-        for listing in current_listings:
-            embed.add_field(
-                name=f"📌 Listing #{listing['listing_id']}",
-                value=(
-                    f" **{listing['item_name']}**\n"
-                    f"Price: `{listing['price']}`{GOLD_EMOJI} per unit\n"
-                    f"In stock: `{listing['quantity']}` left\n"
-                    f"👤 Seller: `{listing['user_name']}` \n"
-                    "---------------------"
-                ),
-                inline=True
+    embed.set_footer(text=f"Page {page_num}" + (" • more →" if has_next else ""))
+    return embed
+
+
+class MarketplaceView(View):
+    """Pages through the order book one query at a time.
+
+    `load_page(cursor, page_num)` returns (embed, next_cursor); the cursors of
+    pages already seen are kept so Previous does not need an offset query.
+    """
+
+    def __init__(self, load_page, next_cursor, author_id: int):
+        super().__init__(timeout=180)
+        self.load_page = load_page
+        self.author_id = author_id
+        self.cursors = [None]
+        self.next_cursor = next_cursor
+        self.update_buttons()
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Every click runs a query, so only the command author can page
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "Open your own marketplace view with /loadmarketplace.", ephemeral=True
             )
+            return False
+        return True
+
+    def update_buttons(self):
+        self.previous_button.disabled = len(self.cursors) == 1
+        self.next_button.disabled = self.next_cursor is None
+
+    async def show(self, interaction: discord.Interaction):
+        embed, self.next_cursor = self.load_page(self.cursors[-1], len(self.cursors))
+        self.update_buttons()
+        await interaction.response.edit_message(embed=embed, view=self)
 
-        embed.set_footer(text=f"Page {page_num + 1} of {total_pages}")
-        pages.append(embed)
+    @button(label="← Previous", style=discord.ButtonStyle.grey)
+    async def previous_button(self, button: discord.ui.Button, interaction: discord.Interaction):
+        if len(self.cursors) > 1:
+            self.cursors.pop()
+        await self.show(interaction)
 
-    return pages
+    @button(label="Next →", style=discord.ButtonStyle.green)
+    async def next_button(self, button: discord.ui.Button, interaction: discord.Interaction):
+        if self.next_cursor is not None:
+            self.cursors.append(self.next_cursor)
+        await self.show(interaction)
@@ -5,9 +5,23 @@ from pytz import timezone
 
 from services.shop_services import update_daily_shop, update_daily_buyback_shop
 from services.friendship_services import reset_all_daily_exp
-from services.jobs_services import regen_energy_for_all, notify_users_with_capped_or_overflow_energy
-from services.loan_services import send_due_loan_reminders
-from services.alchemy_services import decay_all_strain
+from services.jobs_services import notify_energy_full
+from services.loan_services import send_loan_reminders
+from services.alchemy_services import decay_all_strain, notify_effect_expired
+from services.scheduled_events_services import (
+    ENERGY_FULL_EVENT,
+    LOAN_DUE_EVENT,
+    EFFECT_EXPIRED_EVENT,
+    BATTLE_QUEUE_EXPIRED_EVENT,
+    load_scheduled_events,
+    register_event_handler,
+    run_due_events,
+)
+from services.users_services import warm_registered_users
+from services.exp_services import exp_accumulator
+from services.item_catalog_services import load_item_catalog
+from services.inventory_services import reconcile_slots_used
+from services.battle.battle_queue import expire_queue_entries, load_battle_queue
 
 from utils.embeds.leaderboard.weeklyleaderboard import send_weekly_leaderboard
 from utils.embeds.lottery.sendlottery import send_lottery, send_result
@@ -27,6 +41,12 @@ weekly_trigger = CronTrigger(day_of_week="sun", hour=0, minute=0, timezone=timez
 
 def schedule_jobs(bot):
     """Registers all recurring background jobs."""
+    # Per-user deadlines are pushed by the services that know them
+    register_event_handler(ENERGY_FULL_EVENT, notify_energy_full)
+    register_event_handler(LOAN_DUE_EVENT, send_loan_reminders)
+    register_event_handler(EFFECT_EXPIRED_EVENT, notify_effect_expired)
+    register_event_handler(BATTLE_QUEUE_EXPIRED_EVENT, expire_queue_entries)
+
     # Daily jobs
     scheduler.add_job(
         update_daily_shop,
@@ -75,9 +95,15 @@ def schedule_jobs(bot):
         replace_existing=True,
     )
     scheduler.add_job(
-        regen_energy_for_all,
-        id="regen_energy_for_all",
-        trigger=IntervalTrigger(minutes=6, start_date=None),
+        reconcile_slots_used,
+        id="reconcile_slots_used",
+        trigger=midnight_trigger,
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        run_due_events,
+        id="run_due_events",
+        trigger=IntervalTrigger(seconds=1, start_date=None),
         args=[bot],
         replace_existing=True,
     )
@@ -88,10 +114,15 @@ def schedule_jobs(bot):
         replace_existing=True,
     )
     scheduler.add_job(
-        send_due_loan_reminders,
-        id="send_due_loan_reminders",
-        trigger=midnight_trigger,
-        args=[bot],
+        warm_registered_users,
+        id="refresh_registered_users",
+        trigger=IntervalTrigger(minutes=30, start_date=None),
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        exp_accumulator.flush,
+        id="flush_exp",
+        trigger=IntervalTrigger(seconds=5, start_date=None),
         replace_existing=True,
     )
 
@@ -99,6 +130,17 @@ def schedule_jobs(bot):
 
 async def run_at_startup(bot):
     """Runs the functions that need to fill values at bot startup"""
+    warm_registered_users()
+    load_scheduled_events()
+    load_battle_queue()
+    load_item_catalog()
     update_daily_shop()
     update_daily_buyback_shop()
     await send_lottery(bot, 10)
+
+
+async def run_at_shutdown():
+    """Stops the jobs and writes out anything still buffered in memory"""
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    await exp_accumulator.flush()
@@ -14,7 +14,8 @@ async def send_dm(bot, user_id: int, embed: discord.Embed):
     """
 
     try:
-        user = await bot.fetch_user(user_id)
+        # Cache hit avoids the REST round trip
+        user = bot.get_user(user_id) or await bot.fetch_user(user_id)
         await user.send(embed=embed)
         return True
 
@@ -0,0 +1,98 @@
+"""Hierarchical timer wheel.
+
+Deadlines are bucketed by tick into a stack of wheels where each level spans
+``slots`` times the range of the level below it. Advancing the clock only
+touches the current slot of each level (plus one cascade when a level wraps),
+so the cost of a tick is proportional to the timers that actually come due,
+not to how many are pending.
+"""
+
+import math
+
+
+class TimerWheel:
+    def __init__(self, tick_seconds: float = 1.0, slots: int = 64, levels: int = 4, now: float = 0.0):
+        self.tick_seconds = tick_seconds
+        self.slots = slots
+        self.levels = levels
+        self._tick = math.floor(now / tick_seconds)
+        self._wheels = [[{} for _ in range(slots)] for _ in range(levels)]
+        # Beyond the range of the top wheel; redistributed when it wraps
+        self._overflow = {}
+        # Scheduled at or before the current tick; fired on the next advance
+        self._expired = {}
+        # key -> bucket currently holding it, for O(1) cancel
+        self._location = {}
+
+    def __len__(self):
+        return len(self._location)
+
+    def __contains__(self, key):
+        return key in self._location
+
+    def schedule(self, key, when: float, payload=None):
+        """Arm ``key`` to fire at ``when`` (seconds), replacing any earlier deadline."""
+        self.cancel(key)
+        # Round up so a timer never fires before its deadline
+        self._place(key, math.ceil(when / self.tick_seconds), payload)
+
+    def cancel(self, key) -> bool:
+        bucket = self._location.pop(key, None)
+        if bucket is None:
+            return False
+        del bucket[key]
+        return True
+
+    def advance(self, now: float):
+        """Move the clock to ``now`` and return [(key, payload)] for every timer that came due."""
+        target = math.floor(now / self.tick_seconds)
+        fired = self._drain(self._expired)
+
+        while self._tick < target:
+            if not self._location:
+                self._tick = target
+                break
+            self._tick += 1
+            self._cascade()
+            fired.extend(self._drain(self._wheels[0][self._tick % self.slots]))
+            fired.extend(self._drain(self._expired))
+
+        return fired
+
+    def _place(self, key, due: int, payload):
+        bucket = self._bucket_for(due)
+        bucket[key] = (due, payload)
+        self._location[key] = bucket
+
+    def _bucket_for(self, due: int):
+        if due <= self._tick:
+            return self._expired
+        # Lowest level whose span still shares every higher digit with the clock
+        for level in range(self.levels):
+            span = self.slots ** (level + 1)
+            if due // span == self._tick // span:
+                return self._wheels[level][(due // self.slots ** level) % self.slots]
+        return self._overflow
+
+    def _cascade(self):
+        tick = self._tick
+        if tick % self.slots ** self.levels == 0:
+            self._redistribute(self._overflow)
+        for level in range(self.levels - 1, 0, -1):
+            span = self.slots ** level
+            if tick % span == 0:
+                self._redistribute(self._wheels[level][(tick // span) % self.slots])
+
+    def _redistribute(self, bucket):
+        entries = list(bucket.items())
+        bucket.clear()
+        for key, (due, payload) in entries:
+            self._place(key, due, payload)
+
+    def _drain(self, bucket):
+        fired = []
+        for key, (_, payload) in bucket.items():
+            del self._location[key]
+            fired.append((key, payload))
+        bucket.clear()
+        return fired
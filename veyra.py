@@ -35,15 +35,17 @@ from services.talk_to_veyra.chat_services import (
     ConversationServiceError,
     brain,
     fetch_channel_msgs,
-    handle_user_message,
+    stream_user_message,
 )
+from services.talk_to_veyra.chat_context import chat_context
 from services.talk_to_veyra.user_builder import build_chat_user
 from services.onboadingservices import greet
 from services.response_services import create_response
 from services.tutorial_services import tutorial_guard
+from services.request_context_services import get_request_context
 from services.refferal_services import create_inv_cache, handle_member_join
 
-from utils.jobs import scheduler, run_at_startup
+from utils.jobs import scheduler, run_at_startup, run_at_shutdown
 from utils.chatexp import chatexp
 from utils.jobs import schedule_jobs
 from utils.fuzzy import get_closest_command
@@ -52,7 +54,7 @@ from utils.custom_errors import WrongChannelError, ServerRestrictedError, DMsDis
 
 from domain.guild.guild_config import get_config, is_channel_allowed, ChannelPolicy
 
-# from nsfw_classifier.nsfw_classifier import classify  # Optional feature
+from nsfw_classifier.nsfw_classifier import nsfw_classifier
 
 # Bot setup
 TOKEN = os.getenv("DISCORD_TOKEN")
@@ -63,7 +65,25 @@ if not TOKEN:
 intents = discord.Intents.default()
 intents.members = True
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents, case_insensitive=True, help_command=None)
+
+
+class VeyraBot(commands.Bot):
+    async def close(self):
+        try:
+            await run_at_shutdown()
+        except Exception as e:
+            logger.error(f"Error during shutdown: {e}", exc_info=True)
+        await brain.close()
+        await super().close()
+
+
+bot = VeyraBot(command_prefix="!", intents=intents, case_insensitive=True, help_command=None)
+
+# Channel where Veyra chats back when mentioned
+TALK_CHANNEL_ID = 1437565988966109318
+# Minimum NSFW probability before a message is flagged
+NSFW_THRESHOLD = 0.8
+_moderation_tasks = set()
 
 
 
@@ -85,7 +105,10 @@ async def is_registered(ctx):
     if ctx.command.name in ["helloVeyra", "help"]:
         return True
 
-    if not is_user(ctx.author.id):
+    # Unregistered users are turned away by the in-memory membership set.
+    # Everyone else gets the user row loaded once, off the loop, for later
+    # checks and the command body to reuse.
+    if not is_user(ctx.author.id) or await get_request_context(ctx).load() is None:
         await ctx.send("You are not frnds with Veyra! Use `!helloVeyra` to get started.")
         return False
 
@@ -185,7 +208,8 @@ async def tutorial_check(ctx):
     blocked = await tutorial_guard(
         ctx,
         command_name,
-        args
+        args,
+        state=get_request_context(ctx).tutorial_state,
     )
 
     if blocked:
@@ -225,12 +249,37 @@ async def on_member_join(member):
         embed = greet(member.display_name)
         await channel.send(content=member.mention, embed=embed)
 
+def _moderate_in_background(message):
+    """Classify a message off the event loop and log it if it looks NSFW."""
+
+    async def moderate():
+        try:
+            if await nsfw_classifier.is_nsfw(message.content, NSFW_THRESHOLD):
+                logger.warning("NSFW message flagged", extra={
+                    "user": message.author.id,
+                    "flex": f"Channel -> {message.channel.id} | Message -> {message.id}",
+                })
+        except Exception as e:
+            logger.error("NSFW check for message %s failed: %s", message.id, e)
+
+    task = asyncio.get_running_loop().create_task(moderate())
+    _moderation_tasks.add(task)
+    task.add_done_callback(_moderation_tasks.discard)
+
+
 @bot.event
 async def on_message(message):
     """Handle custom message logic (inline commands, EXP system, etc.)."""
+    if message.channel.id == TALK_CHANNEL_ID:
+        # Includes Veyra's own replies, which never get past the bot check below
+        chat_context.record(message, bot_id=bot.user.id)
+
     if message.author.bot:
         return
 
+    if message.content.strip():
+        _moderate_in_background(message)
+
     msg_lower = message.content.lower()
     # Fuzzy command correction
     if msg_lower.startswith("!"):
@@ -260,7 +309,7 @@ async def on_message(message):
 
             await bot.invoke(ctx)
             return
-    if message.channel.id == 1437565988966109318 and (bot.user in message.mentions or "veyra" in msg_lower) and msg_lower != "!helloveyra":
+    if message.channel.id == TALK_CHANNEL_ID and (bot.user in message.mentions or "veyra" in msg_lower) and msg_lower != "!helloveyra":
         if not is_user(message.author.id):
             await message.reply("Use `!helloVeyra` first. I don't talk to strangers.")
             return
@@ -270,19 +319,17 @@ async def on_message(message):
             user = build_chat_user(message.author.id, message.author.display_name)
             msg_history = await fetch_channel_msgs(message.channel, bot_id=bot.user.id)
 
-            # Generate reply
+            # Post the reply as soon as text arrives and keep editing it in
             try:
-                reply = await handle_user_message(
+                await stream_user_message(
                     message.content,
                     user,
-                    msg_history
+                    msg_history,
+                    message.reply,
                 )
             except ConversationServiceError as exc:
                 logger.error("talk-to-Veyra request failed: %s", exc)
-                reply = "Not in mood to talk right now. come back later?"
-
-        if reply:
-            await message.reply(reply)
+                await message.reply("Not in mood to talk right now. come back later?")
         return
 
 
@@ -325,6 +372,23 @@ async def on_message(message):
             logger.error(f"Error processing chatexp for user {message.author.id}: {e}", exc_info=True)
 
 
+@bot.event
+async def on_raw_message_edit(payload):
+    """Keep the chat context buffer in step with edited messages."""
+    if payload.channel_id == TALK_CHANNEL_ID and "content" in payload.data:
+        chat_context.edit(payload.channel_id, payload.message_id, payload.data["content"])
+
+@bot.event
+async def on_raw_message_delete(payload):
+    if payload.channel_id == TALK_CHANNEL_ID:
+        chat_context.delete(payload.channel_id, [payload.message_id])
+
+@bot.event
+async def on_raw_bulk_message_delete(payload):
+    if payload.channel_id == TALK_CHANNEL_ID:
+        chat_context.delete(payload.channel_id, payload.message_ids)
+
+
 # ─── LOAD COGS ────────────────────────────────────────────────────
 
 cogs_list = [